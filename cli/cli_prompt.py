@@ -1,6 +1,11 @@
 from typing import List, Union, Optional
 from core.core_services import DateManager
 
+try:
+    import readline
+except ImportError:  # Not on Windows; names are then picked from the menus instead of Tab
+    readline = None
+
 class CliPrompt:
     """Provides methods to gather and validate data from the user via the command line."""
     @staticmethod
@@ -171,6 +176,28 @@ class CliPrompt:
             if saved:
                 break
 
+    @staticmethod
+    def input_with_completion(prompt: str, suggest) -> str:
+        """input(), where Tab completes the whole line from `suggest(text)` if readline is available."""
+        if readline is None:
+            return input(prompt).strip()
+        matches = []
+
+        def complete(text: str, state: int):
+            if state == 0:
+                matches[:] = suggest(text)
+            return matches[state] if state < len(matches) else None
+
+        old_completer, old_delims = readline.get_completer(), readline.get_completer_delims()
+        readline.set_completer(complete)
+        readline.set_completer_delims("")  # Names have spaces; complete the whole line
+        readline.parse_and_bind("bind ^I rl_complete" if "libedit" in (readline.__doc__ or "") else "tab: complete")
+        try:
+            return input(prompt).strip()
+        finally:
+            readline.set_completer(old_completer)
+            readline.set_completer_delims(old_delims)
+
     @staticmethod
     def choose_key(progress: dict, key: str) -> str:
         from cli.menu import Menu
@@ -1,4 +1,3 @@
-from core.data_manager import DataManager
 from core.entries import TafseerEntry, TilawatEntry, OtherEntry
 from core.core_services import DataCarrier, CoreHelpers, ProgressRules
 from cli.cli_prompt import CliPrompt
@@ -99,44 +98,45 @@ class CliWorkflow:
             data_collector.carrier.clear_all()
 
     @staticmethod
-    def choose_subject(data_manager: DataManager) -> tuple:
-        all_subjects = data_manager.get_all_subjects()
-        if all_subjects:
-            subjects_list = [
-                "Add a New Subject",
-                *all_subjects
-            ]
-            subjects_menu = Menu(subjects_list, "Select a Subject")
-            user_choice = subjects_menu.display_menu(show_exit=False)
-            if user_choice != 1:
-                subject = subjects_list[user_choice - 1] # type: ignore
-                return subject, data_manager.get_books_list(subject)
+    def choose_name(label: str, prompt: str, suggest, existing) -> str:
+        """
+        A subject or book name, typed (Tab completes it where readline is available) or
+        picked from the best matches of what was typed; Enter alone lists the most used.
+        A name that is not known yet is taken as a new one.
+        """
         while True:
-            subject = input("\nEnter a subject name: ").strip()
-            if subject:
-                return (subject, data_manager.get_books_list(subject))
-            print("\nSubject cannot be blank.")
+            text = CliPrompt.input_with_completion(prompt, suggest)
+            if text and existing(text):
+                return existing(text)
+            matches = suggest(text)
+            if not matches:
+                if text:
+                    return text
+                print(f"\n{label.capitalize()} cannot be blank.")
+                continue
+            options = [*matches, f"Add \"{text}\" as a new {label}" if text else "Type another name"]
+            user_choice = Menu(options, f"Select a {label}").display_menu(show_exit=False)
+            if user_choice <= len(matches): # type: ignore
+                return matches[user_choice - 1] # type: ignore
+            if text:
+                return text
 
-    @staticmethod
-    def choose_book(subject: str, books_list: list) -> str:
-        if books_list:
-            books_menu_list = ["Add a New Book", *books_list]
-            books_menu = Menu(books_menu_list, "Select a book")
-            user_choice = books_menu.display_menu(show_exit=False)
-            if user_choice != 1:
-                return books_menu_list[user_choice - 1] # type: ignore
-        while True:
-            book = input(
-                f"Enter the \"{subject}\" book or material title: ").strip()
-            if book:
-                return book
-            print("\nBook title cannot be blank.")
+    @classmethod
+    def choose_subject(cls, autocomplete) -> str:
+        return cls.choose_name("subject", "\nEnter a subject name (or its start, or nothing for the most used): ",
+                               autocomplete.subjects, autocomplete.existing)
+
+    @classmethod
+    def choose_book(cls, subject: str, autocomplete) -> str:
+        return cls.choose_name("book", f"\nEnter the \"{subject}\" book or material title (or its start): ",
+                               lambda text: autocomplete.books(subject, text),
+                               lambda text: autocomplete.existing(text, subject))
 
     @classmethod
     def get_and_add_progress(cls, app_context) -> None:
-        subject, books_list = cls.choose_subject(app_context.data_manager)
+        subject = cls.choose_subject(app_context.autocomplete)
         print(f"\n<><><>__(<<[ {subject} ]>>)__<><><>\n")
-        book = cls.choose_book(subject, books_list)
+        book = cls.choose_book(subject, app_context.autocomplete)
         print(f"\n<><><>__(<< {book} >>)__<><><>\n")
         data_collector = CliDataCollector()
         valid, msg = data_collector.collect_other_data({"subject": subject, "book": book})
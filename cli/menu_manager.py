@@ -51,13 +51,24 @@ class Menus:
         else:
             print("\nEnter the date you wish to view entries for:")
             date = CliPrompt.get_date_from_user()
-        entries = data_manager.get_entries_from_date(date)
-        if entries:
-            CliProgressDisplay.display_entries_all(entries, date)
-        else:
-            print(
-                f"No entries found for {'today' if date_opt == 1 else date}. Please try another date."
-            )
+        while True:
+            entries = data_manager.get_entries_from_date(date)
+            if entries:
+                CliProgressDisplay.display_entries_all(entries, date)
+            else:
+                print(
+                    f"No entries found for {'today' if date == DateManager.get_date_today() else date}. Please try another date."
+                )
+            new_date = None
+            while new_date is None:
+                choice = CliPrompt.validate_choice(
+                    "\nGo to the previous (P) or next (N) day with entries, or back (B)?", ["P", "N", "B"])
+                if choice == "B":
+                    return
+                new_date = data_manager.day_index.previous(date) if choice == "P" else data_manager.day_index.next(date)
+                if new_date is None:
+                    print(f"\nNo entries {'before' if choice == 'P' else 'after'} {date}.")
+            date = new_date
     
     @staticmethod
     def delete_progress_menu(context: AppContext) -> None:
@@ -78,10 +89,90 @@ class Menus:
             password = input("\nEnter Your Password: ").strip()
             print(DeleteController.delete_all_with_password_check(password, context)[1])
 
+    @staticmethod
+    def range_stats_menu(context: AppContext) -> None:
+        print("\nEnter the first date of the range:")
+        start = CliPrompt.get_date_from_user()
+        print("\nEnter the last date of the range:")
+        end = CliPrompt.get_date_from_user()
+        if DateManager.date_to_ordinal(start) > DateManager.date_to_ordinal(end):
+            start, end = end, start
+        stats = context.data_manager.stats
+        subject = book = None
+        if CliPrompt.validate_choice("\nLimit the totals to one subject?", ["Y", "N"]) == "Y":
+            subject = CliPrompt.choose_key(stats, "subject") or None
+            if subject and CliPrompt.validate_choice("\nLimit the totals to one book?", ["Y", "N"]) == "Y":
+                book = CliPrompt.choose_key(stats[subject], "book") or None
+        entries, minutes, pages = context.stats_manager.range_stats(start, end, subject, book)
+        scope = book or subject or "All subjects"
+        print(f"\n-------------( {scope}: {start} to {end} )-------------\n")
+        print(f">>> Entries: {entries}")
+        print(f">>> Time Spent: {CoreHelpers.format_time(minutes)}")
+        print(f">>> Pages: {pages}")
+
+    @staticmethod
+    def quran_coverage_menu(context: AppContext) -> None:
+        coverage = context.stats_manager.coverage
+        print("\n-------------( Qur'an Coverage )-------------\n")
+        print(coverage.get_summary())
+        if CliPrompt.validate_choice("\nShow what is still left?", ["Y", "N"]) == "Y":
+            print(f"\n{coverage.get_gaps_summary()}")
+
+    @staticmethod
+    def reading_forecast_menu(context: AppContext) -> None:
+        forecast = context.stats_manager.forecast
+        books = {subject: books for subject, books in context.data_manager.stats.items()
+                 if subject not in forecast.QURAN_SUBJECTS}
+        subject = CliPrompt.choose_key(books, "subject")
+        if not subject:
+            return
+        book = CliPrompt.choose_key(books[subject], "book")
+        if not book:
+            return
+        if CliPrompt.validate_choice("\nSet the number of pages in this book?", ["Y", "N"]) == "Y":
+            page_count = CliPrompt.validate_number("\nEnter the number of pages: ", 1, num_type=int)
+            ok, msg = context.data_manager.book_sizes.set(subject, book, page_count)
+            if not ok:
+                print(f"\nERROR! {msg}")
+        print(f"\n-------------( {book} )-------------\n")
+        print(forecast.get_summary(subject, book))
+
+    @staticmethod
+    def export_heatmap_menu(context: AppContext) -> None:
+        path_png = input("\nSave the heatmap as (leave blank for ./data/Heatmap.png): ").strip() or "./data/Heatmap.png"
+        print("\nDrawing the heatmap. Please wait.....")
+        print(f"\n{context.stats_manager.plotter.export_heatmap(path_png)[1]}")
+
+    @staticmethod
+    def search_menu(context: AppContext) -> None:
+        query = input("\nSearch for: ").strip()
+        if not query:
+            return
+        results = context.search_index.search(query, limit=20)
+        print(f"\n-------------( {len(results)} result(s) for \"{query}\" )-------------")
+        for i, (_, date, subject, book, session) in enumerate(results, 1):
+            CliProgressDisplay.display_entries(f"{i}. {date} | {subject} | {book} | {session}",
+                                               context.data_manager.entry_log[date][subject][book][session])
+
+    @staticmethod
+    def book_history_menu(context: AppContext) -> None:
+        stats = context.data_manager.stats
+        subject = CliPrompt.choose_key(stats, "subject")
+        if not subject:
+            return
+        book = CliPrompt.choose_key(stats[subject], "book")
+        if not book:
+            return
+        record = stats[subject][book]
+        print(f"\n-------------( {book} )-------------\n")
+        print(f">>> {record.total_entries} entries on {len(record.entry_dates)} day(s), {record.time_spent}, {record.pages} page(s)")
+        for date, session, details in reversed(context.data_manager.book_index.history(subject, book)):
+            CliProgressDisplay.display_entries(f"{date} | {session}", details)
+
     @staticmethod
     def exit_program(data_manager: DataManager) -> bool:
         confirmation = CliPrompt.validate_choice(
-            "\nAny unsaved changes will be lost. Are you sure you want to exit?",
+            "\nAre you sure you want to exit?",
             ["Y", "N"])
         if confirmation == "Y":
             if not "Al-Qur'an (Tafseer)" in data_manager.progress_today:
@@ -97,11 +188,14 @@ class Menus:
         print("\n<><><>__( Muslim Learning Journal )__<><><>\n")
                 
         print("\n-------------( Weekly Report )-------------\n")
-        print(context.stats_manager.weekly_stats.get_weekly_summary())
+        print(context.stats_manager.get_weekly_summary())
+        print(context.stats_manager.streaks.get_summary())
         
         MENU_ITEMS = [
             "Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)", "Log Other Subjects",
-            "Save Progress", "View Entries", "Edit Entries", "Delete Entries", "Check Weekly Report"
+            "Save Progress", "View Entries", "Edit Entries", "Delete Entries", "Check Weekly Report",
+            "Stats for a Date Range", "Qur'an Coverage", "Reading Pace and Forecast",
+            "Export Activity Heatmap (PNG)", "Search Entries", "Book History"
         ]
         main_menu = Menu(MENU_ITEMS)
         
@@ -109,6 +203,8 @@ class Menus:
             user_choice, exit_option = main_menu.display_menu() # type: ignore
             if user_choice == exit_option:
                 if cls.exit_program(context.data_manager):
+                    if context.close() != 0:
+                        print("\nERROR! Could not save your progress.")
                     return
             elif user_choice == 1:
                 CliWorkflow.log_Quran_progress(context)
@@ -127,6 +223,18 @@ class Menus:
             elif user_choice == 8:
                 print("\nLoading the plot. Please wait.....")
                 context.stats_manager.plotter.display_plot_weekly()
+            elif user_choice == 9:
+                cls.range_stats_menu(context)
+            elif user_choice == 10:
+                cls.quran_coverage_menu(context)
+            elif user_choice == 11:
+                cls.reading_forecast_menu(context)
+            elif user_choice == 12:
+                cls.export_heatmap_menu(context)
+            elif user_choice == 13:
+                cls.search_menu(context)
+            elif user_choice == 14:
+                cls.book_history_menu(context)
 
 
 def main():
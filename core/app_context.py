@@ -2,6 +2,12 @@ import os, pathlib
 from core.data_manager import DataManager
 from core.stats_manager import StatsManager
 from core.core_services import PasswordManager
+from core.storage import StorageFactory
+from core.autosave import AutosaveWorker
+from core.restore import RestoreService
+from core.search_index import SearchIndex
+from core.query import JournalQuery
+from core.autocomplete import NameAutocomplete
 
 
 class AppContext:
@@ -11,20 +17,35 @@ class AppContext:
         
         self.path_password_file = './data/password.txt'
         self.path_json = "./data/learning_data.json"
+        self.path_db = "./data/learning_data.db"
+        self.dir_log = "./data/log"
+        self.path_bin = "./data/learning_data.mljb"
         self.path_md = "./data/Journal.md"
 
 
-        self.data_manager = DataManager(self.path_json, self.path_md)
+        storage = StorageFactory.open_storage(self.path_json, self.path_db, self.dir_log, self.path_bin)
+        self.data_manager = DataManager(self.path_json, self.path_md, storage)
         self.stats_manager = StatsManager(self.data_manager)
+        self.search_index = SearchIndex(self.data_manager)
+        self.autocomplete = NameAutocomplete(self.data_manager)
         self.password_manager = PasswordManager(self.path_password_file)
         self.unsaved_entries = {}
 
-        self.stats_manager.cache_builder.build_subjects_cache()
-        self.stats_manager.aggregator.calculate_all_time_stats()
+        if not self.data_manager.load_stats_snapshot():
+            self.stats_manager.cache_builder.build_subjects_cache()
+            self.stats_manager.aggregator.calculate_all_time_stats()
+
+        self.autosave = AutosaveWorker(self.data_manager)
+        self.autosave.start()
     
+    def query(self) -> JournalQuery:
+        """A new query over the whole journal; see JournalQuery."""
+        return JournalQuery(self.data_manager, self.search_index, self.stats_manager.day_rollup)
+
     def add_entry_to_log(self, entry):
         self.data_manager.add_entry(entry)
         self.stats_manager.on_entry_added(entry)
+        self.data_manager.notify_change()  # Only now, so the snapshot includes the stats as well
         count = 1
         key = f"{entry.subject}\n{entry.book}\nEntry no.{count}"
         while key in self.unsaved_entries:
@@ -33,11 +54,21 @@ class AppContext:
         self.unsaved_entries[key] = entry
 
     def save_progress_to_files(self):
-        return_code = self.data_manager.save_data_to_files()
+        return_code = self.autosave.save_now()
         if return_code == 0:
             self.clear_unsaved_entries()
         return return_code    
 
+    def restore_data(self, path: str, snapshot: str = None, progress=None):
+        return RestoreService(self.data_manager, self.stats_manager).restore(path, snapshot, progress)
+
+    def close(self) -> int:
+        """Stop autosaving, writing anything that is still waiting, and keep the stats for the next start."""
+        return_code = self.autosave.stop()
+        if return_code == 0:
+            self.data_manager.save_stats_snapshot()
+        return return_code
+
     def clear_unsaved_entries(self):
         self.unsaved_entries.clear()
     
@@ -57,4 +88,10 @@ class AppContext:
 
     def change_path_md(self, file_path):
         self.path_md = file_path
-        return self.data_manager.save_md_as(file_path)
\ No newline at end of file
+        self.data_manager.set_path_md(file_path)
+        return_code = self.save_progress_to_files()
+        if return_code == 1:
+            return False, "Could not save JSON file."
+        elif return_code == 2:
+            return False, "Could not save Markdown file."
+        return True, "Saved successfully"
\ No newline at end of file
@@ -0,0 +1,139 @@
+from heapq import nlargest
+from core.core_services import DateManager
+
+
+class PrefixTrie:
+    """
+    Names found by the start of any of their words, ignoring case: "sal" finds
+    "Riyad us-Saliheen". Every node keeps the names below it, so a lookup costs the
+    length of the prefix, however many names there are.
+    """
+
+    def __init__(self) -> None:
+        self.root = ({}, set())  # (children by character, names below this node)
+        self.names = set()
+
+    @staticmethod
+    def keys_of(name: str) -> list:
+        """The name from each of its word starts on, in lower case."""
+        lowered = name.lower()
+        return [lowered[i:] for i, char in enumerate(lowered)
+                if char.isalnum() and (i == 0 or not lowered[i - 1].isalnum())] or [lowered]
+
+    def add(self, name: str) -> None:
+        if name in self.names:
+            return
+        self.names.add(name)
+        for key in self.keys_of(name):
+            node = self.root
+            for char in key:
+                node = node[0].setdefault(char, ({}, set()))
+                node[1].add(name)
+
+    def find(self, prefix: str) -> set:
+        node = self.root
+        for char in prefix.lower():
+            node = node[0].get(char)
+            if node is None:
+                return set()
+        return node[1] if node is not self.root else self.names
+
+
+class NameAutocomplete:
+    """
+    Suggestions for subject and book names as they are typed, the names used most
+    and most lately first.
+
+    A book's rank is its entry count (from Statistics) halved for every
+    HALF_LIFE_DAYS since it was last read; a subject's is the sum of its books'.
+    The names come from All Time Subjects, so the Qur'an subjects are left out just
+    as they are there. Built on first use, then kept current as a DataManager
+    listener; a restore swaps in a new Entry Log, which is noticed and the names are
+    read again. Names are only ever added to the tries, so a match is shown only
+    while All Time Subjects still has it (a book can be deleted or moved).
+    """
+    HALF_LIFE_DAYS = 30
+    QURAN_SUBJECTS = ("Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)")
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.entry_log = None
+        self.subject_trie = PrefixTrie()
+        self.book_tries = {}  # subject -> PrefixTrie of its books
+        self.last_read = {}  # (subject, book) -> ordinal of the last day it was read
+
+    def build(self) -> None:
+        self.entry_log = self.data.entry_log
+        self.subject_trie = PrefixTrie()
+        self.book_tries = {}
+        self.last_read = {}
+        for subject, books in self.data.all_time_subjects.items():
+            for book in books:
+                self.add_name(subject, book)
+        for subject, records in self.data.stats.items():
+            for book, record in records.items():
+                if record.entry_dates:
+                    self.last_read[(subject, book)] = max(map(DateManager.date_to_ordinal, record.entry_dates))
+        if self not in self.data.listeners:
+            self.data.listeners.append(self)
+
+    def ensure_built(self) -> None:
+        if self.entry_log is not self.data.entry_log:
+            self.build()
+
+    def add_name(self, subject: str, book: str) -> None:
+        self.subject_trie.add(subject)
+        self.book_tries.setdefault(subject, PrefixTrie()).add(book)
+
+    def on_day_changed(self, date: str) -> None:
+        if self.entry_log is not self.data.entry_log:
+            return  # Not built yet, or built from data a restore has replaced
+        progress_date = self.entry_log.get(date)
+        if not progress_date:
+            return
+        ordinal = DateManager.date_to_ordinal(date)
+        for subject, books in progress_date.items():
+            if subject in self.QURAN_SUBJECTS:
+                continue
+            for book in books:
+                self.add_name(subject, book)
+                self.last_read[(subject, book)] = max(self.last_read.get((subject, book), ordinal), ordinal)
+
+    def on_clear(self) -> None:
+        self.entry_log = None  # Read the names again on next use
+
+    def book_rank(self, subject: str, book: str, today: int) -> float:
+        record = self.data.stats.get(subject, {}).get(book)
+        if record is None or (subject, book) not in self.last_read:
+            return 0
+        return record.total_entries * 0.5 ** ((today - self.last_read[(subject, book)]) / self.HALF_LIFE_DAYS)
+
+    def ranked(self, names, rank, limit: int) -> list:
+        ranks = {name: rank(name) for name in names}
+        return nlargest(limit, sorted(ranks), key=ranks.get)  # Sorted first, so equal ranks come alphabetically
+
+    def subjects(self, prefix: str = "", limit: int = 10) -> list:
+        self.ensure_built()
+        today = DateManager.date_to_ordinal(DateManager.get_date_today())
+        known = self.data.all_time_subjects
+        return self.ranked([subject for subject in self.subject_trie.find(prefix.strip()) if subject in known],
+                           lambda subject: sum(self.book_rank(subject, book, today)
+                                               for book in self.book_tries.get(subject, PrefixTrie()).names), limit)
+
+    def existing(self, name: str, subject: str = None):
+        """The stored spelling of a subject name (or of a book of `subject`), ignoring case; None if it is new."""
+        self.ensure_built()
+        trie = self.subject_trie if subject is None else self.book_tries.get(subject, PrefixTrie())
+        name = name.strip()
+        known = self.data.all_time_subjects if subject is None else self.data.all_time_subjects.get(subject, ())
+        return next((found for found in trie.find(name) if found.lower() == name.lower() and found in known), None)
+
+    def books(self, subject: str, prefix: str = "", limit: int = 10) -> list:
+        self.ensure_built()
+        today = DateManager.date_to_ordinal(DateManager.get_date_today())
+        trie = self.book_tries.get(subject)
+        if trie is None:
+            return []
+        known = set(self.data.all_time_subjects.get(subject, ()))
+        return self.ranked([book for book in trie.find(prefix.strip()) if book in known],
+                           lambda book: self.book_rank(subject, book, today), limit)
@@ -0,0 +1,116 @@
+import time, threading
+
+
+class AutosaveWorker:
+    """
+    Writes the journal to disk on its own thread, shortly after changes stop coming in.
+
+    A change only marks the journal dirty and pushes the deadline back, so entering
+    data never waits on a snapshot or on disk I/O. `delay` seconds after the last
+    change the worker takes the snapshot (DataManager.take_snapshot) and writes it,
+    so a burst of changes ends up in a single write. A failed write is kept, merged
+    into the next snapshot and retried later.
+    """
+    DELAY = 2.0  # seconds
+    RETRY_DELAY = 30.0
+
+    def __init__(self, data_manager, delay: float = DELAY) -> None:
+        self.data = data_manager
+        self.delay = delay
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.dirty = False  # Changes made since the last snapshot
+        self.queued = None  # Snapshot whose write failed, waiting to be retried
+        self.writing = False
+        self.deadline = 0.0
+        self.stopping = False
+        self.last_latency = None
+        self.status_listener = None  # Called with (return code, seconds taken) after every write
+        self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+
+    def start(self) -> None:
+        self.data.on_change = self.notify
+        self.thread.start()
+
+    def queue(self, snapshot) -> None:
+        self.queued = snapshot if self.queued is None else self.queued.merge(snapshot)
+
+    def notify(self) -> None:
+        with self.condition:
+            self.dirty = True
+            self.deadline = time.monotonic() + self.delay
+            self.condition.notify()
+
+    def has_pending(self) -> bool:
+        with self.condition:
+            return self.dirty or self.writing or self.queued is not None
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.stopping:
+                    if not self.dirty and self.queued is None:
+                        self.condition.wait()
+                        continue
+                    remaining = self.deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.stopping:
+                    return
+            self.write_queued()
+
+    def take_snapshot(self) -> None:
+        """Queue a snapshot of the changes made since the last one."""
+        with self.condition:
+            self.dirty = False
+        try:
+            snapshot = self.data.take_snapshot()
+        except RuntimeError:  # The stats changed size while being copied: a change is under way, try again after it
+            with self.condition:
+                self.dirty = True
+                self.deadline = time.monotonic() + self.delay
+            return
+        with self.condition:
+            self.queue(snapshot)
+
+    def write_queued(self) -> int:
+        """
+        Take a snapshot of any new changes and write it, along with a failed one waiting
+        to be retried. Writes never overlap, so records reach the disk in order.
+        """
+        with self.write_lock:
+            if self.dirty:
+                self.take_snapshot()
+            with self.condition:
+                snapshot, self.queued = self.queued, None
+                self.writing = snapshot is not None
+            if snapshot is None:
+                return 0
+            start = time.perf_counter()
+            return_code = self.data.write_snapshot(snapshot)
+            self.last_latency = time.perf_counter() - start
+            with self.condition:
+                self.writing = False
+                if return_code != 0:
+                    self.queued = snapshot if self.queued is None else snapshot.merge(self.queued)
+                    self.deadline = time.monotonic() + self.RETRY_DELAY
+        if self.status_listener is not None:
+            self.status_listener(return_code, self.last_latency)
+        return return_code
+
+    def save_now(self) -> int:
+        """Write everything right away on the calling thread, e.g. when the user asks to save."""
+        with self.condition:
+            self.dirty = True
+        return self.write_queued()
+
+    def stop(self) -> int:
+        """Stop the thread and write whatever is left."""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.data.on_change = None
+        return self.save_now()
@@ -0,0 +1,143 @@
+import os, json, zlib, hashlib
+from datetime import datetime
+from core.core_services import DateManager
+from core.file_manager import FileManager
+
+
+class BackupRepository:
+    """
+    A folder of incremental backups:
+
+        chunks/ab/ab12...      zlib-compressed JSON, named by the SHA-256 of its contents
+        snapshots/<name>.json  the chunks that make up one backup
+
+    The Entry Log is cut into one chunk per month and the other sections go into a
+    chunk of their own. A month that has not changed since an earlier backup gives
+    a chunk that is already stored, so a backup only writes the chunks of the
+    months that changed, plus its small snapshot file.
+    """
+    VERSION = 1
+    TIMESTAMP_FORMAT = "%d-%m-%Y_%H-%M-%S"  # DateManager.get_timestamp()
+
+    def __init__(self, repo_dir: str) -> None:
+        self.repo_dir = repo_dir
+        self.dir_chunks = os.path.join(repo_dir, "chunks")
+        self.dir_snapshots = os.path.join(repo_dir, "snapshots")
+
+    @staticmethod
+    def is_repository(path: str) -> bool:
+        return os.path.isdir(os.path.join(path, "snapshots"))
+
+    def chunk_path(self, digest: str) -> str:
+        return os.path.join(self.dir_chunks, digest[:2], digest)
+
+    def put_chunk(self, value) -> tuple:
+        """Store a value unless an identical chunk is already there. Returns (digest, written)."""
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self.chunk_path(digest)
+        if os.path.exists(path):
+            return digest, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        FileManager.splice_atomic(path, 0, zlib.compress(payload))
+        return digest, True
+
+    def get_chunk(self, digest: str):
+        with open(self.chunk_path(digest), "rb") as file:
+            try:
+                payload = zlib.decompress(file.read())
+            except zlib.error as e:
+                raise ValueError(f"Chunk {digest} is damaged") from e
+        if hashlib.sha256(payload).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is damaged")
+        return json.loads(payload.decode("utf-8"))
+
+    def backup(self, file_dict: dict):
+        entry_log = file_dict["Entry Log"]
+        months = {}
+        for date in entry_log:
+            months.setdefault(DateManager.date_to_month(date), {})[date] = entry_log[date]
+        try:
+            new_chunks = 0
+            chunks_log = []
+            for month, days in sorted(months.items()):
+                digest, written = self.put_chunk(days)
+                chunks_log.append([month, digest])
+                new_chunks += written
+            sections = {key: value for key, value in file_dict.items() if key != "Entry Log"}
+            digest_sections, written = self.put_chunk(sections)
+            new_chunks += written
+
+            timestamp = DateManager.get_timestamp()
+            name = f"learning_backup_{timestamp}"
+            count = 1
+            while os.path.exists(os.path.join(self.dir_snapshots, f"{name}.json")):
+                count += 1
+                name = f"learning_backup_{timestamp}_{count}"
+            snapshot = {
+                "Version": self.VERSION,
+                "Created": timestamp,
+                "Days": len(entry_log),
+                "Entry Log": chunks_log,
+                "Sections": digest_sections
+            }
+            os.makedirs(self.dir_snapshots, exist_ok=True)
+            saved, msg = FileManager.write_atomic(os.path.join(self.dir_snapshots, f"{name}.json"),
+                                                  json.dumps(snapshot, indent=4))
+            if not saved:
+                return False, f"Backup failed: {msg}"
+        except OSError as e:
+            return False, f"Backup failed: {e}"
+        return True, f"Backup successful!\n{new_chunks} of {len(chunks_log) + 1} chunk(s) had changed since earlier backups."
+
+    def list_snapshots(self) -> list:
+        """Every snapshot as {"Name", "Created", "Days"}, newest first."""
+        snapshots = []
+        try:
+            file_names = os.listdir(self.dir_snapshots)
+        except FileNotFoundError:
+            return []
+        for file_name in file_names:
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.dir_snapshots, file_name), "r", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+                created = datetime.strptime(snapshot["Created"], self.TIMESTAMP_FORMAT)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue  # Not a snapshot, or a damaged one
+            snapshots.append((created, {"Name": file_name[:-len(".json")], "Created": snapshot["Created"],
+                                        "Days": snapshot.get("Days", 0)}))
+        snapshots.sort(key=lambda item: (item[0], item[1]["Name"]), reverse=True)
+        return [snapshot for _, snapshot in snapshots]
+
+    def iter_snapshot(self, name: str = None):
+        """
+        Yield the snapshot (the newest one by default) chunk by chunk, as (section, date, value,
+        chunks read, total chunks): one item per day of "Entry Log", date None for other sections.
+        """
+        if name is None:
+            snapshots = self.list_snapshots()
+            if not snapshots:
+                raise ValueError("The backup repository has no snapshots.")
+            name = snapshots[0]["Name"]
+        with open(os.path.join(self.dir_snapshots, f"{name}.json"), "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        if snapshot.get("Version", 0) > self.VERSION:
+            raise ValueError(f"Snapshot {name} was made by a newer version of the app.")
+        total = len(snapshot["Entry Log"]) + 1
+        for number, (_, digest) in enumerate(snapshot["Entry Log"], start=1):
+            for date, day in self.get_chunk(digest).items():
+                yield "Entry Log", date, day, number, total
+        for section, value in self.get_chunk(snapshot["Sections"]).items():
+            yield section, None, value, total, total
+
+    def load_snapshot(self, name: str = None) -> dict:
+        """The data file as it was at the given snapshot (the newest one by default)."""
+        data = {"Entry Log": {}}
+        for section, date, value, _, _ in self.iter_snapshot(name):
+            if section == "Entry Log":
+                data["Entry Log"][date] = value
+            else:
+                data[section] = value
+        return data
@@ -0,0 +1,377 @@
+import os, re, json, struct, threading
+from core.core_services import DateManager, CoreHelpers
+from core.exceptions import DataCorruptionError
+
+
+class StringTable:
+    """Interned strings (subjects, books, notes, ...); everything else refers to them by number."""
+
+    def __init__(self, strings: list = None) -> None:
+        self.strings = list(strings or [])
+        self.numbers = {string: number for number, string in enumerate(self.strings)}
+
+    def intern(self, string: str) -> int:
+        number = self.numbers.get(string)
+        if number is None:
+            number = self.numbers[string] = len(self.strings)
+            self.strings.append(string)
+        return number
+
+    def copy(self) -> "StringTable":
+        return StringTable(self.strings)
+
+
+class DayCodec:
+    """
+    Encodes one day of the Entry Log (subjects -> books -> sessions -> fields).
+
+    Known field names are written as one-byte codes, "Time Spent" as integer
+    minutes and session names like "Entry 09:15:02 PM" as seconds of the day.
+    Anything that would not come back exactly the same is kept as it is, so
+    decoding always gives back the original day.
+    """
+    FIELDS = ("Page", "Total Pages", "Time Spent", "Notes", "Reading Mode", "Revision", "Book",
+              "Unit", "Chapter", "Ruku (Para)", "Total Ruku", "Surah", "Ayah", "Total Aayat")
+    FIELD_CODES = {field: code for code, field in enumerate(FIELDS, start=1)}
+    NONE, FALSE, TRUE, INT, NEGATIVE_INT, FLOAT, STRING, MINUTES, JSON = range(9)
+    SESSION_NAME = re.compile(r"^Entry (\d\d):(\d\d):(\d\d) (AM|PM)$")
+    DOUBLE = struct.Struct("<d")
+
+    def __init__(self, table: StringTable) -> None:
+        self.table = table
+
+    @staticmethod
+    def write_number(out: bytearray, number: int) -> None:
+        while number >= 0x80:
+            out.append((number & 0x7F) | 0x80)
+            number >>= 7
+        out.append(number)
+
+    @staticmethod
+    def read_number(data: bytes, position: int) -> tuple:
+        number = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return number, position
+            shift += 7
+
+    def write_string(self, out: bytearray, string: str) -> None:
+        self.write_number(out, self.table.intern(string))
+
+    @classmethod
+    def session_seconds(cls, session: str):
+        """Seconds of the day for a canonical session name, otherwise None."""
+        match = cls.SESSION_NAME.match(session)
+        if not match:
+            return None
+        hours, minutes, seconds = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        if not (1 <= hours <= 12 and minutes < 60 and seconds < 60):
+            return None
+        hours = hours % 12 + (12 if match.group(4) == "PM" else 0)
+        return (hours * 60 + minutes) * 60 + seconds
+
+    @staticmethod
+    def session_name(seconds: int) -> str:
+        hours, rest = divmod(seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        return f"Entry {hours % 12 or 12:02}:{minutes:02}:{seconds:02} {'AM' if hours < 12 else 'PM'}"
+
+    @staticmethod
+    def time_minutes(time_spent):
+        """Integer minutes when "Time Spent" is exactly what format_time() gives for them, otherwise None."""
+        if not isinstance(time_spent, str):
+            return None
+        try:
+            minutes = CoreHelpers.convert_time_to_mins(time_spent)
+        except ValueError:
+            return None
+        return minutes if minutes >= 0 and CoreHelpers.format_time(minutes) == time_spent else None
+
+    def write_value(self, out: bytearray, field: str, value) -> None:
+        if value is None:
+            out.append(self.NONE)
+        elif value is True or value is False:
+            out.append(self.TRUE if value else self.FALSE)
+        elif isinstance(value, int):
+            out.append(self.INT if value >= 0 else self.NEGATIVE_INT)
+            self.write_number(out, abs(value))
+        elif isinstance(value, float):
+            out.append(self.FLOAT)
+            out += self.DOUBLE.pack(value)
+        elif isinstance(value, str):
+            minutes = self.time_minutes(value) if field == "Time Spent" else None
+            if minutes is not None:
+                out.append(self.MINUTES)
+                self.write_number(out, minutes)
+            else:
+                out.append(self.STRING)
+                self.write_string(out, value)
+        else:
+            out.append(self.JSON)
+            self.write_string(out, json.dumps(value, ensure_ascii=False))
+
+    def read_value(self, data: bytes, position: int) -> tuple:
+        tag = data[position]
+        position += 1
+        if tag == self.NONE:
+            return None, position
+        if tag == self.FALSE or tag == self.TRUE:
+            return tag == self.TRUE, position
+        if tag == self.FLOAT:
+            return self.DOUBLE.unpack_from(data, position)[0], position + 8
+        number, position = self.read_number(data, position)
+        if tag == self.INT:
+            return number, position
+        if tag == self.NEGATIVE_INT:
+            return -number, position
+        if tag == self.MINUTES:
+            return CoreHelpers.format_time(number), position
+        if tag == self.STRING:
+            return self.table.strings[number], position
+        if tag == self.JSON:
+            return json.loads(self.table.strings[number]), position
+        raise ValueError(f"Unknown value tag {tag}")
+
+    def encode(self, day: dict) -> bytes:
+        out = bytearray()
+        self.write_number(out, len(day))
+        for subject, books in day.items():
+            self.write_string(out, subject)
+            self.write_number(out, len(books))
+            for book, sessions in books.items():
+                self.write_string(out, book)
+                self.write_number(out, len(sessions))
+                for session, details in sessions.items():
+                    seconds = self.session_seconds(session)
+                    if seconds is not None:
+                        self.write_number(out, seconds << 1)
+                    else:
+                        self.write_number(out, self.table.intern(session) << 1 | 1)
+                    self.write_number(out, len(details))
+                    for field, value in details.items():
+                        code = self.FIELD_CODES.get(field, 0)
+                        out.append(code)
+                        if not code:
+                            self.write_string(out, field)
+                        self.write_value(out, field, value)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> dict:
+        strings = self.table.strings
+        read_number = self.read_number
+        day = {}
+        count_subjects, position = read_number(data, 0)
+        for _ in range(count_subjects):
+            subject, position = read_number(data, position)
+            books = day[strings[subject]] = {}
+            count_books, position = read_number(data, position)
+            for _ in range(count_books):
+                book, position = read_number(data, position)
+                sessions = books[strings[book]] = {}
+                count_sessions, position = read_number(data, position)
+                for _ in range(count_sessions):
+                    session, position = read_number(data, position)
+                    session = strings[session >> 1] if session & 1 else self.session_name(session >> 1)
+                    details = sessions[session] = {}
+                    count_fields, position = read_number(data, position)
+                    for _ in range(count_fields):
+                        code = data[position]
+                        position += 1
+                        if code:
+                            field = self.FIELDS[code - 1]
+                        else:
+                            field, position = read_number(data, position)
+                            field = strings[field]
+                        details[field], position = self.read_value(data, position)
+        return day
+
+
+class BinaryJournal:
+    """
+    The compact journal file (".mljb"):
+
+        "MLJB" | version (u16) | header length (u32) | header | day records
+
+    The header holds the string table, the sections other than "Entry Log" as compact
+    JSON, and one (date, record length) pair per day. Each day record is encoded with
+    DayCodec, so a single day can be read without decoding the rest of the file.
+    """
+    MAGIC = b"MLJB"
+    VERSION = 1
+    PREFIX = struct.Struct("<4sHI")
+
+    @staticmethod
+    def write_date(codec: DayCodec, out: bytearray, date: str) -> None:
+        try:
+            ordinal = DateManager.date_to_ordinal(date)
+        except ValueError:
+            ordinal = None
+        if ordinal is not None and DateManager.ordinal_to_date(ordinal) == date:
+            codec.write_number(out, ordinal << 1)
+        else:
+            codec.write_number(out, codec.table.intern(date) << 1 | 1)
+
+    @classmethod
+    def dumps(cls, sections: dict, raw_day=None, table: StringTable = None) -> bytes:
+        """
+        Encode a whole data file. `raw_day(date)` may return a day record exactly as it
+        already is in the current file; that only works together with that file's `table`.
+        """
+        codec = DayCodec(table or StringTable())
+        entry_log = sections.get("Entry Log", {})
+        records = []
+        for date in entry_log:
+            record = raw_day(date) if raw_day else None
+            records.append(record if record is not None else codec.encode(entry_log[date]))
+
+        directory = bytearray()
+        codec.write_number(directory, len(records))
+        for date, record in zip(entry_log, records):
+            cls.write_date(codec, directory, date)
+            codec.write_number(directory, len(record))
+        other_sections = {key: (None if key == "Entry Log" else value) for key, value in sections.items()}
+        sections_json = json.dumps(other_sections, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        header = bytearray()
+        codec.write_number(header, len(codec.table.strings))
+        for string in codec.table.strings:
+            encoded = string.encode("utf-8", "surrogatepass")
+            codec.write_number(header, len(encoded))
+            header += encoded
+        codec.write_number(header, len(sections_json))
+        header += sections_json
+        header += directory
+        return cls.PREFIX.pack(cls.MAGIC, cls.VERSION, len(header)) + bytes(header) + b"".join(records)
+
+    @classmethod
+    def loads(cls, data: bytes) -> dict:
+        """Decode a whole data file back into the same dict json.load() would give."""
+        header = BinaryHeader.parse(data)
+        codec = DayCodec(header.table)
+        entry_log = {}
+        for date, (start, end) in header.days.items():
+            entry_log[date] = codec.decode(data[start:end])
+        return {key: (entry_log if key == "Entry Log" else value) for key, value in header.sections.items()}
+
+
+class BinaryHeader:
+    def __init__(self, table: StringTable, sections: dict, days: dict) -> None:
+        self.table = table
+        self.sections = sections
+        self.days = days  # date -> (start, end) byte offsets in the file
+
+    @staticmethod
+    def read_prefix(data: bytes) -> int:
+        """Return the header length after checking the magic bytes and the version."""
+        if len(data) < BinaryJournal.PREFIX.size:
+            raise ValueError("File is too short")
+        magic, version, header_length = BinaryJournal.PREFIX.unpack_from(data)
+        if magic != BinaryJournal.MAGIC:
+            raise ValueError("Not a Learning Journal binary file")
+        if version > BinaryJournal.VERSION:
+            raise ValueError(f"Unsupported format version {version}")
+        return header_length
+
+    @classmethod
+    def parse(cls, data: bytes) -> "BinaryHeader":
+        """Parse the header; `data` needs to hold at least the prefix and the header."""
+        header_length = cls.read_prefix(data)
+        read_number = DayCodec.read_number
+        position = BinaryJournal.PREFIX.size
+        end_of_header = position + header_length
+        count_strings, position = read_number(data, position)
+        strings = []
+        for _ in range(count_strings):
+            length, position = read_number(data, position)
+            strings.append(bytes(data[position:position + length]).decode("utf-8", "surrogatepass"))
+            position += length
+        length, position = read_number(data, position)
+        sections = json.loads(bytes(data[position:position + length]).decode("utf-8"))
+        position += length
+        count_days, position = read_number(data, position)
+        days = {}
+        offset = end_of_header
+        for _ in range(count_days):
+            date, position = read_number(data, position)
+            date = strings[date >> 1] if date & 1 else DateManager.ordinal_to_date(date >> 1)
+            length, position = read_number(data, position)
+            days[date] = (offset, offset + length)
+            offset += length
+        if position != end_of_header:
+            raise ValueError("Header length does not match its contents")
+        return cls(StringTable(strings), sections, days)
+
+
+class BinaryDaySource:
+    """Day loader for LazyEntryLog over a compact journal file; only the header is read up front."""
+
+    def __init__(self, path_bin: str) -> None:
+        self.path_bin = path_bin
+        self.lock = threading.Lock()
+        self.header = BinaryHeader(StringTable(), {}, {})
+        self.load_header()
+
+    @property
+    def sections(self) -> dict:
+        return self.header.sections
+
+    @property
+    def table(self) -> StringTable:
+        return self.header.table
+
+    def load_header(self) -> None:
+        try:
+            with open(self.path_bin, "rb") as file:
+                prefix = file.read(BinaryJournal.PREFIX.size)
+                if not prefix:
+                    return
+                header_length = BinaryHeader.read_prefix(prefix)
+                self.header = BinaryHeader.parse(prefix + file.read(header_length))
+        except FileNotFoundError:
+            return
+        except (ValueError, IndexError, UnicodeDecodeError) as e:
+            raise DataCorruptionError(file_path=self.path_bin) from e
+
+    def read_record(self, date: str) -> bytes:
+        start, end = self.header.days[date]
+        with open(self.path_bin, "rb") as file:
+            file.seek(start)
+            return file.read(end - start)
+
+    def load_section(self, key: str, default=None):
+        return self.header.sections.get(key, default)
+
+    def load_dates(self) -> list:
+        return list(self.header.days)
+
+    def load_day(self, date: str) -> dict:
+        with self.lock:
+            try:
+                return DayCodec(self.header.table).decode(self.read_record(date))
+            except (ValueError, IndexError) as e:
+                raise DataCorruptionError(file_path=self.path_bin) from e
+
+    def raw_day(self, date: str):
+        with self.lock:
+            if date not in self.header.days:
+                return None
+            return self.read_record(date)
+
+    def replace_file(self, data: bytes, index=None):
+        """Atomically swap in a new file; its header becomes the new day index."""
+        temp_path = f"{self.path_bin}.tmp"
+        try:
+            header = BinaryHeader.parse(data)
+            with open(temp_path, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            with self.lock:
+                os.replace(temp_path, self.path_bin)
+                self.header = header
+        except OSError as e:
+            return False, str(e)
+        return True, "Saved successfully"
@@ -0,0 +1,86 @@
+from core.core_services import DateManager
+
+
+class BookIndex:
+    """
+    Where every book was read: (subject, book) -> date -> its sessions on that date, in
+    the order they were added. The history of one book, or every day it appears on,
+    is then found without going through the whole Entry Log.
+
+    Built from the Entry Log the first time it is used. DataManager keeps it in step
+    with adds, edits and deletes, and makes a new one when a restore replaces the log.
+    """
+
+    def __init__(self, entry_log) -> None:
+        self.entry_log = entry_log
+        self.books = None  # Not built yet
+
+    def build(self) -> None:
+        self.books = {}
+        for date, progress_date in self.entry_log.items():
+            for subject, books in progress_date.items():
+                for book, sessions in books.items():
+                    for session in sessions:
+                        self.add(date, subject, book, session)
+
+    def ensure_built(self) -> None:
+        if self.books is None:
+            self.build()
+
+    def add(self, date: str, subject: str, book: str, session: str) -> None:
+        if self.books is not None:
+            self.books.setdefault((subject, book), {}).setdefault(date, {})[session] = None
+
+    def remove(self, date: str, subject: str, book: str, session: str) -> None:
+        if self.books is None:
+            return
+        dates = self.books.get((subject, book), {})
+        dates.get(date, {}).pop(session, None)
+        if date in dates and not dates[date]:
+            del dates[date]
+        if (subject, book) in self.books and not dates:
+            del self.books[(subject, book)]
+
+    def remove_day(self, date: str, progress_date: dict) -> None:
+        for subject, books in progress_date.items():
+            for book, sessions in books.items():
+                for session in sessions:
+                    self.remove(date, subject, book, session)
+
+    def clear(self) -> None:
+        """Every entry was deleted: the index is built, and empty."""
+        self.books = {}
+
+    def dates_of(self, subject: str, book: str) -> list:
+        """Every date the book was read on, oldest first."""
+        return [date for _, date in self.dated(subject, book)]
+
+    def dated(self, subject: str, book: str) -> list:
+        """(ordinal, date) of every date the book was read on, oldest first."""
+        self.ensure_built()
+        return sorted((DateManager.date_to_ordinal(date), date) for date in self.books.get((subject, book), {}))
+
+    def subjects_of(self, book: str) -> list:
+        """Every subject the book is filed under (the same book name can be under several)."""
+        self.ensure_built()
+        return [subject for subject, name in self.books if name == book]
+
+    def books_of(self, subject: str) -> list:
+        self.ensure_built()
+        return [book for name, book in self.books if name == subject]
+
+    def sessions(self, subject: str, book: str, date: str) -> list:
+        self.ensure_built()
+        return list(self.books.get((subject, book), {}).get(date, ()))
+
+    def count(self, subject: str, book: str) -> int:
+        """Sessions of the book, without reading any of them."""
+        self.ensure_built()
+        return sum(len(sessions) for sessions in self.books.get((subject, book), {}).values())
+
+    def history(self, subject: str, book: str) -> list:
+        """Every session of the book as (date, session, details), oldest first."""
+        self.ensure_built()
+        dates = self.books.get((subject, book), {})
+        return [(date, session, self.entry_log[date][subject][book][session])
+                for date in self.dates_of(subject, book) for session in dates[date]]
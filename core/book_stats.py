@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from core.core_services import CoreHelpers
+
+
+class EntryDates:
+    """
+    The days a book was read on, each with its number of sessions (a counted set, in
+    the order the days were added). Stored as the plain list of dates, so a count read
+    back from the file is not known (None) until StatsUpdater fills it in from the day.
+    """
+
+    def __init__(self, counts: dict = None) -> None:
+        self.counts = dict(counts or {})
+
+    def __contains__(self, date: str) -> bool:
+        return date in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EntryDates) and list(self.counts) == list(other.counts)
+
+    def __repr__(self) -> str:
+        return f"EntryDates({self.counts})"
+
+    def count(self, date: str):
+        """Sessions on `date`: 0 if none, None if the date is recorded but its count is not known."""
+        return self.counts.get(date, 0)
+
+    def set_count(self, date: str, sessions: int) -> None:
+        if sessions > 0:
+            self.counts[date] = sessions
+        else:
+            self.counts.pop(date, None)
+
+    def add(self, date: str, sessions: int = 1) -> None:
+        self.counts[date] = (self.counts.get(date) or 0) + sessions
+
+    def remove(self, date: str, sessions: int = 1) -> None:
+        """Take sessions off `date`, dropping the date when none are left. The count must be known."""
+        self.set_count(date, self.counts.get(date, 0) - sessions)
+
+    def discard(self, date: str) -> None:
+        self.counts.pop(date, None)
+
+    def to_list(self) -> list:
+        return list(self.counts)
+
+    @classmethod
+    def from_list(cls, dates) -> "EntryDates":
+        return cls(dict.fromkeys(dates))
+
+
+@dataclass
+class BookStats:
+    """
+    All-time statistics of one book, as kept in memory (DataManager.stats maps
+    subject -> book -> BookStats). Minutes stay an integer; the "Time Spent" text
+    is only made when the stats are written out.
+    """
+    pages: float = 0
+    minutes: int = 0
+    total_entries: int = 0
+    entry_dates: EntryDates = field(default_factory=EntryDates)
+
+    @property
+    def time_spent(self) -> str:
+        return CoreHelpers.format_time(self.minutes)
+
+    def to_dict(self) -> dict:
+        return {
+            "Pages": self.pages,
+            "Time Spent": self.time_spent,
+            "Total Entries": self.total_entries,
+            "Entry Dates": self.entry_dates.to_list()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BookStats":
+        return cls(data.get("Pages", 0), CoreHelpers.convert_time_to_mins(data.get("Time Spent", "")),
+                   data.get("Total Entries", 0), EntryDates.from_list(data.get("Entry Dates", [])))
+
+    @classmethod
+    def parse_stats(cls, stats: dict) -> dict:
+        """The "Statistics" section as stored (or records already) -> subject -> book -> BookStats."""
+        return {subject: {book: record if isinstance(record, cls) else cls.from_dict(record)
+                          for book, record in books.items()}
+                for subject, books in stats.items()}
+
+    @staticmethod
+    def format_stats(stats: dict) -> dict:
+        """subject -> book -> BookStats -> the "Statistics" section as it is stored."""
+        return {subject: {book: record.to_dict() for book, record in books.items()}
+                for subject, books in stats.items()}
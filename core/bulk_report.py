@@ -0,0 +1,164 @@
+import os, csv, json, zipfile
+from core.core_services import DateManager, CoreHelpers
+from core.entries import CommonEntry, EntryLoader
+from core.lazy_json import JsonStreamReader
+from core.operation_log import OperationLog
+
+
+class JournalDays:
+    """
+    The days of a journal data file (learning_data.json or a backup zip), read one at
+    a time. For a data file, changes still waiting in its operation log are laid over
+    the days they touch, so the report sees what the app would.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.is_zip = zipfile.is_zipfile(path)
+
+    def pending_changes(self) -> tuple:
+        """(whether everything was deleted, date -> records) from the operation log, left untouched."""
+        if self.is_zip:
+            return False, {}
+        cleared, pending = False, {}
+        for record in OperationLog(os.path.splitext(self.path)[0] + ".oplog").read(repair=False):
+            if record["op"] == "delete" and record["date"] is None:
+                cleared, pending = True, {}
+            else:
+                pending.setdefault(record["date"], []).append(record)
+        return cleared, pending
+
+    @staticmethod
+    def replay(date: str, day, records: list):
+        entry_log = {date: day} if day else {}
+        for record in records:
+            OperationLog.apply(entry_log, record)
+        return entry_log.get(date)
+
+    def stream_entry_log(self, stream):
+        for section, date, value in JsonStreamReader(stream).items():
+            if section == "Entry Log":
+                yield date, value
+
+    def file_days(self):
+        if self.is_zip:
+            with zipfile.ZipFile(self.path, "r") as zipf:
+                with zipf.open("learning_data.json") as stream:
+                    yield from self.stream_entry_log(stream)
+        else:
+            with open(self.path, "rb") as stream:
+                yield from self.stream_entry_log(stream)
+
+    def __iter__(self):
+        """Yield (date, day) for every day with entries."""
+        cleared, pending = self.pending_changes()
+        if not cleared:
+            for date, day in self.file_days():
+                if date in pending:
+                    day = self.replay(date, day, pending.pop(date))
+                if day:
+                    yield date, day
+        for date in sorted(pending, key=DateManager.date_to_ordinal):  # Days only the log knows about
+            day = self.replay(date, None, pending[date])
+            if day:
+                yield date, day
+
+
+class BulkReport:
+    """
+    Per-day, per-month and per-book summaries of a whole journal in one pass.
+
+    Every session is read through its entry class, and each day's row is handed back
+    as soon as the day has been read. Months and books only keep running totals
+    (no date lists, no Statistics), so memory grows with the number of months and
+    books, never with the number of entries.
+    """
+    LEVELS = ("day", "month", "book")
+    COLUMNS = {
+        "day": ["Date", "Entries", "Minutes", "Pages", "Books"],
+        "month": ["Month", "Entries", "Minutes", "Pages", "Active Days"],
+        "book": ["Subject", "Book", "Entries", "Minutes", "Pages", "Active Days", "First Date", "Last Date"]
+    }
+
+    def __init__(self, start: str = None, end: str = None) -> None:
+        self.first = DateManager.date_to_ordinal(start) if start else None
+        self.last = DateManager.date_to_ordinal(end) if end else None
+        self.months = {}  # "YYYY-MM" -> [entries, minutes, pages, active days]
+        self.books = {}  # (subject, book) -> [entries, minutes, pages, active days, first ordinal, last ordinal]
+
+    @staticmethod
+    def entry_of(subject: str, book: str, details: dict) -> CommonEntry:
+        return EntryLoader.from_dict(subject, book, details)
+
+    def in_range(self, ordinal: int) -> bool:
+        return (self.first is None or ordinal >= self.first) and (self.last is None or ordinal <= self.last)
+
+    def add_day(self, date: str, day: dict):
+        """Fold one day into the month and book totals and return its row (None if it is out of range)."""
+        ordinal = DateManager.date_to_ordinal(date)
+        if not self.in_range(ordinal):
+            return None
+        day_totals = [0, 0, 0]
+        books = 0
+        for subject, subject_books in day.items():
+            for book, sessions in subject_books.items():
+                book_totals = [0, 0, 0]
+                for details in sessions.values():
+                    entry = self.entry_of(subject, book, details)
+                    book_totals[0] += 1
+                    book_totals[1] += CoreHelpers.convert_time_to_mins(entry.time_spent)
+                    book_totals[2] += entry.total_pages
+                if not book_totals[0]:
+                    continue
+                books += 1
+                record = self.books.setdefault((subject, book), [0, 0, 0, 0, ordinal, ordinal])
+                for i in range(3):
+                    record[i] += book_totals[i]
+                    day_totals[i] += book_totals[i]
+                record[3] += 1
+                record[4], record[5] = min(record[4], ordinal), max(record[5], ordinal)
+        if not books:
+            return None
+        month = self.months.setdefault(DateManager.date_to_month(date), [0, 0, 0, 0])
+        for i in range(3):
+            month[i] += day_totals[i]
+        month[3] += 1
+        return dict(zip(self.COLUMNS["day"], [date, day_totals[0], day_totals[1], self.as_number(day_totals[2]), books]))
+
+    @staticmethod
+    def as_number(value: float):
+        value = round(value, 6)  # Sums of fractional pages can pick up float noise
+        return int(value) if value == int(value) else value
+
+    def month_rows(self):
+        for month in sorted(self.months):
+            entries, minutes, pages, days = self.months[month]
+            yield dict(zip(self.COLUMNS["month"], [month, entries, minutes, self.as_number(pages), days]))
+
+    def book_rows(self):
+        # Subjects, then books, in the natural order of Statistics ("Para no. 2" before "Para no. 10")
+        for (subject, book) in sorted(self.books, key=lambda key: tuple(map(CoreHelpers.extract_sort_key, key))):
+            entries, minutes, pages, days, first, last = self.books[(subject, book)]
+            yield dict(zip(self.COLUMNS["book"], [subject, book, entries, minutes, self.as_number(pages), days,
+                                                  DateManager.ordinal_to_date(first), DateManager.ordinal_to_date(last)]))
+
+
+class ReportWriter:
+    """Writes the rows of one or more levels as CSV or JSON lines; JSON lines from several levels carry a "Level"."""
+
+    def __init__(self, stream, file_format: str, level: str, tag_level: bool = False) -> None:
+        self.stream = stream
+        self.level = level
+        self.tag_level = tag_level
+        self.csv_writer = None
+        if file_format == "csv":
+            self.csv_writer = csv.DictWriter(stream, fieldnames=BulkReport.COLUMNS[level])
+            self.csv_writer.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(row)
+        else:
+            if self.tag_level:
+                row = dict(Level=self.level, **row)
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
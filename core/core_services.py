@@ -68,6 +68,19 @@ class DateManager:
     def get_current_time() -> str:
         return datetime.now().strftime("%I:%M:%S %p")
 
+    @staticmethod
+    def date_to_ordinal(date: str) -> int:
+        return datetime.strptime(date, "%d-%b-%Y").toordinal()
+
+    @staticmethod
+    def ordinal_to_date(ordinal: int) -> str:
+        return datetime.fromordinal(ordinal).strftime("%d-%b-%Y")
+
+    @staticmethod
+    def date_to_month(date: str) -> str:
+        """"05-Oct-2026" -> "2026-10"."""
+        return datetime.strptime(date, "%d-%b-%Y").strftime("%Y-%m")
+
     @staticmethod
     def is_leap_year(year: int) -> bool:
         """Return True if the given year is a leap year, else False."""
@@ -93,34 +106,11 @@ class DateManager:
         return months_names[number - 1], months_days_map[months_names[number -
                                                                       1]]
 
-    @staticmethod
-    def get_last_seven_days() -> list:
-        today = datetime.today()
-        month = today.strftime("%b")
-        day = today.day
-        num_month = today.month
-        year = today.year
-        last_month_days = None
-        if day <= 7:
-            last_month_num = (num_month - 2) % 12 + 1
-            if num_month == 1:
-                year -= 1
-            month, last_month_days = DateManager.get_month_and_days(
-                last_month_num, year)
-            day = (last_month_days + day) - 7
-        else:
-            day -= 7
-        last_seven_days = []
-        for _ in range(7):
-            date = f"{day:02}-{month}-{year}"
-            last_seven_days.append(date)
-            day += 1
-            if last_month_days and day > last_month_days:
-                day = 1
-                year = year + 1 if last_month_num == 12 else year # type: ignore
-                month, _ = DateManager.get_month_and_days(num_month, year)
-                last_month_days = None
-        return last_seven_days
+    @classmethod
+    def get_last_seven_days(cls) -> list:
+        """The seven dates before today, oldest first."""
+        today = datetime.today().toordinal()
+        return [cls.ordinal_to_date(ordinal) for ordinal in range(today - 7, today)]
 
 
 class CoreHelpers:
@@ -236,7 +226,7 @@ class DeleteController:
     @staticmethod
     def delete_day(date: str, context):
         if date in context.data_manager.entry_log:
-            context.stats_manager.updater.delete_stats(context.data_manager, date)
+            context.stats_manager.updater.delete_stats(date)
         return context.data_manager.delete_data(date=date)
 
     @staticmethod
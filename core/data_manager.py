@@ -1,67 +1,75 @@
-import os, json, zipfile
+import os, json, zipfile, threading
+from copy import deepcopy
 from core.core_services import DateManager
 from core.entries import CommonEntry
-from core.exceptions import DataCorruptionError
+from core.file_manager import MarkdownJournal
+from core.storage import StorageBackend, JsonStorage
+from core.backup_repository import BackupRepository
+from core.fingerprint import EntryLogFingerprint, StatsSnapshot
+from core.session_table import SessionTable
+from core.book_index import BookIndex
+from core.day_index import DayIndex
+from core.book_stats import BookStats
+from core.reading_forecast import BookSizes
 
 
-class FileManager:
-    @staticmethod
-    def load_file(file_path_json: str):
-        try:
-            with open(file_path_json, 'r', encoding="utf-8") as file:
-                return json.load(file)
-        except (FileNotFoundError):
-            return {}
-        except json.JSONDecodeError as e:
-            raise DataCorruptionError(file_path=file_path_json) from e
-
-    @staticmethod
-    def save_to_md(dict_entries: dict, file_path_md: str):
-        """
-        Save learning entries to a Markdown file with formatted sections for Qur'an and other subjects.
-
-        Args:
-            dict_entries (dict): Dictionary containing learning entries data
-            file_path_md (str): string containing MD file path 
-        """        
-        try:
-            with open(file_path_md, 'w', encoding="utf-8") as file:
-                if not dict_entries:
-                    file.write("")
-                else:
-                    for date, record in dict_entries.items():
-                        file.write(f"# {date}\n\n")
-                        for subject, books in record.items():
-                            file.write(f"## {subject}\n\n")
-                            for book_name, sessions in books.items():                                    
-                                file.write(f"### {book_name}\n")
-                                for session, session_details in sessions.items():
-                                    file.write(f"\n#### {session}\n\n")
-                                    for key, value in session_details.items():
-                                        file.write(f"- **{key}:** {value}\n")
-                                file.write("\n")
-
-                        # Add daily summary if needed
-                        file.write("---\n\n")  # Horizontal rule for separation between dates
-            return True, "Saved successfully"
-        except Exception as e:
-            return False, str(e)
-
-    @staticmethod
-    def save_to_json(dict_: dict, file_path_json: str):
-        try:
-            with open(file_path_json, 'w', encoding="utf-8") as file:
-                json.dump(dict_, file, indent=4, ensure_ascii=False)
-            return True, "Saved successfully"
-        except Exception as e:
-            return False, str(e)
+class SaveSnapshot:
+    """
+    Everything one save has to write, taken in memory at the moment of a change.
+
+    Days in the Entry Log are never changed in place (edits replace the whole day),
+    so copying the mapping is enough to freeze it. Parts that have been written are
+    cleared, so a failed snapshot can be merged with a newer one and retried.
+    """
+
+    def __init__(self, entry_log, all_time_subjects: dict, stats: dict, records: list,
+                 full_save: bool, md_dirty_dates, fingerprint: EntryLogFingerprint = None, dates: list = None) -> None:
+        self.entry_log = entry_log
+        self.dates = dates  # Dates of the Entry Log in date order, for a full rewrite of Journal.md
+        self.all_time_subjects = all_time_subjects
+        self.stats = stats
+        self.records = records
+        self.full_save = full_save
+        self.md_dirty_dates = md_dirty_dates
+        self.fingerprint = fingerprint
+
+    @property
+    def file_dict(self) -> dict:
+        return {
+                "Entry Log": self.entry_log,
+                "All Time Subjects": self.all_time_subjects,
+                "Statistics": self.stats
+            }
+
+    def is_saved(self) -> bool:
+        return not (self.records or self.full_save or self.md_dirty_dates is None or self.md_dirty_dates)
+
+    def merge(self, newer: "SaveSnapshot") -> "SaveSnapshot":
+        """Fold this (older) snapshot into a newer one, so one write covers both."""
+        newer.records = self.records + newer.records
+        newer.full_save = self.full_save or newer.full_save
+        if self.md_dirty_dates is None or newer.md_dirty_dates is None:
+            newer.md_dirty_dates = None
+        else:
+            newer.md_dirty_dates = self.md_dirty_dates | newer.md_dirty_dates
+        return newer
 
 
 class DataManager:
-    def __init__(self, path_json: str, path_md: str) -> None:
+    def __init__(self, path_json: str, path_md: str, storage: StorageBackend = None) -> None:
         self._path_json = path_json
         self.path_md = path_md
-        self.data = FileManager.load_file(self._path_json)
+        self.markdown = MarkdownJournal(path_md)
+        self.storage = storage or JsonStorage(path_json)
+        self.full_save_needed = False
+        self.md_dirty_dates = set()
+        self.on_change = None
+        self.lock = threading.RLock()  # Held while the Entry Log changes and while a snapshot is taken (possibly on the autosave thread)
+        self.listeners = []  # Told about every changed day: on_day_changed(date), and on_clear()
+        self.stats_snapshot = StatsSnapshot(os.path.splitext(path_json)[0] + ".stats.json")
+        self.book_sizes = BookSizes(os.path.splitext(path_json)[0] + ".books.json")
+        self.data = self.storage.load()
+        self.fingerprint = self.storage.load_fingerprint()
         self.extract_data()
         self.sync_data_today()
 
@@ -70,13 +78,47 @@ class DataManager:
         return {
                 "Entry Log": self.entry_log,
                 "All Time Subjects": self.all_time_subjects,
-                "Statistics": self.stats
+                "Statistics": BookStats.format_stats(self.stats)
             }
     
     def extract_data(self):
         self.entry_log = self.data.get("Entry Log", {})
+        self.day_index = DayIndex(self.entry_log)
+        self.sessions = SessionTable(self.entry_log, self.day_index)
+        self.book_index = BookIndex(self.entry_log)
         self.all_time_subjects = self.data.get("All Time Subjects", {})
-        self.stats = self.data.get("Statistics", {})
+        self.stats = BookStats.parse_stats(self.data.get("Statistics", {}))
+
+    def record(self, op: str, date=None, subject: str = "", book: str = "", session: str = "", data=None) -> None:
+        self.storage.record(op, date, subject, book, session, data)
+        if date is None:
+            self.md_dirty_dates = None  # Everything changed
+        elif self.md_dirty_dates is not None:
+            self.md_dirty_dates.add(date)
+
+    def track_session(self, date: str, subject: str, book: str, session: str,
+                      old_details: dict = None, new_details: dict = None) -> None:
+        """Keep the session table, the book index and the fingerprint in step with a session that was added, edited or deleted."""
+        if old_details is not None:
+            self.sessions.remove(date, subject, book, session)
+            self.book_index.remove(date, subject, book, session)
+            if self.fingerprint is not None:
+                self.fingerprint.remove(date, subject, book, session, old_details)
+        if new_details is not None:
+            self.sessions.add(date, subject, book, session, new_details)
+            self.book_index.add(date, subject, book, session)
+            if self.fingerprint is not None:
+                self.fingerprint.add(date, subject, book, session, new_details)
+
+    def notify_day_changed(self, date: str) -> None:
+        self.day_index.sync(date)
+        for listener in self.listeners:
+            listener.on_day_changed(date)
+
+    def notify_change(self) -> None:
+        """Tell the autosave worker (if any) that a change has been completed."""
+        if self.on_change is not None:
+            self.on_change()
 
     def update_date_today(self):
         self.date_today = DateManager.get_date_today()
@@ -86,11 +128,18 @@ class DataManager:
         self.progress_today = self.entry_log.get(self.date_today, {})
 
     def add_entry(self, entry: CommonEntry) -> None:
-        self.sync_data_today()
-        entry_time = f"Entry {DateManager.get_current_time()}"
-        self.progress_today.setdefault(entry.subject, {}).setdefault(entry.book, {})
-        self.progress_today[entry.subject][entry.book][entry_time] = entry.to_dict()
-        self.update_entry_log("", {})
+        with self.lock:
+            self.sync_data_today()
+            entry_time = f"Entry {DateManager.get_current_time()}"
+            entry_dict = entry.to_dict()
+            self.progress_today = deepcopy(self.progress_today)  # Earlier snapshots may still hold the old day
+            self.progress_today.setdefault(entry.subject, {}).setdefault(entry.book, {})
+            self.track_session(self.date_today, entry.subject, entry.book, entry_time,
+                               self.progress_today[entry.subject][entry.book].get(entry_time), entry_dict)
+            self.progress_today[entry.subject][entry.book][entry_time] = entry_dict
+            self.entry_log[self.date_today] = self.progress_today
+            self.record("add", self.date_today, entry.subject, entry.book, entry_time, entry_dict)
+            self.notify_day_changed(self.date_today)
 
     def update_cache(self, cache: dict) -> None:
         self.all_time_subjects = cache
@@ -99,12 +148,40 @@ class DataManager:
         self.stats = stats
 
     def update_entry_log(self, date: str, entries: dict) -> None:
-        date = date or self.date_today
-        entries = entries or self.progress_today
-        if entries:
-            self.entry_log[date] = entries
-        elif date in self.entry_log and not self.entry_log[date]:
-            self.entry_log.pop(date)
+        """Replace the entries of a day with an edited copy, recording only the sessions that changed."""
+        self.replace_day(date, entries)
+        self.notify_change()
+
+    def replace_day(self, date: str, entries: dict) -> None:
+        """update_entry_log without notify_change(), for a change spread over several days that notifies once at the end."""
+        with self.lock:
+            date = date or self.date_today
+            self.record_changes(date, self.entry_log.get(date, {}), entries)
+            if entries:
+                self.entry_log[date] = deepcopy(entries)
+            else:
+                self.entry_log.pop(date, None)
+            if date == self.date_today:
+                self.sync_data_today()
+            self.notify_day_changed(date)
+
+    def record_changes(self, date: str, old_entries: dict, new_entries: dict) -> None:
+        for subject, books in old_entries.items():
+            for book, sessions in books.items():
+                for session, details in sessions.items():
+                    if session not in new_entries.get(subject, {}).get(book, {}):
+                        self.record("delete", date, subject, book, session)
+                        self.track_session(date, subject, book, session, old_details=details)
+        for subject, books in new_entries.items():
+            for book, sessions in books.items():
+                for session, details in sessions.items():
+                    old_details = old_entries.get(subject, {}).get(book, {}).get(session)
+                    if old_details is None:
+                        self.record("add", date, subject, book, session, details)
+                        self.track_session(date, subject, book, session, new_details=details)
+                    elif old_details != details:
+                        self.record("edit", date, subject, book, session, details)
+                        self.track_session(date, subject, book, session, old_details, details)
     
     def get_books_list(self, subject: str):
         return self.all_time_subjects.get(subject, [])
@@ -117,52 +194,128 @@ class DataManager:
                     
     def delete_data(self, date: str = "None", delete_all_progress: bool = False):
         """"This method is not to be used directly. Use DeleteController's methods to access this."""
-
-        if delete_all_progress:
-            self.entry_log.clear()
-            self.stats.clear()
-            return True, "All data deleted successfully!"
-        elif date in self.entry_log:
-            self.entry_log.pop(date)
-            return True, f"All entries from {date if date != self.date_today else f'today ({date})'} deleted successfully!"
+        with self.lock:
+            if delete_all_progress:
+                self.entry_log.clear()
+                self.stats.clear()
+                self.record("delete")
+                self.sessions.clear()
+                self.book_index.clear()
+                self.day_index.clear()
+                if self.fingerprint is not None:
+                    self.fingerprint = EntryLogFingerprint()
+                for listener in self.listeners:
+                    listener.on_clear()
+                self.sync_data_today()
+                self.notify_change()
+                return True, "All data deleted successfully!"
+            elif date in self.entry_log:
+                if self.fingerprint is not None:
+                    self.fingerprint.remove_day(date, self.entry_log[date])
+                self.sessions.remove_day(date)
+                self.book_index.remove_day(date, self.entry_log[date])
+                del self.entry_log[date]
+                self.record("delete", date)
+                self.notify_day_changed(date)
+                self.sync_data_today()
+                self.notify_change()
+                return True, f"All entries from {date if date != self.date_today else f'today ({date})'} deleted successfully!"
             
-        return False, f"No entries recorded for {date if date != self.date_today else f'today ({date})'}."
-        
-    def save_data_to_files(self) -> int:
-        if not FileManager.save_to_json(self.file_dict, self._path_json)[0]:
-            return 1
-        if not FileManager.save_to_md(self.entry_log, self.path_md)[0]:
-            return 2
+            return False, f"No entries recorded for {date if date != self.date_today else f'today ({date})'}."
+
+    def get_subjects_cache(self):
+        """All Time Subjects straight from the storage index, when it has one and nothing is pending."""
+        return None if self.storage.pending else self.storage.load_subjects_cache()
+
+    def get_stored_stats(self):
+        stats = None if self.storage.pending else self.storage.load_stats()
+        return None if stats is None else BookStats.parse_stats(stats)
+
+    def load_stats_snapshot(self) -> bool:
+        """Use the All Time Subjects and Statistics saved last time, if the Entry Log has not changed since."""
+        snapshot = self.stats_snapshot.load(self.fingerprint)
+        if snapshot is None:
+            return False
+        self.update_cache(snapshot[0])
+        self.update_stats(BookStats.parse_stats(snapshot[1]))
+        return True
+
+    def save_stats_snapshot(self):
+        """Save All Time Subjects and Statistics for the next start; call it once everything is saved."""
+        return self.stats_snapshot.save(self.fingerprint, self.all_time_subjects, BookStats.format_stats(self.stats))
+
+    def take_snapshot(self) -> SaveSnapshot:
+        """Hand over everything changed since the last snapshot. Only touches memory; safe to call from the autosave thread."""
+        with self.lock:
+            # Copy the stats before taking the pending records, so a copy that fails leaves them in place
+            all_time_subjects = deepcopy(self.all_time_subjects)
+            stats = BookStats.format_stats(self.stats)
+            snapshot = SaveSnapshot(self.entry_log.copy(), all_time_subjects, stats,
+                                    self.storage.take_pending(), self.full_save_needed, self.md_dirty_dates,
+                                    None if self.fingerprint is None else self.fingerprint.copy(), self.day_index.chronological())
+            self.full_save_needed = False
+            self.md_dirty_dates = set()
+            return snapshot
+
+    def return_snapshot(self, snapshot: SaveSnapshot) -> None:
+        """Put back whatever a failed save did not write, so the next save retries it."""
+        self.storage.pending[:0] = snapshot.records
+        self.full_save_needed = self.full_save_needed or snapshot.full_save
+        if snapshot.md_dirty_dates is None or self.md_dirty_dates is None:
+            self.md_dirty_dates = None
+        else:
+            self.md_dirty_dates |= snapshot.md_dirty_dates
+
+    def write_snapshot(self, snapshot: SaveSnapshot) -> int:
+        """Write a snapshot to storage and Journal.md. Safe to call from a worker thread."""
+        if snapshot.full_save or snapshot.records:
+            saved = self.storage.save_all(snapshot) if snapshot.full_save else self.storage.save(snapshot)
+            if not saved:
+                return 1
+            snapshot.records = []
+            snapshot.full_save = False
+        if snapshot.md_dirty_dates is None or snapshot.md_dirty_dates:
+            if not self.markdown.save(snapshot.entry_log, snapshot.md_dirty_dates, snapshot.dates)[0]:
+                return 2
+            snapshot.md_dirty_dates = set()
         return 0
 
-    def save_md_as(self, file_path: str):
+    def save_data_to_files(self) -> int:
+        snapshot = self.take_snapshot()
+        return_code = self.write_snapshot(snapshot)
+        if return_code != 0:
+            self.return_snapshot(snapshot)
+        return return_code
+
+    def set_path_md(self, file_path: str) -> None:
+        """Write the journal to another file from the next save on."""
         self.path_md = file_path
-        FileManager.save_to_json(self.file_dict, self._path_json)
-        return FileManager.save_to_md(self.entry_log, self.path_md)
+        self.markdown = MarkdownJournal(file_path)
+        self.md_dirty_dates = None
 
     def backup_data(self, backup_dir: str):
         path_backup = os.path.join(backup_dir, f"learning_backup_{DateManager.get_timestamp()}.zip")
         try:
             with zipfile.ZipFile(path_backup, "w", zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(self._path_json, arcname="learning_data.json")
+                zipf.writestr("learning_data.json", json.dumps(self.file_dict, indent=4, ensure_ascii=False, default=dict))
         except OSError as e:
             return False, f"Backup failed: {e}"
         return True, "Backup successful!"
 
-    def restore_data(self, zip_path: str) -> tuple:
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zipf:
-                data_bytes = zipf.read("learning_data.json")
-                data = json.loads(data_bytes.decode("utf-8"))
-                if not data: 
-                    return False, "Backup file is empty."
-                self.data = data
-                self.extract_data()
-        except zipfile.BadZipFile as e:
-            return False, f"Invalid ZIP file: {e}"
-        except (KeyError, OSError) as e:
-            return False, "Backup archive does not contain valid data."
-        except json.JSONDecodeError as e:
-            return False, f"Data Corrupted: {e}"
-        return True, "Restoration successful!"
+    def backup_incremental(self, repo_dir: str):
+        """Add a snapshot to an incremental backup repository (see BackupRepository)."""
+        return BackupRepository(repo_dir).backup(self.file_dict)
 
+    def replace_data(self, data: dict) -> tuple:
+        """Swap in restored data as a whole. Use AppContext.restore_data, which checks it first."""
+        with self.lock:
+            if not data:
+                return False, "Backup file is empty."
+            self.data = data
+            self.extract_data()
+            if self.fingerprint is not None:
+                self.fingerprint = EntryLogFingerprint.of_entry_log(self.entry_log)
+            self.full_save_needed = True
+            self.md_dirty_dates = None
+            self.notify_change()
+            return True, "Restoration successful!"
@@ -0,0 +1,85 @@
+from bisect import bisect_left, bisect_right, insort
+from core.core_services import DateManager
+
+
+class DayIndex:
+    """
+    The days of the Entry Log in date order: a sorted list of day ordinals, each
+    mapped back to its "dd-Mon-YYYY" key. The log itself keeps its keys (and the
+    file format) as they are; this only answers "which days, in what order".
+
+    A range of days, the day with entries before or after a date, or every day in
+    order is then a bisect and a slice, with no dates parsed or formatted. Built from
+    the log's keys the first time it is used (without reading any day), and kept in
+    step by DataManager as days gain or lose their last entry.
+    """
+
+    def __init__(self, entry_log) -> None:
+        self.entry_log = entry_log
+        self.ordinals = None  # Not built yet
+        self.dates = {}  # ordinal -> date key
+
+    def build(self) -> None:
+        self.dates = {DateManager.date_to_ordinal(date): date for date in self.entry_log}
+        self.ordinals = sorted(self.dates)
+
+    def ensure_built(self) -> None:
+        if self.ordinals is None:
+            self.build()
+
+    def sync(self, date: str) -> None:
+        """Add or drop a day after it changed, depending on whether it still has entries."""
+        if self.ordinals is None:
+            return
+        ordinal = DateManager.date_to_ordinal(date)
+        if date in self.entry_log:
+            if ordinal not in self.dates:
+                self.dates[ordinal] = date
+                insort(self.ordinals, ordinal)
+        elif ordinal in self.dates:
+            del self.dates[ordinal]
+            del self.ordinals[bisect_left(self.ordinals, ordinal)]
+
+    def clear(self) -> None:
+        self.ordinals = []
+        self.dates = {}
+
+    def __len__(self) -> int:
+        self.ensure_built()
+        return len(self.ordinals)
+
+    def chronological(self) -> list:
+        """Every date with entries, oldest first."""
+        self.ensure_built()
+        return [self.dates[ordinal] for ordinal in self.ordinals]
+
+    def ordinals_between(self, first: int = None, last: int = None) -> list:
+        """Ordinals of the days with entries from `first` to `last` (both included; None for no limit)."""
+        self.ensure_built()
+        start = 0 if first is None else bisect_left(self.ordinals, first)
+        end = len(self.ordinals) if last is None else bisect_right(self.ordinals, last)
+        return self.ordinals[start:end]
+
+    def between(self, first: int, last: int) -> list:
+        """Dates with entries from ordinal `first` to `last` (both included), oldest first."""
+        return [self.dates[ordinal] for ordinal in self.ordinals_between(first, last)]
+
+    def previous(self, date: str):
+        """The last date with entries before `date` (which need not have any), or None."""
+        self.ensure_built()
+        i = bisect_left(self.ordinals, DateManager.date_to_ordinal(date))
+        return self.dates[self.ordinals[i - 1]] if i > 0 else None
+
+    def next(self, date: str):
+        """The first date with entries after `date`, or None."""
+        self.ensure_built()
+        i = bisect_right(self.ordinals, DateManager.date_to_ordinal(date))
+        return self.dates[self.ordinals[i]] if i < len(self.ordinals) else None
+
+    def first(self):
+        self.ensure_built()
+        return self.dates[self.ordinals[0]] if self.ordinals else None
+
+    def last(self):
+        self.ensure_built()
+        return self.dates[self.ordinals[-1]] if self.ordinals else None
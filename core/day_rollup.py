@@ -0,0 +1,132 @@
+from array import array
+from core.core_services import DateManager
+
+
+class DaySeries:
+    """
+    Entries, minutes and pages of every day from `first` on, with prefix sums, so the
+    totals of any range of days are two lookups.
+
+    A change only marks the prefix sums stale from that day on; they are brought up to
+    date by the next query. Changes to today, the usual case, cost next to nothing.
+    """
+
+    def __init__(self, first: int) -> None:
+        self.first = first
+        self.daily = (array("q"), array("q"), array("d"))  # entries, minutes, pages
+        self.prefix = (array("q", [0]), array("q", [0]), array("d", [0.0]))
+        self.stale_from = None
+
+    def __len__(self) -> int:
+        return len(self.daily[0])
+
+    def add(self, ordinal: int, entries: int, minutes: int, pages: float) -> None:
+        if ordinal < self.first:
+            missing = self.first - ordinal
+            for column in self.daily:
+                column[0:0] = array(column.typecode, [0]) * missing
+            for column in self.prefix:
+                column.extend(array(column.typecode, [0]) * missing)
+            self.first = ordinal
+            self.stale_from = 0
+        index = ordinal - self.first
+        if index >= len(self):
+            missing = index + 1 - len(self)
+            self.stale_from = len(self) if self.stale_from is None else min(self.stale_from, len(self))
+            for column in self.daily + self.prefix:
+                column.extend(array(column.typecode, [0]) * missing)
+        for column, value in zip(self.daily, (entries, minutes, pages)):
+            column[index] += value
+        if self.stale_from is None or index < self.stale_from:
+            self.stale_from = index
+
+    def refresh(self) -> None:
+        if self.stale_from is None:
+            return
+        for daily, prefix in zip(self.daily, self.prefix):
+            total = prefix[self.stale_from]
+            for index in range(self.stale_from, len(daily)):
+                total += daily[index]
+                prefix[index + 1] = total
+        self.stale_from = None
+
+    def daily_between(self, start: int, end: int, column: int = 1) -> array:
+        """One column (0 entries, 1 minutes, 2 pages) for every day from `start` to `end`, 0 outside the series."""
+        values = array(self.daily[column].typecode, [0]) * (end - start + 1)
+        low, high = max(start, self.first), min(end, self.first + len(self) - 1)
+        if low <= high:
+            values[low - start:high - start + 1] = self.daily[column][low - self.first:high - self.first + 1]
+        return values
+
+    def totals(self, start: int, end: int) -> tuple:
+        """(entries, minutes, pages) from ordinal `start` to `end`, both included."""
+        self.refresh()
+        low = min(max(start - self.first, 0), len(self))
+        high = min(max(end - self.first + 1, low), len(self))
+        return tuple(prefix[high] - prefix[low] for prefix in self.prefix)
+
+
+class DayRollup:
+    """
+    Per-day totals of the whole log, of every subject and of every book, built once
+    from DataManager's SessionTable and kept current by it afterwards (it listens to
+    the rows being added and removed).
+    """
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.table = None
+        self.series = {}
+
+    def on_row(self, ordinal: int, subject: str, book: str, minutes: int, pages: float, sign: int) -> None:
+        for key in (None, (subject,), (subject, book)):
+            if key not in self.series:
+                self.series[key] = DaySeries(ordinal)
+            self.series[key].add(ordinal, sign, sign * minutes, sign * pages)
+
+    def on_clear(self) -> None:
+        self.series = {}
+
+    def build(self) -> None:
+        """(Re)build from the current session table, e.g. the first time or after a restore replaced it."""
+        if self.table is not None and self in self.table.listeners:
+            self.table.listeners.remove(self)
+        self.table = self.data.sessions
+        self.table.cover_all()
+        self.series = {}
+        for row, (_, subject, book, _) in enumerate(self.table.keys):
+            self.on_row(self.table.day[row], subject, book, self.table.minutes[row], self.table.pages[row], 1)
+        self.table.listeners.append(self)
+
+    def totals(self, start: str, end: str, subject: str = None, book: str = None) -> tuple:
+        if self.table is not self.data.sessions:
+            self.build()
+        first, last = DateManager.date_to_ordinal(start), DateManager.date_to_ordinal(end)
+        if book is not None and subject is None:  # The same book name may be filed under several subjects
+            keys = [key for key in self.series if key is not None and len(key) == 2 and key[1] == book]
+        else:
+            keys = [None if subject is None else (subject,) if book is None else (subject, book)]
+        entries = minutes = pages = 0
+        for key in keys:
+            if key in self.series:
+                key_entries, key_minutes, key_pages = self.series[key].totals(first, last)
+                entries, minutes, pages = entries + key_entries, minutes + key_minutes, pages + key_pages
+        pages = round(pages, 6)  # Sums of fractional pages can pick up float noise
+        return entries, minutes, int(pages) if pages == int(pages) else pages
+
+    def first_day(self):
+        """Ordinal of the first day with an entry, or None for an empty log."""
+        if self.table is not self.data.sessions:
+            self.build()
+        series = self.series.get(None)
+        if series is None:
+            return None
+        return next((series.first + i for i, entries in enumerate(series.daily[0]) if entries), None)
+
+    def daily_minutes(self, start: int, end: int) -> array:
+        """Minutes of every day from ordinal `start` to `end`, straight from the rollup."""
+        if self.table is not self.data.sessions:
+            self.build()
+        if None not in self.series:
+            return array("q", [0]) * (end - start + 1)
+        return self.series[None].daily_between(start, end)
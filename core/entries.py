@@ -124,6 +124,15 @@ class OtherEntry(CommonEntry):
         return super().from_dict(subject, book, data, (data.get("Unit", "0"), data.get("Chapter", "N/A")))
 
 
+class EntryLoader:
+    """Turns a stored session back into the entry class of its subject."""
+    ENTRY_TYPES = {"Al-Qur'an (Tafseer)": TafseerEntry, "Al-Qur'an (Tilawat)": TilawatEntry}
+
+    @classmethod
+    def from_dict(cls, subject: str, book: str, details: dict) -> CommonEntry:
+        return cls.ENTRY_TYPES.get(subject, OtherEntry).from_dict(subject, book, details)
+
+
 # Tester
 # if __name__ == "__main__":
 #     inputs = [
@@ -0,0 +1,49 @@
+from collections.abc import MutableMapping
+
+
+class LazyEntryLog(MutableMapping):
+    """
+    Entry Log mapping (date -> subjects -> books -> sessions) whose days are read
+    from a storage backend only when they are first asked for.
+
+    The source must provide `load_dates()` (every recorded date, in order) and
+    `load_day(date)`. Days that were read or changed stay in memory.
+    """
+
+    def __init__(self, source) -> None:
+        self.source = source
+        self._days = dict.fromkeys(source.load_dates())
+
+    def __getitem__(self, date: str) -> dict:
+        day = self._days[date]
+        if day is None:
+            day = self._days[date] = self.source.load_day(date)
+        return day
+
+    def __setitem__(self, date: str, day: dict) -> None:
+        self._days[date] = day
+
+    def __delitem__(self, date: str) -> None:
+        del self._days[date]
+
+    def __contains__(self, date) -> bool:
+        return date in self._days
+
+    def __iter__(self):
+        return iter(self._days)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def clear(self) -> None:
+        self._days.clear()
+
+    def copy(self) -> "LazyEntryLog":
+        """A shallow copy over the same source; days that are not loaded yet stay unloaded."""
+        clone = LazyEntryLog.__new__(LazyEntryLog)
+        clone.source = self.source
+        clone._days = self._days.copy()
+        return clone
+
+    def is_loaded(self, date: str) -> bool:
+        return self._days.get(date) is not None
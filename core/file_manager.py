@@ -0,0 +1,253 @@
+import os, json, hashlib
+from core.core_services import DateManager
+from core.binary_journal import BinaryJournal
+from core.exceptions import DataCorruptionError
+
+
+class FileManager:
+    @staticmethod
+    def load_file(file_path_json: str):
+        try:
+            with open(file_path_json, 'r', encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError):
+            return {}
+        except json.JSONDecodeError as e:
+            raise DataCorruptionError(file_path=file_path_json) from e
+
+    @staticmethod
+    def save_to_md(dict_entries: dict, file_path_md: str):
+        """
+        Save learning entries to a Markdown file with formatted sections for Qur'an and other subjects.
+
+        Args:
+            dict_entries (dict): Dictionary containing learning entries data
+            file_path_md (str): string containing MD file path 
+        """        
+        return MarkdownJournal(file_path_md).save(dict_entries)
+
+    @staticmethod
+    def write_atomic(file_path: str, text: str):
+        """Write to a temporary file first and swap it in, so a crash never leaves a half-written file."""
+        temp_path = f"{file_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding="utf-8") as file:
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, file_path)
+            return True, "Saved successfully"
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def splice_atomic(file_path: str, keep: int, data: bytes):
+        """Atomically replace a file with its first `keep` bytes followed by `data`."""
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'wb') as file:
+            if keep:
+                with open(file_path, 'rb') as old_file:
+                    while keep > 0:
+                        chunk = old_file.read(min(keep, 1024 * 1024))
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        keep -= len(chunk)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+
+    @staticmethod
+    def truncate_and_append(file_path: str, keep: int, data: bytes):
+        """Cut a file back to its first `keep` bytes and write `data` after them, in place (not atomic)."""
+        with open(file_path, 'r+b') as file:
+            file.truncate(keep)
+            file.seek(keep)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def save_to_json(dict_: dict, file_path_json: str):
+        try:
+            text = json.dumps(dict_, indent=4, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            return False, str(e)
+        return FileManager.write_atomic(file_path_json, text)
+
+    @staticmethod
+    def load_binary(file_path_bin: str):
+        """Read a compact journal file (see BinaryJournal) into the same dict as the JSON file."""
+        try:
+            with open(file_path_bin, 'rb') as file:
+                return BinaryJournal.loads(file.read())
+        except FileNotFoundError:
+            return {}
+        except (ValueError, IndexError, UnicodeDecodeError) as e:
+            raise DataCorruptionError(file_path=file_path_bin) from e
+
+    @staticmethod
+    def save_to_binary(dict_: dict, file_path_bin: str):
+        try:
+            data = BinaryJournal.dumps(dict_)
+        except (TypeError, ValueError) as e:
+            return False, str(e)
+        try:
+            FileManager.splice_atomic(file_path_bin, 0, data)
+        except OSError as e:
+            return False, str(e)
+        return True, "Saved successfully"
+
+
+class MarkdownJournal:
+    """
+    Journal.md together with an index of where each date's section sits in it.
+
+    The index ("<file>.index") holds [date, byte offset, byte length, hash] per section,
+    so a save only re-renders the dates that changed. When nothing after the first
+    changed section is kept (the last day was edited, or new days come after it) the
+    file is cut back there and the new sections are written in place; otherwise the
+    sections are copied into a new file that is swapped in atomically. The index is
+    dropped before either write, so a save cut short is followed by a full rewrite.
+    """
+
+    def __init__(self, path_md: str) -> None:
+        self.path_md = path_md
+        self.path_index = f"{path_md}.index"
+
+    @staticmethod
+    def render_day(date: str, record: dict) -> str:
+        lines = [f"# {date}\n\n"]
+        for subject, books in record.items():
+            lines.append(f"## {subject}\n\n")
+            for book_name, sessions in books.items():
+                lines.append(f"### {book_name}\n")
+                for session, session_details in sessions.items():
+                    lines.append(f"\n#### {session}\n\n")
+                    for key, value in session_details.items():
+                        lines.append(f"- **{key}:** {value}\n")
+                lines.append("\n")
+        lines.append("---\n\n")  # Horizontal rule for separation between dates
+        return "".join(lines)
+
+    @staticmethod
+    def digest(section: bytes) -> str:
+        return hashlib.sha1(section).hexdigest()
+
+    def load_index(self):
+        """Return the section list, or None when the index is missing or no longer matches the file."""
+        try:
+            with open(self.path_index, 'r', encoding="utf-8") as file:
+                index = json.load(file)
+            if index["size"] != os.path.getsize(self.path_md):
+                return None
+            return index["sections"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write_index(self, sections: list) -> None:
+        size = sections[-1][1] + sections[-1][2] if sections else 0
+        FileManager.write_atomic(self.path_index, json.dumps({"size": size, "sections": sections}))
+
+    def drop_index(self) -> None:
+        try:
+            os.remove(self.path_index)
+        except FileNotFoundError:
+            pass
+
+    def save(self, entry_log, dirty_dates=None, dates=None):
+        """
+        Write the journal. With `dirty_dates` only those sections are re-rendered and
+        spliced in; without it (or without a usable index) the whole file is rewritten,
+        in the order of `dates` (e.g. DayIndex.chronological()) when it is given.
+        """
+        sections = self.load_index() if dirty_dates is not None else None
+        try:
+            if sections is None:
+                return self.write_full(entry_log, dates)
+            return self.write_dirty(entry_log, sections, dirty_dates, dates)
+        except Exception as e:
+            self.drop_index()
+            return False, str(e)
+
+    def write_full(self, entry_log, dates=None):
+        sections = []
+        parts = []
+        offset = 0
+        for date in (entry_log if dates is None else dates):
+            section = self.render_day(date, entry_log[date]).encode("utf-8")
+            sections.append([date, offset, len(section), self.digest(section)])
+            parts.append(section)
+            offset += len(section)
+        self.drop_index()
+        FileManager.splice_atomic(self.path_md, 0, b"".join(parts))
+        self.write_index(sections)
+        return True, "Saved successfully"
+
+    @staticmethod
+    def insert_position(sections: list, date: str) -> int:
+        """Where a new date's section goes: before the first section of a later date."""
+        ordinal = DateManager.date_to_ordinal(date)
+        low, high = 0, len(sections)
+        while low < high:
+            middle = (low + high) // 2
+            if DateManager.date_to_ordinal(sections[middle][0]) <= ordinal:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def write_dirty(self, entry_log, sections: list, dirty_dates, dates=None):
+        positions = {section[0]: i for i, section in enumerate(sections)}
+        rendered = {}
+        inserts = {}  # Position in `sections` -> new dates whose sections go before it
+        for date in sorted(dirty_dates, key=DateManager.date_to_ordinal):
+            section = self.render_day(date, entry_log[date]).encode("utf-8") if date in entry_log else None
+            if date in positions:
+                if section is not None and self.digest(section) == sections[positions[date]][3]:
+                    continue  # Changed and changed back
+            elif section is None:
+                continue  # Added and deleted again
+            else:
+                inserts.setdefault(self.insert_position(sections, date), []).append(date)
+            rendered[date] = section
+        if not rendered:
+            return True, "Saved successfully"
+
+        first = min([positions[date] for date in rendered if date in positions] + list(inserts))
+        start = sections[first][1] if first < len(sections) else (sections[-1][1] + sections[-1][2] if sections else 0)
+        in_place = all(date in rendered for date, _, _, _ in sections[first:])
+        tail = b""
+        if not in_place:
+            with open(self.path_md, 'rb') as file:
+                file.seek(start)
+                tail = file.read()
+
+        new_sections = sections[:first]
+        parts = []
+        offset = start
+        for i in range(first, len(sections) + 1):
+            day_sections = [(date, rendered[date]) for date in inserts.get(i, [])]
+            if i < len(sections):
+                date, section_offset, length, digest = sections[i]
+                if date in rendered:
+                    section = rendered[date]
+                else:
+                    section = tail[section_offset - start:section_offset - start + length]
+                    if self.digest(section) != digest:
+                        return self.write_full(entry_log, dates)
+                day_sections.append((date, section))
+            for date, section in day_sections:
+                if section is not None:
+                    new_sections.append([date, offset, len(section), self.digest(section)])
+                    parts.append(section)
+                    offset += len(section)
+
+        self.drop_index()
+        if in_place:
+            FileManager.truncate_and_append(self.path_md, start, b"".join(parts))
+        else:
+            FileManager.splice_atomic(self.path_md, start, b"".join(parts))
+        self.write_index(new_sections)
+        return True, "Saved successfully"
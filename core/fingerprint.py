@@ -0,0 +1,160 @@
+import os, json, hashlib
+from core.file_manager import FileManager
+
+
+class EntryLogFingerprint:
+    """
+    Order-independent fingerprint of an Entry Log: the number of sessions plus the
+    sum of a hash of each session. Adding, editing or deleting a session changes it
+    in O(1), so it is kept up to date as the journal changes instead of being worked
+    out by walking the whole history.
+    """
+    MODULUS = 1 << 64
+
+    def __init__(self, count: int = 0, total: int = 0) -> None:
+        self.count = count
+        self.total = total
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EntryLogFingerprint) and (self.count, self.total) == (other.count, other.total)
+
+    def __repr__(self) -> str:
+        return f"EntryLogFingerprint({self.count}, {self.total:#x})"
+
+    def copy(self) -> "EntryLogFingerprint":
+        return EntryLogFingerprint(self.count, self.total)
+
+    def to_list(self) -> list:
+        return [self.count, self.total]
+
+    @classmethod
+    def from_list(cls, value):
+        """The fingerprint stored as [count, total], or None if it is not one."""
+        if (isinstance(value, list) and len(value) == 2
+                and all(isinstance(number, int) and not isinstance(number, bool) for number in value)):
+            return cls(*value)
+        return None
+
+    @staticmethod
+    def session_hash(date: str, subject: str, book: str, session: str, details: dict) -> int:
+        payload = json.dumps([date, subject, book, session, details], sort_keys=True, ensure_ascii=False)
+        return int.from_bytes(hashlib.sha1(payload.encode("utf-8")).digest()[:8], "big")
+
+    def add(self, date: str, subject: str, book: str, session: str, details: dict, sign: int = 1) -> None:
+        self.count += sign
+        self.total = (self.total + sign * self.session_hash(date, subject, book, session, details)) % self.MODULUS
+
+    def remove(self, date: str, subject: str, book: str, session: str, details: dict) -> None:
+        self.add(date, subject, book, session, details, sign=-1)
+
+    def update(self, other: "EntryLogFingerprint") -> None:
+        """Add the sessions of a disjoint part of the log, e.g. another month."""
+        self.count += other.count
+        self.total = (self.total + other.total) % self.MODULUS
+
+    def add_day(self, date: str, progress_date: dict, sign: int = 1) -> None:
+        for subject, books in progress_date.items():
+            for book, sessions in books.items():
+                for session, details in sessions.items():
+                    self.add(date, subject, book, session, details, sign)
+
+    def remove_day(self, date: str, progress_date: dict) -> None:
+        self.add_day(date, progress_date, sign=-1)
+
+    def apply_record(self, entry_log, record: dict) -> None:
+        """Follow an operation record (see OperationLog); call it before the record is applied."""
+        date, subject, book, session = record["date"], record["subject"], record["book"], record["session"]
+        if date is None:
+            self.count = self.total = 0
+            return
+        if date not in entry_log:
+            old_details = None
+        elif not session:
+            self.remove_day(date, entry_log[date])
+            return
+        else:
+            old_details = entry_log[date].get(subject, {}).get(book, {}).get(session)
+        if old_details is not None:
+            self.remove(date, subject, book, session, old_details)
+        if record["op"] in ("add", "edit"):
+            self.add(date, subject, book, session, record["data"])
+
+    @classmethod
+    def of_entry_log(cls, entry_log) -> "EntryLogFingerprint":
+        fingerprint = cls()
+        for date, progress_date in entry_log.items():
+            fingerprint.add_day(date, progress_date)
+        return fingerprint
+
+
+class FingerprintStamp:
+    """
+    The fingerprint of a data file's Entry Log, kept next to it in "<file>.fingerprint"
+    together with the file's size and modification time. If the file has changed since
+    (written by another tool, edited by hand), the stamp is not trusted.
+    """
+
+    def __init__(self, path_data: str) -> None:
+        self.path_data = path_data
+        self.path_stamp = f"{path_data}.fingerprint"
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.path_data)
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def read(self):
+        try:
+            with open(self.path_stamp, "r", encoding="utf-8") as file:
+                stamp = json.load(file)
+            if stamp["Signature"] != self.file_signature():
+                return None
+            return EntryLogFingerprint.from_list(stamp["Fingerprint"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write(self, fingerprint: EntryLogFingerprint):
+        stamp = {"Signature": self.file_signature(), "Fingerprint": fingerprint.to_list()}
+        return FileManager.write_atomic(self.path_stamp, json.dumps(stamp))
+
+
+class StatsSnapshot:
+    """
+    All Time Subjects and Statistics saved together with the fingerprint of the Entry Log
+    they were worked out from. At startup they are only used if the fingerprint still
+    matches; otherwise (a crash, the data file edited by hand) they are worked out again.
+    """
+
+    def __init__(self, path_snapshot: str) -> None:
+        self.path_snapshot = path_snapshot
+
+    def load(self, fingerprint: EntryLogFingerprint):
+        """Return (all_time_subjects, stats), or None when there is no snapshot for this fingerprint."""
+        if fingerprint is None:
+            return None
+        try:
+            with open(self.path_snapshot, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            if EntryLogFingerprint.from_list(snapshot["Fingerprint"]) != fingerprint:
+                return None
+            return snapshot["All Time Subjects"], snapshot["Statistics"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, fingerprint: EntryLogFingerprint, all_time_subjects: dict, stats: dict):
+        if fingerprint is None:
+            return False, "No fingerprint"
+        snapshot = {
+            "Fingerprint": fingerprint.to_list(),
+            "All Time Subjects": all_time_subjects,
+            "Statistics": stats
+        }
+        return FileManager.write_atomic(self.path_snapshot, json.dumps(snapshot, ensure_ascii=False))
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path_snapshot)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,283 @@
+import os, re, json, codecs, threading
+from core.exceptions import DataCorruptionError
+
+
+class JsonStreamReader:
+    """
+    Walks a JSON data file read from a stream (e.g. a zip member) section by section
+    and day by day. Only the value being decoded is kept in memory, never the file,
+    so it can also find where every day sits in a file of any size (scan()).
+    """
+    CHUNK_SIZE = 64 * 1024
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.bytes_read = 0
+        self.at_end = False
+        self.mark = 0  # A position in the buffer, and its byte offset in the stream
+        self.mark_byte = 0
+
+    def fill(self, size: int = CHUNK_SIZE) -> bool:
+        """Read more of the stream, dropping what has been consumed. False at the end of it."""
+        if self.at_end:
+            return False
+        chunk = self.stream.read(size)
+        self.bytes_read += len(chunk)
+        self.at_end = not chunk
+        self.byte_offset(self.position)
+        self.mark = 0
+        self.buffer = self.buffer[self.position:] + self.text_decoder.decode(chunk, final=self.at_end)
+        self.position = 0
+        return True
+
+    def byte_offset(self, position: int) -> int:
+        """Byte offset in the stream of a buffer position (never before the last one asked for)."""
+        self.mark_byte += len(self.buffer[self.mark:position].encode("utf-8"))
+        self.mark = position
+        return self.mark_byte
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self.position = self.WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self.fill():
+                return
+
+    def expect(self, char: str) -> None:
+        self.skip_whitespace()
+        if self.buffer[self.position:self.position + 1] != char:
+            raise ValueError(f"Expected {char!r} after byte {self.bytes_read - len(self.buffer) + self.position}")
+        self.position += 1
+
+    def next_is(self, char: str) -> bool:
+        self.skip_whitespace()
+        if self.buffer[self.position:self.position + 1] == char:
+            self.position += 1
+            return True
+        return False
+
+    def read_value(self):
+        return self.read_span()[0]
+
+    def read_span(self) -> tuple:
+        """Decode the next value and return it with its byte span."""
+        self.skip_whitespace()
+        start = self.byte_offset(self.position)
+        size = self.CHUNK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.fill(size):
+                    raise
+                size *= 2  # The value is not complete yet
+                continue
+            if end == len(self.buffer) and self.fill():
+                continue  # A number could carry on in the next chunk
+            self.position = end
+            return value, (start, self.byte_offset(end))
+
+    def members(self):
+        """Yield the keys of the object starting at the current position, leaving it at each value."""
+        self.expect("{")
+        if self.next_is("}"):
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.next_is("}"):
+                return
+            self.expect(",")
+
+    def items(self):
+        """Yield (section, date, value): one per day of "Entry Log", (section, None, value) for the rest."""
+        for key in self.members():
+            if key == "Entry Log":
+                for date in self.members():
+                    yield key, date, self.read_value()
+            else:
+                yield key, None, self.read_value()
+        self.skip_whitespace()
+        if self.position < len(self.buffer):
+            raise ValueError("Extra data after the end of the file")
+
+
+    def scan(self) -> tuple:
+        """
+        Return ({section: (start, end)}, [(date, start, end), ...]) with byte offsets.
+        Every value is decoded and dropped straight away; only the offsets are kept.
+        """
+        sections = {}
+        days = []
+        for key in self.members():
+            if key != "Entry Log":
+                sections[key] = self.read_span()[1]
+                continue
+            self.skip_whitespace()
+            start = self.byte_offset(self.position)
+            for date in self.members():
+                days.append((date, *self.read_span()[1]))
+            sections[key] = (start, self.byte_offset(self.position))
+        self.skip_whitespace()
+        if self.position < len(self.buffer):
+            raise ValueError("Extra data after the end of the file")
+        return sections, days
+
+
+class JsonSnapshotWriter:
+    """Serializes the data file exactly like json.dumps(indent=4), keeping track of each day's byte span."""
+
+    @staticmethod
+    def dumps_nested(value, level: int) -> bytes:
+        text = json.dumps(value, indent=4, ensure_ascii=False)
+        return text.replace("\n", "\n" + " " * 4 * level).encode("utf-8")
+
+    @classmethod
+    def dumps(cls, sections: dict, raw_day) -> tuple:
+        """
+        Return (file bytes, index). `raw_day(date)` may return the day's bytes as they
+        already are on disk, so days that were never loaded are copied without parsing.
+        """
+        parts = [b"{"]
+        offset = 1
+        index = {"sections": {}, "days": []}
+        for position, (key, value) in enumerate(sections.items()):
+            head = (("," if position else "") + "\n    " + json.dumps(key, ensure_ascii=False) + ": ").encode("utf-8")
+            parts.append(head)
+            offset += len(head)
+            start = offset
+            if key == "Entry Log" and value:
+                parts.append(b"{")
+                offset += 1
+                for number, date in enumerate(value):
+                    head = (("," if number else "") + "\n        " + json.dumps(date, ensure_ascii=False) + ": ").encode("utf-8")
+                    day = raw_day(date)
+                    if day is None:
+                        day = cls.dumps_nested(value[date], 2)
+                    parts.append(head)
+                    parts.append(day)
+                    offset += len(head)
+                    index["days"].append([date, offset, offset + len(day)])
+                    offset += len(day)
+                parts.append(b"\n    }")
+                offset += 6
+            else:
+                body = cls.dumps_nested(value, 1)
+                parts.append(body)
+                offset += len(body)
+            index["sections"][key] = [start, offset]
+        parts.append(b"\n}" if len(parts) > 1 else b"}")
+        return b"".join(parts), index
+
+
+class JsonDaySource:
+    """
+    Day loader for LazyEntryLog over learning_data.json.
+
+    The day spans are kept in "<file>.index" beside the data file; the file is only
+    scanned again when it no longer matches the index (first run, external edits).
+    """
+
+    def __init__(self, path_json: str) -> None:
+        self.path_json = path_json
+        self.path_index = f"{path_json}.index"
+        self.lock = threading.Lock()
+        self.sections = {}
+        self.days = {}
+        self.load_index()
+
+    def file_signature(self):
+        try:
+            stat = os.stat(self.path_json)
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load_index(self) -> None:
+        signature = self.file_signature()
+        if signature is None:
+            return
+        try:
+            with open(self.path_index, "r", encoding="utf-8") as file:
+                index = json.load(file)
+            if index["signature"] == signature:
+                self.set_index(index)
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        if os.path.getsize(self.path_json) == 0:
+            raise DataCorruptionError(file_path=self.path_json)
+        try:
+            with open(self.path_json, "rb") as file:
+                sections, days = JsonStreamReader(file).scan()
+        except (ValueError, UnicodeDecodeError) as e:
+            raise DataCorruptionError(file_path=self.path_json) from e
+        index = {"sections": sections, "days": days}
+        self.set_index(index)
+        self.write_index(index)
+
+    def set_index(self, index: dict) -> None:
+        self.sections = {key: tuple(span) for key, span in index["sections"].items()}
+        self.days = {date: (start, end) for date, start, end in index["days"]}
+
+    def write_index(self, index: dict) -> None:
+        index = dict(index, signature=self.file_signature())
+        try:
+            with open(self.path_index, "w", encoding="utf-8") as file:
+                json.dump(index, file)
+        except OSError:
+            pass  # The index is only a shortcut; without it the file gets scanned again
+
+    def read_span(self, start: int, end: int) -> bytes:
+        with open(self.path_json, "rb") as file:
+            file.seek(start)
+            return file.read(end - start)
+
+    def parse_span(self, span: tuple):
+        try:
+            return json.loads(self.read_span(*span).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise DataCorruptionError(file_path=self.path_json) from e
+
+    def load_section(self, key: str, default=None):
+        with self.lock:
+            if key not in self.sections:
+                return default
+            return self.parse_span(self.sections[key])
+
+    def load_dates(self) -> list:
+        return list(self.days)
+
+    def load_day(self, date: str) -> dict:
+        with self.lock:
+            return self.parse_span(self.days[date])
+
+    def raw_day(self, date: str):
+        with self.lock:
+            if date not in self.days:
+                return None
+            return self.read_span(*self.days[date])
+
+    def replace_file(self, data: bytes, index: dict):
+        """Atomically swap in a new data file together with its index."""
+        temp_path = f"{self.path_json}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            with self.lock:
+                os.replace(temp_path, self.path_json)
+                self.set_index(index)
+                self.write_index(index)
+        except OSError as e:
+            return False, str(e)
+        return True, "Saved successfully"
@@ -0,0 +1,125 @@
+import os, json, hashlib, threading
+
+
+class OperationLog:
+    """
+    Append-only log of changes made to the Entry Log since the last compaction.
+
+    Every record is one JSON line:
+        {"op": "add" | "edit" | "delete", "date": ..., "subject": ..., "book": ...,
+         "session": ..., "data": {...}, "checksum": ...}
+
+    A "delete" record without a session removes the whole day, and one without
+    a date removes every recorded day. Records only ever set or remove values,
+    so replaying records that are already part of the snapshot is harmless.
+    """
+    COMPACT_THRESHOLD = 512 * 1024  # bytes
+
+    def __init__(self, path_log: str) -> None:
+        self.path_log = path_log
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def checksum(record: dict) -> str:
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def make_record(op: str, date=None, subject: str = "", book: str = "", session: str = "", data=None) -> dict:
+        return {
+            "op": op,
+            "date": date,
+            "subject": subject,
+            "book": book,
+            "session": session,
+            "data": data
+        }
+
+    @staticmethod
+    def apply(entry_log, record: dict) -> None:
+        """Apply one record to an Entry Log mapping."""
+        date, subject, book, session = record["date"], record["subject"], record["book"], record["session"]
+        if record["op"] in ("add", "edit"):
+            day = entry_log.setdefault(date, {})
+            day.setdefault(subject, {}).setdefault(book, {})[session] = record["data"]
+        elif date is None:
+            entry_log.clear()
+        elif not session:
+            if date in entry_log:
+                del entry_log[date]
+        elif session in entry_log.get(date, {}).get(subject, {}).get(book, {}):
+            day = entry_log[date]
+            day[subject][book].pop(session)
+            if not day[subject][book]:
+                day[subject].pop(book)
+                if not day[subject]:
+                    day.pop(subject)
+            if not day:
+                del entry_log[date]
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path_log)
+        except OSError:
+            return 0
+
+    def append(self, records: list):
+        """Append records to the log file and sync them to disk."""
+        if not records:
+            return True, "Nothing to save"
+        lines = "".join(json.dumps(dict(record, checksum=self.checksum(record)), ensure_ascii=False) + "\n"
+                        for record in records)
+        try:
+            with self.lock:
+                with open(self.path_log, "a", encoding="utf-8") as file:
+                    file.write(lines)
+                    file.flush()
+                    os.fsync(file.fileno())
+        except OSError as e:
+            return False, str(e)
+        return True, "Saved successfully"
+
+    def read(self, repair: bool = True):
+        """
+        Yield every valid record in the log, oldest first.
+
+        Reading stops at the first torn or tampered line (e.g. after a crash mid-write),
+        and the file is cut back to the last valid record so new records are not lost behind it.
+        Readers that must not change the file (e.g. a report run next to the app) pass repair=False.
+        """
+        try:
+            file = open(self.path_log, "rb")
+        except FileNotFoundError:
+            return
+        valid_size = 0
+        with file:
+            for line in file:
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                    checksum = record.pop("checksum")
+                except (UnicodeDecodeError, json.JSONDecodeError, KeyError, AttributeError):
+                    break
+                if not line.endswith(b"\n") or checksum != self.checksum(record):
+                    break
+                valid_size += len(line)
+                yield record
+        if repair and valid_size < self.size():
+            with self.lock:
+                with open(self.path_log, "r+b") as file:
+                    file.truncate(valid_size)
+
+    def discard_prefix(self, offset: int) -> None:
+        """Drop the first `offset` bytes, i.e. the records already written into the snapshot."""
+        with self.lock:
+            try:
+                with open(self.path_log, "rb") as file:
+                    file.seek(offset)
+                    tail = file.read()
+            except FileNotFoundError:
+                return
+            temp_path = f"{self.path_log}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(tail)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path_log)
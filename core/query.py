@@ -0,0 +1,220 @@
+from copy import copy
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from core.core_services import DateManager, CoreHelpers
+from core.entries import EntryLoader
+
+
+class JournalQuery:
+    """
+    A question about the Entry Log, put together one step at a time:
+
+        context.query().subject("Hadith").between("01-Jan-2026", "31-Mar-2026").where(min_minutes=30)
+
+    Every step returns a new query, so a partial one can be kept and reused, and
+    nothing is read until the query is iterated or aggregated. Iterating yields
+    (date, session, entry) in date order, one session at a time; count(), sum() and
+    totals() work on the stored sessions and never build entry objects.
+
+    The scan is driven by whichever index leaves the fewest sessions to look at:
+
+        text   SearchIndex, the sessions containing the words
+        book   BookIndex, the days the chosen book(s) were read on
+        dates  DayIndex, the days of the date range (or every day)
+
+    and every other condition is checked on the way. Totals of just a subject, book
+    and date range come straight from the DayRollup, without a scan.
+    """
+    LIMITS = ("min_minutes", "max_minutes", "min_pages", "max_pages")
+
+    def __init__(self, data_manager, search_index=None, day_rollup=None) -> None:
+        self.data = data_manager
+        self.search_index = search_index
+        self.day_rollup = day_rollup
+        self.subject_name = None
+        self.book_name = None
+        self.first = None  # Date range as ordinals, None for no limit
+        self.last = None
+        self.text_query = None
+        self.limits = {}
+        self.predicate = None
+
+    def refined(self, **changes) -> "JournalQuery":
+        query = copy(self)
+        query.limits = dict(self.limits)
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+    def subject(self, subject: str) -> "JournalQuery":
+        return self.refined(subject_name=subject)
+
+    def book(self, book: str, subject: str = None) -> "JournalQuery":
+        """Sessions of one book; without a subject, the book under every subject it is filed under."""
+        return self.refined(book_name=book, subject_name=subject or self.subject_name)
+
+    def between(self, start: str = None, end: str = None) -> "JournalQuery":
+        """Sessions from `start` to `end`, both included; either can be left open."""
+        return self.refined(first=None if start is None else DateManager.date_to_ordinal(start),
+                            last=None if end is None else DateManager.date_to_ordinal(end))
+
+    def on(self, date: str) -> "JournalQuery":
+        return self.between(date, date)
+
+    def text(self, query: str) -> "JournalQuery":
+        """Sessions containing every word of `query` in their notes, chapter, revision, book or subject."""
+        if self.search_index is None:
+            raise ValueError("Text queries need the search index.")
+        return self.refined(text_query=query)
+
+    def where(self, predicate=None, min_minutes: int = None, max_minutes: int = None,
+              min_pages: float = None, max_pages: float = None) -> "JournalQuery":
+        """
+        Sessions within the given minutes and pages (both ends included). A `predicate`
+        is called with the entry object of every session that is left, so it is the
+        only condition that builds entries; aggregates with one are slower.
+        """
+        query = self.refined()
+        for name, value in zip(self.LIMITS, (min_minutes, max_minutes, min_pages, max_pages)):
+            if value is not None:
+                query.limits[name] = value
+        if predicate is not None:
+            earlier = query.predicate
+            query.predicate = predicate if earlier is None else (lambda entry: earlier(entry) and predicate(entry))
+        return query
+
+    def books(self) -> list:
+        """(subject, book) pairs the query is limited to, or None if it is not limited to any."""
+        book_index = self.data.book_index
+        if self.book_name is not None:
+            subjects = [self.subject_name] if self.subject_name is not None else book_index.subjects_of(self.book_name)
+            return [(subject, self.book_name) for subject in subjects]
+        if self.subject_name is not None:
+            return [(self.subject_name, book) for book in book_index.books_of(self.subject_name)]
+        return None
+
+    def choose_plan(self) -> tuple:
+        """(plan name, estimated sessions to look at, the text matches if they were needed)."""
+        plans = []
+        text_keys = None
+        if self.text_query is not None:
+            text_keys = self.search_index.matching_keys(self.text_query)
+            plans.append((len(text_keys), 0, "text"))
+        books = self.books()
+        if books is not None:
+            plans.append((sum(self.data.book_index.count(subject, book) for subject, book in books), 1, "book"))
+        days = len(self.data.day_index.ordinals_between(self.first, self.last))
+        total_days = len(self.data.day_index)
+        total_sessions = sum(record.total_entries for records in self.data.stats.values() for record in records.values())
+        plans.append((round(days * total_sessions / total_days) if total_days else 0, 2, "dates"))
+        estimate, _, name = min(plans)
+        return name, estimate, text_keys
+
+    def plan(self) -> tuple:
+        """(index the scan would be driven by, estimated sessions it would look at)."""
+        return self.choose_plan()[:2]
+
+    def in_range(self, ordinal: int) -> bool:
+        return (self.first is None or ordinal >= self.first) and (self.last is None or ordinal <= self.last)
+
+    def scan_text(self, text_keys: list):
+        entry_log = self.data.entry_log
+        for ordinal, date, subject, book, session in text_keys:
+            yield ordinal, date, subject, book, session, entry_log[date][subject][book][session]
+
+    def scan_book(self, subject: str, book: str):
+        entry_log = self.data.entry_log
+        book_index = self.data.book_index
+        dated = book_index.dated(subject, book)
+        start = 0 if self.first is None else bisect_left(dated, (self.first,))
+        end = len(dated) if self.last is None else bisect_right(dated, (self.last + 1,))
+        for ordinal, date in dated[start:end]:
+            sessions = entry_log[date][subject][book]
+            for session in book_index.sessions(subject, book, date):
+                yield ordinal, date, subject, book, session, sessions[session]
+
+    def scan_dates(self):
+        entry_log = self.data.entry_log
+        day_index = self.data.day_index
+        for ordinal in day_index.ordinals_between(self.first, self.last):
+            date = day_index.dates[ordinal]
+            for subject, books in entry_log[date].items():
+                if self.subject_name is not None and subject != self.subject_name:
+                    continue
+                for book, sessions in books.items():
+                    if self.book_name is not None and book != self.book_name:
+                        continue
+                    for session, details in sessions.items():
+                        yield ordinal, date, subject, book, session, details
+
+    def rows(self):
+        """(date, subject, book, session, details) of every matching session, in date order, as stored."""
+        name, _, text_keys = self.choose_plan()
+        if name == "text":
+            candidates = self.scan_text(text_keys)
+        elif name == "book":
+            candidates = merge(*(self.scan_book(subject, book) for subject, book in self.books()))
+        else:
+            candidates = self.scan_dates()
+        text_matches = None if text_keys is None or name == "text" else {key[1:] for key in text_keys}
+        for ordinal, date, subject, book, session, details in candidates:
+            if not self.in_range(ordinal):
+                continue
+            if self.subject_name is not None and subject != self.subject_name:
+                continue
+            if self.book_name is not None and book != self.book_name:
+                continue
+            if text_matches is not None and (date, subject, book, session) not in text_matches:
+                continue
+            if self.limits and not self.within_limits(details):
+                continue
+            yield date, subject, book, session, details
+
+    def within_limits(self, details: dict) -> bool:
+        minutes = CoreHelpers.convert_time_to_mins(details["Time Spent"])
+        pages = details["Total Pages"]
+        limits = self.limits
+        return (minutes >= limits.get("min_minutes", minutes) and minutes <= limits.get("max_minutes", minutes)
+                and pages >= limits.get("min_pages", pages) and pages <= limits.get("max_pages", pages))
+
+    def __iter__(self):
+        """(date, session, entry) of every matching session, in date order."""
+        for date, subject, book, session, details in self.rows():
+            entry = EntryLoader.from_dict(subject, book, details)
+            if self.predicate is None or self.predicate(entry):
+                yield date, session, entry
+
+    def totals(self) -> tuple:
+        """(sessions, minutes, pages) over every matching session."""
+        if self.predicate is None and self.text_query is None and not self.limits and self.day_rollup is not None:
+            return self.rollup_totals()
+        entries = minutes = pages = 0
+        if self.predicate is None:
+            for _, _, _, _, details in self.rows():
+                entries += 1
+                minutes += CoreHelpers.convert_time_to_mins(details["Time Spent"])
+                pages += details["Total Pages"]
+        else:
+            for _, _, entry in self:
+                entries += 1
+                minutes += CoreHelpers.convert_time_to_mins(entry.time_spent)
+                pages += entry.total_pages
+        pages = round(pages, 6)  # Sums of fractional pages can pick up float noise
+        return entries, minutes, int(pages) if pages == int(pages) else pages
+
+    def rollup_totals(self) -> tuple:
+        day_index = self.data.day_index
+        ordinals = day_index.ordinals_between(self.first, self.last)
+        if not ordinals:
+            return 0, 0, 0
+        return self.day_rollup.totals(day_index.dates[ordinals[0]], day_index.dates[ordinals[-1]],
+                                      self.subject_name, self.book_name)
+
+    def count(self) -> int:
+        return self.totals()[0]
+
+    def sum(self, field: str):
+        """Total "minutes" or "pages" of the matching sessions."""
+        if field not in ("minutes", "pages"):
+            raise ValueError(f"Cannot sum \"{field}\"; use \"minutes\" or \"pages\".")
+        return self.totals()[1 if field == "minutes" else 2]
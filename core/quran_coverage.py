@@ -0,0 +1,273 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class QuranStructure:
+    """
+    The fixed layout of the Qur'an (Hafs count): ayat and rukus of every surah, and
+    the ayah each para starts at. Ayat are numbered 0-6235 in mushaf order, so a
+    range of ayat is a range of bits.
+    """
+    SURAH_AYAT = (
+        7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128, 111, 110, 98, 135,
+        112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73, 54, 45, 83, 182, 88, 75, 85,
+        54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60, 49, 62, 55, 78, 96, 29, 22, 24, 13,
+        14, 11, 11, 18, 12, 12, 30, 52, 52, 44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42,
+        29, 19, 36, 25, 22, 17, 19, 26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11,
+        11, 8, 3, 9, 5, 4, 7, 3, 6, 3, 5, 4, 5, 6
+    )
+    SURAH_RUKUS = (
+        1, 40, 20, 24, 16, 20, 24, 10, 16, 11, 10, 12, 6, 7, 6, 16, 12, 12, 6, 8,
+        7, 10, 6, 9, 6, 11, 7, 9, 7, 6, 4, 3, 9, 6, 5, 5, 5, 5, 8, 9,
+        6, 5, 7, 3, 4, 4, 4, 4, 2, 3, 3, 2, 3, 3, 3, 3, 4, 3, 3, 2,
+        2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2
+    ) + (1,) * 35
+    PARA_STARTS = (  # (surah, ayah) each para begins with
+        (1, 1), (2, 142), (2, 253), (3, 93), (4, 24), (4, 148), (5, 82), (6, 111), (7, 88), (8, 41),
+        (9, 93), (11, 6), (12, 53), (15, 1), (17, 1), (18, 75), (21, 1), (23, 1), (25, 21), (27, 56),
+        (29, 46), (33, 31), (36, 28), (39, 32), (41, 47), (46, 1), (51, 31), (58, 1), (67, 1), (78, 1)
+    )
+    SURAHS = len(SURAH_AYAT)
+    PARAS = len(PARA_STARTS)
+    TOTAL_AYAT = sum(SURAH_AYAT)
+    TOTAL_RUKUS = sum(SURAH_RUKUS)
+    RUKU_SLOTS = 64  # Bits set aside for the rukus of each para, numbered as in the para
+    SURAH_FIRST = tuple(accumulate((0,) + SURAH_AYAT[:-1]))
+
+    @classmethod
+    def ayah_index(cls, surah: int, ayah: int) -> int:
+        return cls.SURAH_FIRST[surah - 1] + ayah - 1
+
+    @classmethod
+    def locate(cls, index: int) -> tuple:
+        """(surah, ayah) of an ayah index."""
+        surah = bisect_right(cls.SURAH_FIRST, index)
+        return surah, index - cls.SURAH_FIRST[surah - 1] + 1
+
+    @staticmethod
+    def span(first: int, last: int) -> int:
+        """Bits `first` to `last`, both included."""
+        return ((1 << (last - first + 1)) - 1) << first
+
+    @staticmethod
+    def count_bits(bits: int) -> int:
+        return bin(bits).count("1")  # int.bit_count() needs Python 3.10
+
+    @classmethod
+    def para_spans(cls) -> tuple:
+        firsts = [cls.ayah_index(surah, ayah) for surah, ayah in cls.PARA_STARTS] + [cls.TOTAL_AYAT]
+        return tuple(cls.span(firsts[i], firsts[i + 1] - 1) for i in range(cls.PARAS))
+
+
+class QuranCoverage:
+    """
+    How much of the Qur'an has been covered, per subject, as bitmaps:
+
+        ayat   one bit per ayah (6236), from the Surah and Ayah of Tafseer entries
+        rukus  RUKU_SLOTS bits per para, from "Ruku (Para)"
+        paras  one bit per para with any entry
+
+    Each day's entries are parsed once into its own bitmaps; the totals are their OR.
+    Built from the Qur'an entry dates in Statistics, so only those days are read, and
+    kept current as a DataManager listener: a day that only gained bits is OR-ed in,
+    a day that lost some makes its subject's totals be OR-ed again from the days.
+
+    Rukus are numbered within their para, and the para of each ruku is not tabled, so
+    ruku coverage counts the distinct (para, ruku) pairs against the 558 rukus.
+    """
+    SUBJECTS = ("Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)")
+    PARA_SPANS = QuranStructure.para_spans()
+    ALL_AYAT = QuranStructure.span(0, QuranStructure.TOTAL_AYAT - 1)
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.day_bits = {}  # date -> subject -> (ayat, rukus, paras)
+        self.totals = {}  # subject -> [ayat, rukus, paras]
+        self.built = False
+
+    @staticmethod
+    def parse_range(text) -> tuple:
+        """'3 - 7' -> (3, 7), '5' -> (5, 5); None if there is no number."""
+        numbers = re.findall(r"\d+(?:\.\d+)?", str(text))
+        if not numbers:
+            return None
+        first, last = int(float(numbers[0])), int(float(numbers[-1]))
+        return (first, last) if first <= last else (last, first)
+
+    @classmethod
+    def ayat_of(cls, details: dict) -> int:
+        surahs = cls.parse_range(details.get("Surah", ""))
+        if surahs is None or surahs[0] < 1:
+            return 0
+        first_surah, last_surah = surahs[0], min(surahs[1], QuranStructure.SURAHS)
+        if first_surah > last_surah:
+            return 0
+        ayat = cls.parse_range(details.get("Ayah", ""))
+        if ayat is None or ayat[1] < 1:  # No ayat given: the whole surahs
+            first_ayah, last_ayah = 1, QuranStructure.SURAH_AYAT[last_surah - 1]
+        elif first_surah == last_surah:
+            first_ayah, last_ayah = max(ayat[0], 1), ayat[1]
+        else:  # e.g. Surah "2 - 3", Ayah "280 - 10": from 2:280 to 3:10
+            numbers = re.findall(r"\d+", str(details.get("Ayah", "")))
+            first_ayah, last_ayah = max(int(numbers[0]), 1), int(numbers[-1])
+        first_ayah = min(first_ayah, QuranStructure.SURAH_AYAT[first_surah - 1])
+        last_ayah = min(last_ayah, QuranStructure.SURAH_AYAT[last_surah - 1])
+        first = QuranStructure.ayah_index(first_surah, first_ayah)
+        last = QuranStructure.ayah_index(last_surah, last_ayah)
+        return QuranStructure.span(first, last) if first <= last else 0
+
+    @classmethod
+    def bits_of(cls, book: str, details: dict) -> tuple:
+        """(ayat, rukus, paras) bitmaps of one session."""
+        paras = cls.parse_range(book.split("Para no.")[-1])
+        if paras is None:
+            return cls.ayat_of(details), 0, 0
+        first_para, last_para = max(paras[0], 1), min(paras[1], QuranStructure.PARAS)
+        para_bits = QuranStructure.span(first_para - 1, last_para - 1) if first_para <= last_para else 0
+        ruku_bits = 0
+        rukus = cls.parse_range(details.get("Ruku (Para)", ""))
+        # The ruku numbers only say which para they belong to when the session stayed in one
+        if first_para == last_para and rukus is not None and rukus[0] >= 1:
+            last_ruku = min(rukus[1], QuranStructure.RUKU_SLOTS)
+            if rukus[0] <= last_ruku:
+                ruku_bits = QuranStructure.span(rukus[0] - 1, last_ruku - 1) << (first_para - 1) * QuranStructure.RUKU_SLOTS
+        return cls.ayat_of(details), ruku_bits, para_bits
+
+    def day_of(self, date: str) -> dict:
+        day = {}
+        progress_date = self.data.entry_log.get(date, {})
+        for subject in self.SUBJECTS:
+            bits = [0, 0, 0]
+            for book, sessions in progress_date.get(subject, {}).items():
+                for details in sessions.values():
+                    for i, session_bits in enumerate(self.bits_of(book, details)):
+                        bits[i] |= session_bits
+            if any(bits):
+                day[subject] = tuple(bits)
+        return day
+
+    def build(self) -> None:
+        self.day_bits = {}
+        self.totals = {}
+        dates = {date for subject in self.SUBJECTS
+                 for record in self.data.stats.get(subject, {}).values()
+                 for date in record.entry_dates}
+        for date in dates:
+            day = self.day_of(date)
+            if day:
+                self.day_bits[date] = day
+        for subject in self.SUBJECTS:
+            self.total_again(subject)
+        if self not in self.data.listeners:
+            self.data.listeners.append(self)
+        self.built = True
+
+    def total_again(self, subject: str) -> None:
+        totals = [0, 0, 0]
+        for day in self.day_bits.values():
+            for i, bits in enumerate(day.get(subject, ())):
+                totals[i] |= bits
+        self.totals[subject] = totals
+
+    def on_day_changed(self, date: str) -> None:
+        if not self.built:
+            return
+        old_day = self.day_bits.get(date, {})
+        new_day = self.day_of(date)
+        if new_day:
+            self.day_bits[date] = new_day
+        else:
+            self.day_bits.pop(date, None)
+        for subject in self.SUBJECTS:
+            old_bits = old_day.get(subject, (0, 0, 0))
+            new_bits = new_day.get(subject, (0, 0, 0))
+            if any(old & ~new for old, new in zip(old_bits, new_bits)):
+                self.total_again(subject)
+            else:
+                self.totals[subject] = [total | new for total, new in zip(self.totals[subject], new_bits)]
+
+    def on_clear(self) -> None:
+        self.day_bits = {}
+        self.totals = {subject: [0, 0, 0] for subject in self.SUBJECTS}
+
+    def reset(self) -> None:
+        """Build again on next use, e.g. after a restore replaced the data."""
+        self.built = False
+
+    def bitmaps(self, subject: str) -> list:
+        if not self.built:
+            self.build()
+        return self.totals.get(subject, [0, 0, 0])
+
+    def coverage(self, subject: str) -> dict:
+        ayat, rukus, paras = self.bitmaps(subject)
+        ayah_count, ruku_count = QuranStructure.count_bits(ayat), QuranStructure.count_bits(rukus)
+        return {
+            "Ayat": ayah_count,
+            "Ayat %": 100 * ayah_count / QuranStructure.TOTAL_AYAT,
+            "Rukus": ruku_count,
+            "Rukus %": min(100 * ruku_count / QuranStructure.TOTAL_RUKUS, 100),
+            "Paras Read": QuranStructure.count_bits(paras),
+            "Paras Complete": sum(1 for span in self.PARA_SPANS if ayat & span == span),
+        }
+
+    def khatm(self, subject: str) -> float:
+        """Percent of a khatm done: by ayat for Tafseer, by rukus for Tilawat."""
+        report = self.coverage(subject)
+        return report["Ayat %"] if subject == self.SUBJECTS[0] else report["Rukus %"]
+
+    def ayah_gaps(self, subject: str) -> list:
+        """((surah, ayah), (surah, ayah)) of every run of ayat not covered yet, in order."""
+        missing = self.ALL_AYAT & ~self.bitmaps(subject)[0]
+        bits = format(missing, f"0{QuranStructure.TOTAL_AYAT}b")[::-1]
+        return [(QuranStructure.locate(run.start()), QuranStructure.locate(run.end() - 1))
+                for run in re.finditer("1+", bits)]
+
+    def ruku_gaps(self, subject: str) -> dict:
+        """para -> ruku numbers missing below the highest one read; paras never read map to None."""
+        _, rukus, paras = self.bitmaps(subject)
+        gaps = {}
+        for para in range(1, QuranStructure.PARAS + 1):
+            para_rukus = rukus >> (para - 1) * QuranStructure.RUKU_SLOTS & QuranStructure.span(0, QuranStructure.RUKU_SLOTS - 1)
+            if not paras >> (para - 1) & 1:
+                gaps[para] = None
+                continue
+            missing = [ruku for ruku in range(1, para_rukus.bit_length()) if not para_rukus >> (ruku - 1) & 1]
+            if missing:
+                gaps[para] = missing
+        return gaps
+
+    @staticmethod
+    def format_ayah_gap(gap: tuple) -> str:
+        (first_surah, first_ayah), (last_surah, last_ayah) = gap
+        if first_ayah == 1 and last_ayah == QuranStructure.SURAH_AYAT[last_surah - 1]:
+            return f"Surah {first_surah}" if first_surah == last_surah else f"Surah {first_surah} - {last_surah}"
+        if first_surah == last_surah:
+            return f"{first_surah}:{first_ayah}" if first_ayah == last_ayah else f"{first_surah}:{first_ayah} - {last_ayah}"
+        return f"{first_surah}:{first_ayah} - {last_surah}:{last_ayah}"
+
+    def get_summary(self) -> str:
+        tafseer, tilawat = (self.coverage(subject) for subject in self.SUBJECTS)
+        return (f"Tafseer: {tafseer['Ayat']} of {QuranStructure.TOTAL_AYAT} ayat ({tafseer['Ayat %']:.1f}%), "
+                f"{tafseer['Paras Complete']} of {QuranStructure.PARAS} paras complete\n"
+                f"Tilawat: {tilawat['Rukus']} of {QuranStructure.TOTAL_RUKUS} rukus ({tilawat['Rukus %']:.1f}%), "
+                f"{tilawat['Paras Read']} of {QuranStructure.PARAS} paras read\n"
+                f"Khatm: {self.khatm(self.SUBJECTS[0]):.1f}% (Tafseer), {self.khatm(self.SUBJECTS[1]):.1f}% (Tilawat)")
+
+    def get_gaps_summary(self, limit: int = 10) -> str:
+        """The first `limit` gaps of each subject, as text."""
+        ayah_gaps = self.ayah_gaps(self.SUBJECTS[0])
+        lines = [f"Tafseer, ayat not covered ({len(ayah_gaps)} gap(s)):"]
+        lines += [f"  {self.format_ayah_gap(gap)}" for gap in ayah_gaps[:limit]]
+        if len(ayah_gaps) > limit:
+            lines.append(f"  ... and {len(ayah_gaps) - limit} more")
+        ruku_gaps = self.ruku_gaps(self.SUBJECTS[1])
+        unread = [str(para) for para, missing in ruku_gaps.items() if missing is None]
+        partial = [(para, missing) for para, missing in ruku_gaps.items() if missing is not None]
+        lines.append("Tilawat, paras not read: " + (", ".join(unread) or "none"))
+        for para, missing in partial[:limit]:
+            lines.append(f"  Para {para}, rukus skipped: {', '.join(map(str, missing))}")
+        if len(partial) > limit:
+            lines.append(f"  ... and {len(partial) - limit} more para(s)")
+        return "\n".join(lines)
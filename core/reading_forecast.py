@@ -0,0 +1,175 @@
+import re, json
+from math import ceil
+from dataclasses import dataclass, field
+from core.core_services import DateManager, CoreHelpers
+from core.file_manager import FileManager
+
+
+class BookSizes:
+    """Page counts of books, as given by the user, kept in a small file next to the data file."""
+
+    def __init__(self, path_sizes: str) -> None:
+        self.path_sizes = path_sizes
+        try:
+            with open(self.path_sizes, "r", encoding="utf-8") as file:
+                self.sizes = json.load(file)
+        except (OSError, ValueError):
+            self.sizes = {}
+
+    def get(self, subject: str, book: str) -> int:
+        return self.sizes.get(subject, {}).get(book, 0)
+
+    def set(self, subject: str, book: str, pages: int):
+        self.sizes.setdefault(subject, {})[book] = int(pages)
+        return FileManager.write_atomic(self.path_sizes, json.dumps(self.sizes, ensure_ascii=False, indent=2))
+
+
+@dataclass
+class BookPace:
+    """
+    Running sums of one book: sessions, minutes and pages, plus the same per active
+    day (ordinal -> [sessions, minutes, pages, furthest page]) for the day counts,
+    the recent window and the furthest page reached.
+    """
+    sessions: int = 0
+    minutes: int = 0
+    pages: float = 0
+    days: dict = field(default_factory=dict)
+
+    def add_day(self, ordinal: int, day: list, sign: int = 1) -> None:
+        self.sessions += sign * day[0]
+        self.minutes += sign * day[1]
+        self.pages += sign * day[2]
+        if sign > 0:
+            self.days[ordinal] = day
+        else:
+            self.days.pop(ordinal, None)
+
+    @property
+    def furthest_page(self) -> float:
+        return max((day[3] for day in self.days.values()), default=0)
+
+    def pages_between(self, first: int, last: int) -> float:
+        return sum(day[2] for ordinal, day in self.days.items() if first <= ordinal <= last)
+
+
+class ReadingForecast:
+    """
+    Reading pace of every book outside the Qur'an subjects, and when a book with a
+    known page count should be finished at that pace.
+
+    Built once from the days in Statistics that have such entries, and kept current
+    as a DataManager listener: a changed day takes its old sums out of its books and
+    puts the new ones in, so a new entry costs the same however long the log is.
+    """
+    RECENT_DAYS = 30
+    QURAN_SUBJECTS = ("Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)")
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.sizes = data_manager.book_sizes
+        self.paces = {}  # (subject, book) -> BookPace
+        self.day_books = {}  # date -> {(subject, book): [sessions, minutes, pages, furthest page]}
+        self.built = False
+
+    @staticmethod
+    def last_page(pages) -> float:
+        """The furthest page in a "Page" value such as '12 - 30'."""
+        numbers = [float(number) for number in re.findall(r"\d+(?:\.\d+)?", str(pages))]
+        return max(numbers, default=0)
+
+    def sums_of(self, date: str) -> dict:
+        books = {}
+        for subject, subject_books in self.data.entry_log.get(date, {}).items():
+            if subject in self.QURAN_SUBJECTS:
+                continue
+            for book, sessions in subject_books.items():
+                day = books.setdefault((subject, book), [0, 0, 0, 0])
+                for details in sessions.values():
+                    day[0] += 1
+                    day[1] += CoreHelpers.convert_time_to_mins(details.get("Time Spent", ""))
+                    day[2] += details.get("Total Pages", 0)
+                    day[3] = max(day[3], self.last_page(details.get("Page", "")))
+        return books
+
+    def build(self) -> None:
+        self.paces = {}
+        self.day_books = {}
+        dates = {date for subject, books in self.data.stats.items() if subject not in self.QURAN_SUBJECTS
+                 for record in books.values() for date in record.entry_dates}
+        for date in dates:
+            self.put_day(date, self.sums_of(date))
+        if self not in self.data.listeners:
+            self.data.listeners.append(self)
+        self.built = True
+
+    def put_day(self, date: str, books: dict) -> None:
+        ordinal = DateManager.date_to_ordinal(date)
+        for key, day in self.day_books.pop(date, {}).items():
+            self.paces[key].add_day(ordinal, day, -1)
+            if not self.paces[key].days:
+                del self.paces[key]
+        for key, day in books.items():
+            self.paces.setdefault(key, BookPace()).add_day(ordinal, day)
+        if books:
+            self.day_books[date] = books
+
+    def on_day_changed(self, date: str) -> None:
+        if self.built:
+            self.put_day(date, self.sums_of(date))
+
+    def on_clear(self) -> None:
+        self.paces = {}
+        self.day_books = {}
+
+    def reset(self) -> None:
+        """Build again on next use, e.g. after a restore replaced the data."""
+        self.built = False
+
+    def forecast(self, subject: str, book: str) -> dict:
+        """Pace of one book, and its expected finishing date if its page count is known (else "Finish Date" is None)."""
+        if not self.built:
+            self.build()
+        pace = self.paces.get((subject, book), BookPace())
+        today = DateManager.date_to_ordinal(DateManager.get_date_today())
+        first_day = min(pace.days, default=today)
+        overall_per_day = pace.pages / (today - first_day + 1)
+        recent_per_day = pace.pages_between(today - self.RECENT_DAYS + 1, today) / self.RECENT_DAYS
+        page_count = self.sizes.get(subject, book)
+        reached = pace.furthest_page or pace.pages
+        report = {
+            "Pages": pace.pages,
+            "Minutes": pace.minutes,
+            "Active Days": len(pace.days),
+            "Pages per Minute": pace.pages / pace.minutes if pace.minutes else 0,
+            "Pages per Active Day": pace.pages / len(pace.days) if pace.days else 0,
+            "Pages per Day (Recent)": recent_per_day,
+            "Trend": recent_per_day / overall_per_day if overall_per_day else 0,
+            "Page Count": page_count,
+            "Pages Left": max(page_count - reached, 0) if page_count else None,
+            "Finish Date": None
+        }
+        per_day = recent_per_day or overall_per_day
+        if page_count and (reached >= page_count or per_day):
+            days_left = ceil((page_count - reached) / per_day) if reached < page_count else 0
+            report["Finish Date"] = DateManager.ordinal_to_date(today + days_left)
+        return report
+
+    def get_summary(self, subject: str, book: str) -> str:
+        report = self.forecast(subject, book)
+        lines = [
+            f"Pages read: {report['Pages']:g} in {report['Active Days']} day(s)",
+            f"Pages per minute: {report['Pages per Minute']:.2f}",
+            f"Pages per active day: {report['Pages per Active Day']:.1f}",
+            f"Last {self.RECENT_DAYS} days: {report['Pages per Day (Recent)']:.1f} page(s) a day "
+            f"({report['Trend']:.0%} of your usual pace)"
+        ]
+        if not report["Page Count"]:
+            lines.append("Set the book's page count to see when you will finish it.")
+        elif report["Finish Date"] is None:
+            lines.append(f"{report['Pages Left']:g} page(s) left; no pace to forecast from yet.")
+        elif not report["Pages Left"]:
+            lines.append("Finished!")
+        else:
+            lines.append(f"{report['Pages Left']:g} page(s) left; expected to finish on {report['Finish Date']}")
+        return "\n".join(lines)
@@ -0,0 +1,106 @@
+import re, zipfile
+from core.core_services import DateManager
+from core.lazy_json import JsonStreamReader
+from core.backup_repository import BackupRepository
+
+
+class RestoreCancelled(Exception):
+    pass
+
+
+class RestoreService:
+    """
+    Restores a backup zip or a repository snapshot.
+
+    The backup is read day by day and every day is checked as it comes in; the same
+    pass rebuilds All Time Subjects and Statistics through StatsManager. Nothing
+    live is touched until the whole backup has been read, and then everything is
+    swapped in at once, so a bad or cancelled restore leaves the current data as it was.
+    """
+
+    TIME_SPENT = re.compile(r"^(\d+ hr\(s\))? ?(\d+ min\(s\))?$")  # As CoreHelpers.format_time writes it
+
+    def __init__(self, data_manager, stats_manager) -> None:
+        self.data = data_manager
+        self.stats = stats_manager
+
+    @staticmethod
+    def read_zip(zip_path: str):
+        """Yield (section, date, value, bytes read, total bytes) from the zip without extracting the member."""
+        with zipfile.ZipFile(zip_path, "r") as zipf:
+            info = zipf.getinfo("learning_data.json")
+            with zipf.open(info) as stream:
+                reader = JsonStreamReader(stream)
+                for section, date, value in reader.items():
+                    yield section, date, value, reader.bytes_read, info.file_size
+
+    @classmethod
+    def validate_day(cls, date: str, progress_date) -> None:
+        try:
+            DateManager.date_to_ordinal(date)
+        except (TypeError, ValueError):
+            raise ValueError(f"\"{date}\" is not a valid date.")
+        if not isinstance(progress_date, dict):
+            raise ValueError(f"Entries of {date} are not readable.")
+        for subject, books in progress_date.items():
+            if not isinstance(books, dict):
+                raise ValueError(f"Entries of {date} ({subject}) are not readable.")
+            for book, sessions in books.items():
+                if not isinstance(sessions, dict):
+                    raise ValueError(f"Entries of {date} ({subject} / {book}) are not readable.")
+                for session, details in sessions.items():
+                    where = f"{date}, {book}, {session}"
+                    if not isinstance(details, dict):
+                        raise ValueError(f"Entry {where} is not readable.")
+                    pages = details.get("Total Pages")
+                    if isinstance(pages, bool) or not isinstance(pages, (int, float)) or pages < 0:
+                        raise ValueError(f"Entry {where} has no valid \"Total Pages\".")
+                    time_spent = details.get("Time Spent")
+                    if not isinstance(time_spent, str) or not time_spent.strip() or not cls.TIME_SPENT.match(time_spent):
+                        raise ValueError(f"Entry {where} has no valid \"Time Spent\".")
+
+    def restore(self, path: str, snapshot: str = None, progress=None) -> tuple:
+        """
+        Restore from a zip, or from a snapshot (the newest by default) when `path` is a backup
+        repository. `progress(done, total)` is called as the backup is read; returning False cancels.
+        """
+        if BackupRepository.is_repository(path):
+            source = BackupRepository(path).iter_snapshot(snapshot)
+        else:
+            source = self.read_zip(path)
+        entry_log = {}
+        other_sections = {}
+
+        def days():
+            for section, date, value, done, total in source:
+                if section == "Entry Log":
+                    if date in entry_log:
+                        raise ValueError(f"{date} appears more than once.")
+                    self.validate_day(date, value)
+                    entry_log[date] = value
+                    yield date, value
+                else:
+                    other_sections[section] = value
+                if progress is not None and progress(done, total) is False:
+                    raise RestoreCancelled()
+
+        try:
+            all_time_subjects, stats = self.stats.rebuild_from_days(days())
+        except RestoreCancelled:
+            return False, "Restoration cancelled. Your data has not been changed."
+        except zipfile.BadZipFile as e:
+            return False, f"Invalid ZIP file: {e}"
+        except (KeyError, OSError):
+            return False, "Backup archive does not contain valid data."
+        except ValueError as e:
+            return False, f"Data Corrupted: {e}"
+        if not entry_log and not other_sections:
+            return False, "Backup file is empty."
+
+        result = self.data.replace_data({
+            "Entry Log": entry_log,
+            "All Time Subjects": all_time_subjects,
+            "Statistics": stats
+        })
+        self.stats.on_data_replaced()
+        return result
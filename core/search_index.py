@@ -0,0 +1,145 @@
+import re
+from math import log
+from heapq import nlargest
+from bisect import bisect_left, insort
+from core.core_services import DateManager
+
+
+class SearchIndex:
+    """
+    Full-text index of every session: the words of its subject, book, "Chapter",
+    "Notes" and "Revision", each pointing to the sessions that use them.
+
+        postings   word -> {session id: weight}
+        words      sorted list of every word, so a query word also finds longer
+                   words starting with it ("tafs" finds "tafseer")
+        day_ids    date -> ids of that day's sessions
+
+    Built the first time a search is made, then kept current as a DataManager
+    listener: a changed day has its sessions taken out and put back, so adding or
+    editing an entry costs as much as the sessions of that day. A restore, which
+    swaps in a new Entry Log, is noticed and the index is built again.
+    """
+    FIELDS = {"Chapter": 2, "Notes": 1, "Revision": 1}  # Field -> weight of its words; book names weigh 2, subjects 1
+    SKIPPED_VALUES = ("", "N/A", "No")
+    WORD = re.compile(r"\w+")
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.entry_log = None
+        self.clear()
+
+    def clear(self) -> None:
+        self.postings = {}
+        self.words = []
+        self.keys = {}  # id -> (date, subject, book, session)
+        self.ordinals = {}  # id -> date ordinal, to put recent sessions first
+        self.doc_words = {}  # id -> {word: weight}
+        self.day_ids = {}
+        self.next_id = 0
+
+    @classmethod
+    def tokenize(cls, text) -> list:
+        return cls.WORD.findall(str(text).lower())
+
+    @classmethod
+    def weigh_words(cls, subject: str, book: str, details: dict) -> dict:
+        weights = {}
+        fields = [(subject, 1), (book, 2)]
+        fields += [(details.get(field, ""), weight) for field, weight in cls.FIELDS.items()]
+        for text, weight in fields:
+            if text in cls.SKIPPED_VALUES:
+                continue
+            for word in cls.tokenize(text):
+                weights[word] = weights.get(word, 0) + weight
+        return weights
+
+    def add_session(self, date: str, subject: str, book: str, session: str, details: dict, ordinal: int) -> None:
+        doc_id = self.next_id
+        self.next_id += 1
+        self.keys[doc_id] = (date, subject, book, session)
+        self.ordinals[doc_id] = ordinal
+        self.day_ids.setdefault(date, set()).add(doc_id)
+        self.doc_words[doc_id] = self.weigh_words(subject, book, details)
+        for word, weight in self.doc_words[doc_id].items():
+            if word not in self.postings:
+                self.postings[word] = {}
+                insort(self.words, word)
+            self.postings[word][doc_id] = weight
+
+    def remove_session(self, doc_id: int) -> None:
+        del self.keys[doc_id], self.ordinals[doc_id]
+        for word in self.doc_words.pop(doc_id):
+            del self.postings[word][doc_id]
+            if not self.postings[word]:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def add_day(self, date: str) -> None:
+        progress_date = self.entry_log.get(date, {})
+        ordinal = DateManager.date_to_ordinal(date) if progress_date else None
+        for subject, books in progress_date.items():
+            for book, sessions in books.items():
+                for session, details in sessions.items():
+                    self.add_session(date, subject, book, session, details, ordinal)
+
+    def build(self) -> None:
+        self.clear()
+        self.entry_log = self.data.entry_log
+        for date in list(self.entry_log):
+            self.add_day(date)
+        if self not in self.data.listeners:
+            self.data.listeners.append(self)
+
+    def on_day_changed(self, date: str) -> None:
+        if self.entry_log is not self.data.entry_log:
+            return  # Not built yet, or built from data a restore has replaced; the next search builds it
+        for doc_id in self.day_ids.pop(date, ()):
+            self.remove_session(doc_id)
+        self.add_day(date)
+
+    def on_clear(self) -> None:
+        self.clear()
+
+    def matching(self, query_word: str) -> dict:
+        """Session id -> weight, over every indexed word starting with `query_word`."""
+        matches = {}
+        for i in range(bisect_left(self.words, query_word), len(self.words)):
+            word = self.words[i]
+            if not word.startswith(query_word):
+                break
+            exact = 1 if word == query_word else 0.5  # Whole words rank above prefixes
+            for doc_id, weight in self.postings[word].items():
+                matches[doc_id] = max(matches.get(doc_id, 0), weight * exact)
+        return matches
+
+    def scores(self, query: str) -> dict:
+        """Session id -> score, for the sessions containing every word of `query` (as a word or the start of one)."""
+        if self.entry_log is not self.data.entry_log:
+            self.build()
+        query_words = list(dict.fromkeys(self.tokenize(query)))
+        if not query_words:
+            return {}
+        matches = sorted((self.matching(word) for word in query_words), key=len)
+        total = len(self.keys)
+        scores = {doc_id: 0.0 for doc_id in matches[0]}
+        for word_matches in matches:
+            idf = log(1 + total / len(word_matches)) if word_matches else 0
+            scores = {doc_id: score + word_matches[doc_id] * idf
+                      for doc_id, score in scores.items() if doc_id in word_matches}
+            if not scores:
+                return {}
+        return scores
+
+    def search(self, query: str, limit: int = 50) -> list:
+        """
+        Sessions matching `query`, best first: (score, date, subject, book, session).
+        Rarer words count for more, and of equal scores the more recent session comes first.
+        """
+        scores = self.scores(query)
+        ranked = nlargest(limit, scores, key=lambda doc_id: (scores[doc_id], self.ordinals[doc_id]))
+        return [(round(scores[doc_id], 3),) + self.keys[doc_id] for doc_id in ranked]
+
+    def matching_keys(self, query: str) -> list:
+        """(ordinal, date, subject, book, session) of every session matching `query`, oldest first."""
+        return sorted((self.ordinals[doc_id],) + self.keys[doc_id] for doc_id in self.scores(query))
@@ -0,0 +1,196 @@
+from array import array
+from collections import Counter
+from core.core_services import DateManager, CoreHelpers
+
+try:
+    import numpy as np
+except ImportError:  # The plain loops below give the same results, just more slowly
+    np = None
+
+
+class SessionTable:
+    """
+    Every session of the Entry Log as a row in a set of columns, next to the nested dicts:
+
+        day      date ordinal
+        subject  subject id
+        book     book id (one per subject/book pair)
+        minutes  "Time Spent" in whole minutes
+        pages    "Total Pages"
+
+    Strings are parsed once, when a row is added, and totals are group-bys over the
+    columns (with NumPy when it is installed). A day becomes part of the table the
+    first time something asks for it, so a lazily loaded log is not read in full just
+    to show the last week. DataManager keeps the rows in step with adds, edits and deletes.
+
+    Listeners (e.g. DayRollup) are told about every row that is added or removed
+    through on_row(ordinal, subject, book, minutes, pages, +1 or -1), and about
+    clear() through on_clear().
+    """
+
+    def __init__(self, entry_log, day_index) -> None:
+        self.entry_log = entry_log
+        self.day_index = day_index  # DayIndex of the same log, to find the days of a range that have entries
+        self.subject_names = []
+        self.subject_ids = {}
+        self.book_keys = []  # (subject, book) of each book id
+        self.book_ids = {}
+        self.day = array("i")
+        self.subject = array("i")
+        self.book = array("i")
+        self.minutes = array("q")
+        self.pages = array("d")
+        self.keys = []  # (date, subject, book, session) of each row
+        self.rows = {}
+        self.day_rows = {}  # ordinal -> rows of that day
+        self.covered = set()
+        self.all_covered = False
+        self.listeners = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def subject_id(self, subject: str) -> int:
+        if subject not in self.subject_ids:
+            self.subject_ids[subject] = len(self.subject_names)
+            self.subject_names.append(subject)
+        return self.subject_ids[subject]
+
+    def book_id(self, subject: str, book: str) -> int:
+        if (subject, book) not in self.book_ids:
+            self.book_ids[(subject, book)] = len(self.book_keys)
+            self.book_keys.append((subject, book))
+        return self.book_ids[(subject, book)]
+
+    def is_covered(self, date: str) -> bool:
+        return self.all_covered or date in self.covered
+
+    def cover(self, dates) -> None:
+        """Make sure the given days are in the table."""
+        for date in dates:
+            if self.is_covered(date):
+                continue
+            self.covered.add(date)
+            progress_date = self.entry_log.get(date)
+            if not progress_date:
+                continue
+            ordinal = DateManager.date_to_ordinal(date)
+            for subject, books in progress_date.items():
+                for book, sessions in books.items():
+                    for session, details in sessions.items():
+                        self.append_row(date, subject, book, session, details, ordinal)
+
+    def cover_all(self) -> None:
+        if not self.all_covered:
+            self.cover(list(self.entry_log))
+            self.all_covered = True
+            self.covered = set()
+
+    def append_row(self, date: str, subject: str, book: str, session: str, details: dict, ordinal: int = None) -> None:
+        key = (date, subject, book, session)
+        if ordinal is None:
+            ordinal = DateManager.date_to_ordinal(date)
+        self.rows[key] = len(self.keys)
+        self.day_rows.setdefault(ordinal, set()).add(len(self.keys))
+        self.keys.append(key)
+        self.day.append(ordinal)
+        self.subject.append(self.subject_id(subject))
+        self.book.append(self.book_id(subject, book))
+        self.minutes.append(CoreHelpers.convert_time_to_mins(details["Time Spent"]))
+        self.pages.append(details["Total Pages"])
+        for listener in self.listeners:
+            listener.on_row(ordinal, subject, book, self.minutes[-1], self.pages[-1], 1)
+
+    def remove_row(self, key: tuple) -> None:
+        """Fill the row's place with the last row, so removing never shifts the columns."""
+        row = self.rows.pop(key)
+        for listener in self.listeners:
+            listener.on_row(self.day[row], key[1], key[2], self.minutes[row], self.pages[row], -1)
+        last = len(self.keys) - 1
+        self.day_rows[self.day[row]].discard(row)
+        if not self.day_rows[self.day[row]]:
+            del self.day_rows[self.day[row]]
+        if row != last:
+            last_key = self.keys[last]
+            self.keys[row] = last_key
+            self.rows[last_key] = row
+            self.day_rows[self.day[last]].discard(last)
+            self.day_rows[self.day[last]].add(row)
+            for column in (self.day, self.subject, self.book, self.minutes, self.pages):
+                column[row] = column[last]
+        self.keys.pop()
+        for column in (self.day, self.subject, self.book, self.minutes, self.pages):
+            column.pop()
+
+    def add(self, date: str, subject: str, book: str, session: str, details: dict) -> None:
+        if self.is_covered(date):
+            self.append_row(date, subject, book, session, details)
+
+    def remove(self, date: str, subject: str, book: str, session: str) -> None:
+        if (date, subject, book, session) in self.rows:
+            self.remove_row((date, subject, book, session))
+
+    def remove_day(self, date: str) -> None:
+        ordinal = DateManager.date_to_ordinal(date)
+        while ordinal in self.day_rows:  # Removing a row can move another row of the same day
+            self.remove_row(self.keys[next(iter(self.day_rows[ordinal]))])
+        self.covered.discard(date)
+
+    def clear(self) -> None:
+        """Every entry was deleted: the (empty) log is fully covered."""
+        listeners = self.listeners
+        self.__init__(self.entry_log, self.day_index)
+        self.listeners = listeners
+        self.all_covered = True
+        for listener in self.listeners:
+            listener.on_clear()
+
+    @staticmethod
+    def as_number(value: float):
+        return int(value) if value == int(value) else value
+
+    def book_totals(self) -> dict:
+        """(subject, book) -> [total entries, minutes, pages, {entry date ordinal: sessions} in date order] over the covered days."""
+        books = len(self.book_keys)
+        if np is not None and self.keys:
+            book = np.frombuffer(self.book, dtype=np.int32)
+            counts = np.bincount(book, minlength=books)
+            minutes = np.bincount(book, weights=np.frombuffer(self.minutes, dtype=np.int64), minlength=books)
+            pages = np.bincount(book, weights=np.frombuffer(self.pages, dtype=np.float64), minlength=books)
+            pairs, sessions = np.unique(book.astype(np.int64) << 32 | np.frombuffer(self.day, dtype=np.int32), return_counts=True)
+            dates = {}
+            for pair, day_sessions in zip(pairs.tolist(), sessions.tolist()):
+                dates.setdefault(pair >> 32, {})[pair & 0xFFFFFFFF] = day_sessions
+            counts, minutes, pages = counts.tolist(), minutes.tolist(), pages.tolist()
+        else:
+            counts, minutes, pages = [0] * books, [0] * books, [0] * books
+            pairs = Counter()
+            for book, day, row_minutes, row_pages in zip(self.book, self.day, self.minutes, self.pages):
+                counts[book] += 1
+                minutes[book] += row_minutes
+                pages[book] += row_pages
+                pairs[(book, day)] += 1
+            dates = {}
+            for book, day in sorted(pairs):
+                dates.setdefault(book, {})[day] = pairs[(book, day)]
+        return {self.book_keys[book]: [counts[book], int(minutes[book]), self.as_number(pages[book]), dates[book]]
+                for book in range(books) if counts[book]}
+
+    def day_totals(self, first: int, last: int) -> list:
+        """[entries, minutes, pages] of every day from ordinal `first` to `last`, covering those days first."""
+        self.cover(self.day_index.between(first, last))
+        rows = sorted(row for ordinal in range(first, last + 1) for row in self.day_rows.get(ordinal, ()))
+        days = last - first + 1
+        if np is not None and rows:
+            rows = np.array(rows, dtype=np.intp)
+            day = np.frombuffer(self.day, dtype=np.int32)[rows] - first
+            counts = np.bincount(day, minlength=days).tolist()
+            minutes = np.bincount(day, weights=np.frombuffer(self.minutes, dtype=np.int64)[rows], minlength=days).tolist()
+            pages = np.bincount(day, weights=np.frombuffer(self.pages, dtype=np.float64)[rows], minlength=days).tolist()
+        else:
+            counts, minutes, pages = [0] * days, [0] * days, [0] * days
+            for row in rows:
+                counts[self.day[row] - first] += 1
+                minutes[self.day[row] - first] += self.minutes[row]
+                pages[self.day[row] - first] += self.pages[row]
+        return [[counts[i], int(minutes[i]), self.as_number(pages[i])] for i in range(days)]
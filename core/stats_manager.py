@@ -1,5 +1,12 @@
+import datetime
+from copy import deepcopy
 from core.data_manager import DataManager
 from core.core_services import DateManager, CoreHelpers
+from core.book_stats import BookStats, EntryDates
+from core.day_rollup import DayRollup
+from core.streaks import StreakEngine
+from core.quran_coverage import QuranCoverage
+from core.reading_forecast import ReadingForecast
 
 
 class StatsAggregator:
@@ -15,75 +22,83 @@ class StatsAggregator:
             self.stats_today = (0, 0, 0)
 
     def calculate_all_time_stats(self):
+        stored_stats = self.data.get_stored_stats()
+        if stored_stats is not None:
+            self.data.update_stats(stored_stats)
+            return
+        self.data.sessions.cover_all()
         all_time_stats = {}
-        for date, progress_date in self.data.entry_log.items():
-            for subject, progress_subject in progress_date.items():
-                for book, progress_book in progress_subject.items():
-                    CoreHelpers.set_defaults_for_stats(all_time_stats, subject, book)    
-                    all_time_stats[subject][book].setdefault("Minutes", 0)
-                    all_time_stats[subject][book]["Total Entries"] += len(progress_book)
-                    all_time_stats[subject][book]["Entry Dates"].append(date)
-                    for _, progress_entry in progress_book.items():
-                        all_time_stats[subject][book]["Minutes"] += CoreHelpers.convert_time_to_mins(progress_entry["Time Spent"])
-                        all_time_stats[subject][book]["Pages"] += progress_entry["Total Pages"]
+        for (subject, book), (total_entries, minutes, pages, days) in self.data.sessions.book_totals().items():
+            all_time_stats.setdefault(subject, {})[book] = BookStats(
+                pages, minutes, total_entries, EntryDates({DateManager.ordinal_to_date(day): sessions for day, sessions in days.items()}))
+        self.data.update_stats(self.finish_stats(all_time_stats))
+
+    @staticmethod
+    def add_day_to_stats(all_time_stats: dict, date: str, progress_date: dict) -> None:
+        for subject, progress_subject in progress_date.items():
+            for book, progress_book in progress_subject.items():
+                record = all_time_stats.setdefault(subject, {}).setdefault(book, BookStats())
+                record.total_entries += len(progress_book)
+                record.entry_dates.add(date, len(progress_book))
+                for _, progress_entry in progress_book.items():
+                    record.minutes += CoreHelpers.convert_time_to_mins(progress_entry["Time Spent"])
+                    record.pages += progress_entry["Total Pages"]
+
+    @staticmethod
+    def finish_stats(all_time_stats: dict) -> dict:
         all_time_stats = CoreHelpers.dict_sort(all_time_stats)
-        for subject, dict_subject in all_time_stats.items():
+        for subject in all_time_stats:
             all_time_stats[subject] = CoreHelpers.dict_sort(all_time_stats[subject])
-            for book, dict_book in all_time_stats[subject].items():
-                dict_book["Time Spent"] = CoreHelpers.format_time(dict_book["Minutes"])
-                dict_book.pop("Minutes")
-        self.data.update_stats(all_time_stats)
+        return all_time_stats
 
     def get_entries_mins_pages(self, date: str):
-        total_minutes = 0
-        total_pages = 0
-        total_entries = 0
-        for subject, dict_subject in self.data.entry_log[date].items():
-            for book, book_entry in dict_subject.items():
-                total_entries += len(book_entry)
-                for session, session_entry in book_entry.items():
-                    time_spent, entry_pages = session_entry["Time Spent"], session_entry["Total Pages"]
-                    total_minutes += CoreHelpers.convert_time_to_mins(time_spent)
-                    total_pages += entry_pages
-        return (total_entries, total_minutes, total_pages)
+        ordinal = DateManager.date_to_ordinal(date)
+        return tuple(self.data.sessions.day_totals(ordinal, ordinal)[0])
 
 
 class StatsUpdater:
     def __init__(self, data_manager: DataManager) -> None:
         self.data = data_manager
 
+    def get_record(self, subject: str, book: str) -> BookStats:
+        """The book's record, added (in sorted place) if the book is new."""
+        if book not in self.data.stats.get(subject, {}):
+            self.data.stats.setdefault(subject, {})[book] = BookStats()
+            self.data.stats = CoreHelpers.dict_sort(self.data.stats)
+            self.data.stats[subject] = CoreHelpers.dict_sort(self.data.stats[subject])
+        return self.data.stats[subject][book]
+
+    def known_dates(self, subject: str, book: str, date: str):
+        """The book's Entry Dates, with the session count of `date` filled in from the day if it was not known."""
+        entry_dates = self.data.stats[subject][book].entry_dates
+        if entry_dates.count(date) is None:
+            entry_dates.set_count(date, len(self.data.entry_log.get(date, {}).get(subject, {}).get(book, {})))
+        return entry_dates
+
     def add_stats(self, entry):
-        subject = entry.subject
-        book = entry.book
+        """Called once the entry is in today's log."""
         entry_dict = entry.to_dict()
-        CoreHelpers.set_defaults_for_stats(self.data.stats, subject, book)
-        self.data.stats = CoreHelpers.dict_sort(self.data.stats)
-        self.data.stats[subject] = CoreHelpers.dict_sort(self.data.stats[subject])
-
-        self.data.stats[subject][book]["Total Entries"] += 1
-
-        if self.data.date_today not in self.data.stats[subject][book]["Entry Dates"]:
-            self.data.stats[subject][book]["Entry Dates"].append(self.data.date_today)
-            
-        self.data.stats[subject][book]["Pages"] += entry_dict["Total Pages"]
-
-        all_time_minutes = CoreHelpers.convert_time_to_mins(self.data.stats[subject][book]["Time Spent"])
-        entry_minutes = CoreHelpers.convert_time_to_mins(entry_dict["Time Spent"])
-        self.data.stats[subject][book]["Time Spent"] = CoreHelpers.format_time(all_time_minutes + entry_minutes)
+        record = self.get_record(entry.subject, entry.book)
+        record.total_entries += 1
+        if record.entry_dates.count(self.data.date_today) is None:
+            self.known_dates(entry.subject, entry.book, self.data.date_today)  # The count read from the day includes this entry
+        else:
+            record.entry_dates.add(self.data.date_today)
+        record.pages += entry_dict["Total Pages"]
+        record.minutes += CoreHelpers.convert_time_to_mins(entry_dict["Time Spent"])
 
     def update_entry_pages(self, details, entry_pages, add = False):
         if add:
-            self.data.stats[details[0]][details[1]]["Pages"] += entry_pages
+            self.data.stats[details[0]][details[1]].pages += entry_pages
         else:
-            self.data.stats[details[0]][details[1]]["Pages"] -= entry_pages
+            self.data.stats[details[0]][details[1]].pages -= entry_pages
 
     def update_entry_minutes(self, details, entry_time_spent, add = False):
-        temp_total_minutes = CoreHelpers.convert_time_to_mins(self.data.stats[details[0]][details[1]]["Time Spent"])
+        entry_minutes = CoreHelpers.convert_time_to_mins(entry_time_spent)
         if add:
-            temp_total_minutes += CoreHelpers.convert_time_to_mins(entry_time_spent)
+            self.data.stats[details[0]][details[1]].minutes += entry_minutes
         else:
-            temp_total_minutes -= CoreHelpers.convert_time_to_mins(entry_time_spent)
-        self.data.stats[details[0]][details[1]]["Time Spent"] = CoreHelpers.format_time(temp_total_minutes)
+            self.data.stats[details[0]][details[1]].minutes -= entry_minutes
 
     def update_stats(self, details: tuple, values: tuple, field: str="", date: str=""):
         """ details contains: subject and book
@@ -101,78 +116,118 @@ class StatsUpdater:
         else: # No field arg means entry has been deleted
             self.update_entry_pages(details, values[0])
             self.update_entry_minutes(details, values[1])
-            self.data.stats[details[0]][details[1]]["Total Entries"] -= 1
-            if len(self.data.entry_log[date][details[0]][details[1]]) <= 1:
-                self.data.stats[details[0]][details[1]]["Entry Dates"].remove(date)
+            self.data.stats[details[0]][details[1]].total_entries -= 1
+            self.known_dates(details[0], details[1], date).remove(date)
 
     def delete_stats(self, day: str):
         for subject, subject_entries in self.data.entry_log[day].items():
             for book, book_entries in subject_entries.items():
-                if day in self.data.stats[subject][book]["Entry Dates"]:
-                    self.data.stats[subject][book]["Entry Dates"].remove(day)
-                    self.data.stats[subject][book]["Total Entries"] -= len(book_entries)
+                if day in self.data.stats[subject][book].entry_dates:
+                    self.data.stats[subject][book].entry_dates.discard(day)
+                    self.data.stats[subject][book].total_entries -= len(book_entries)
                     for entry_details in book_entries.values():
-                        self.update_entry_pages(self.data.stats, (subject, book), entry_details["Total Pages"])
-                        self.update_entry_minutes(self.data.stats, (subject, book), entry_details["Time Spent"])
+                        self.update_entry_pages((subject, book), entry_details["Total Pages"])
+                        self.update_entry_minutes((subject, book), entry_details["Time Spent"])
     
-    def change_subject(self, book: str, old_subject: str, new_subject: str):
-        """This method can be used to change the subject of a book"""
-
-        for date, progress_date in self.data.entry_log.items():
-
-            if old_subject not in progress_date:
-                continue
-            if book not in progress_date[old_subject]:
-                continue
-
-            progress_date.setdefault(new_subject, {})
-            progress_date[new_subject][book] = progress_date[old_subject][book]
-            progress_date[old_subject].pop(book)
-
+    def change_subject(self, book: str, old_subject: str, new_subject: str) -> tuple:
+        """
+        Move every session of a book to another subject, along with its statistics.
+        Only the days the book was read on are visited (from DataManager.book_index),
+        and each is recorded as an edited day. The autosave worker is not told here:
+        StatsManager.change_subject does that once the subjects cache has moved too.
+
+        Refused, with nothing changed, if the book already has a session of the same
+        name under `new_subject` on one of those days.
+        """
+        if old_subject == new_subject:
+            return False, f"{book} is already under {new_subject}."
+        dates = self.data.book_index.dates_of(old_subject, book)
+        if not dates:
+            return False, f"No entries of {book} under {old_subject}."
+        clashes = [date for date in dates if set(self.data.entry_log[date][old_subject][book])
+                   & set(self.data.entry_log[date].get(new_subject, {}).get(book, {}))]
+        if clashes:
+            return False, f"{book} has sessions under both {old_subject} and {new_subject} at the same time on {', '.join(clashes)}."
+        for date in dates:
+            progress_date = deepcopy(self.data.entry_log[date])
+            sessions = progress_date[old_subject].pop(book)
             if not progress_date[old_subject]:
                 progress_date.pop(old_subject)
+            progress_date.setdefault(new_subject, {}).setdefault(book, {}).update(sessions)
+            self.data.replace_day(date, progress_date)
+
+        old_record = self.data.stats.get(old_subject, {}).pop(book, None)
+        if old_subject in self.data.stats and not self.data.stats[old_subject]:
+            del self.data.stats[old_subject]
+        if old_record is not None:
+            record = self.get_record(new_subject, book)
+            record.pages += old_record.pages
+            record.minutes += old_record.minutes
+            record.total_entries += old_record.total_entries
+            counts = {date: record.entry_dates.count(date) for date in record.entry_dates}
+            counts.update((date, len(self.data.entry_log[date][new_subject][book])) for date in dates)
+            record.entry_dates = EntryDates(dict(sorted(counts.items(), key=lambda item: DateManager.date_to_ordinal(item[0]))))
+        return True, f"{book} moved from {old_subject} to {new_subject}."
+
+
+class RollingWindowService:
+    """
+    Reports over a window of days ending at an anchor date, split into buckets of one
+    or more days: the last week day by day, the last year week by week, and so on.
+
+    Nothing is cached here. The per-day totals come from DataManager's SessionTable,
+    which adds, edits and deletes keep current, and only the window's days are read,
+    so a report is always up to date and costs the same however long the log is.
+    """
+    WINDOWS = {  # name -> (days, days per bucket)
+        "Weekly": (7, 1),
+        "Monthly": (30, 1),
+        "Yearly": (364, 7)
+    }
 
-
-class WeeklyStatsService:
     def __init__(self, stats_manager) -> None:
         self.stats = stats_manager
         self.data = self.stats.data
-        self.weekly_report = {}
-        self.weekly_entries_made = []
-        self.weekly_minutes_spent = []
-        self.weekly_pages_read = []
-        self.weekly_total_minutes = 0
-        self.weekly_total_time = 0
-
-    def compute_weekly_stats(self):
-        if not self.weekly_report:
-            self.generate_weekly_report()
-        self.weekly_dates = list(self.weekly_report.keys())
-        progress = list(self.weekly_report.values())
-
-        self.weekly_entries_made = [x for x, y, z in progress]
-        self.weekly_minutes_spent = [y for x, y, z in progress]
-        self.weekly_pages_read = [z for x, y, z in progress]
-        self.weekly_total_minutes = sum(self.weekly_minutes_spent)        
-        self.weekly_total_time = CoreHelpers.format_time(self.weekly_total_minutes)
 
-    def get_weekly_summary(self) -> str:
-        if not self.weekly_report:
-            self.compute_weekly_stats()
+    @staticmethod
+    def default_anchor() -> int:
+        """Yesterday: reports leave out today, which is still going on."""
+        return DateManager.date_to_ordinal(DateManager.get_date_today()) - 1
+
+    def report(self, days: int = 7, anchor: str = None, bucket_days: int = 1) -> dict:
+        """
+        First date of each bucket -> (entries, minutes, pages), oldest first, for the
+        `days` days up to and including `anchor` (yesterday by default).
+        """
+        last = self.default_anchor() if anchor is None else DateManager.date_to_ordinal(anchor)
+        first = last - days + 1
+        totals = self.data.sessions.day_totals(first, last)
+        report = {}
+        for offset in range(0, days, bucket_days):
+            bucket = totals[offset:offset + bucket_days]
+            pages = sum(pages for _, _, pages in bucket)
+            report[DateManager.ordinal_to_date(first + offset)] = (
+                sum(entries for entries, _, _ in bucket),
+                sum(minutes for _, minutes, _ in bucket),
+                int(pages) if pages == int(pages) else pages)
+        return report
+
+    def window_report(self, name: str, anchor: str = None) -> dict:
+        days, bucket_days = self.WINDOWS[name]
+        return self.report(days, anchor, bucket_days)
+
+    @staticmethod
+    def total_minutes(report: dict) -> int:
+        return sum(minutes for _, minutes, _ in report.values())
 
+    def get_weekly_summary(self) -> str:
+        weekly_total_minutes = self.total_minutes(self.window_report("Weekly"))
         prompts = [
-            f"\nYou spent a total of {self.weekly_total_time} on learning activities during the previous week (excluding today).\n",
+            f"\nYou spent a total of {CoreHelpers.format_time(weekly_total_minutes)} on learning activities during the previous week (excluding today).\n",
             "\nNo learning activity was recorded during the previous week (excluding today).\n"
         ]
-        index = 0 if self.weekly_total_minutes > 0 else 1
+        index = 0 if weekly_total_minutes > 0 else 1
         return prompts[index]
-
-    def generate_weekly_report(self):
-        for date in DateManager.get_last_seven_days():
-            if date in self.data.entry_log:
-                self.weekly_report[date] = self.stats.aggregator.get_entries_mins_pages(date)
-            else:
-                self.weekly_report[date] = (0, 0, 0)
     
 
 class CacheBuilder:
@@ -188,7 +243,18 @@ class CacheBuilder:
             self.data.all_time_subjects[subject].append(book_name)
             self.data.all_time_subjects[subject].sort()
 
+    def move_book(self, book: str, old_subject: str, new_subject: str) -> None:
+        if book in self.data.all_time_subjects.get(old_subject, []):
+            self.data.all_time_subjects[old_subject].remove(book)
+            if not self.data.all_time_subjects[old_subject]:
+                del self.data.all_time_subjects[old_subject]
+        self.update_on_entry(new_subject, book)
+
     def build_subjects_cache(self) -> None:
+        stored_cache = self.data.get_subjects_cache()
+        if stored_cache is not None:
+            self.data.update_cache(stored_cache)
+            return
         all_time_subjects = {}
         for data_one_day in self.data.entry_log.values():
             self.extract_subjects(data_one_day, all_time_subjects)
@@ -213,16 +279,22 @@ class StatsPlotter:
         self.stats = stats_manager
         
     def display_plot_weekly(self):
-        if not self.stats.weekly_stats.weekly_report:
-            self.stats.weekly_stats.compute_weekly_stats()
+        self.display_plot_window("Weekly")
+
+    def display_plot_window(self, name: str, anchor: str = None):
+        report = self.stats.windows.window_report(name, anchor)
+        dates = list(report)
+        minutes_spent = [minutes for _, minutes, _ in report.values()]
+        pages_read = [pages for _, _, pages in report.values()]
+        total_time = CoreHelpers.format_time(sum(minutes_spent))
         import matplotlib.pyplot as plt
-        title = "Weekly Report"
+        title = f"{name} Report"
         plt.style.use('seaborn')
         fig, ax = plt.subplots(figsize=(6, 4))
-        ax.plot(self.stats.weekly_stats.weekly_dates, self.stats.weekly_stats.weekly_minutes_spent, linewidth=3, marker='o', label='Minutes Spent')
-        ax.plot(self.stats.weekly_stats.weekly_dates, self.stats.weekly_stats.weekly_pages_read, linewidth=3, marker='o', label='Pages Read')
+        ax.plot(dates, minutes_spent, linewidth=3, marker='o', label='Minutes Spent')
+        ax.plot(dates, pages_read, linewidth=3, marker='o', label='Pages Read')
         ax.legend()
-        ax.set_title(f"{title} (Total Time: {self.stats.weekly_stats.weekly_total_time})", fontsize=15)
+        ax.set_title(f"{title} (Total Time: {total_time})", fontsize=15)
         ax.set_xlabel("Date", fontsize=14)
         ax.set_ylabel("Minutes / Pages", fontsize=14)
         ax.tick_params(axis='both', labelsize=10)
@@ -232,6 +304,69 @@ class StatsPlotter:
         plt.show(block=False)
         plt.pause(0.001)
 
+    def heatmap_grid(self, year: int):
+        """
+        Minutes of every day of `year` as a 7 x 54 grid (weekday x week, Monday on
+        top), NaN where a cell is not a day of the year. The minutes are one slice of
+        the day rollup, placed with a single NumPy scatter.
+        """
+        import numpy as np
+        first, last = datetime.date(year, 1, 1).toordinal(), datetime.date(year, 12, 31).toordinal()
+        minutes = np.frombuffer(self.stats.day_rollup.daily_minutes(first, last), dtype=np.int64)
+        cells = np.arange(len(minutes)) + datetime.date(year, 1, 1).weekday()
+        grid = np.full((7, 54), np.nan)
+        grid[cells % 7, cells // 7] = minutes
+        return grid
+
+    def heatmap_years(self) -> list:
+        this_year = datetime.date.today().year
+        first_day = self.stats.day_rollup.first_day()
+        first_year = this_year if first_day is None else datetime.date.fromordinal(first_day).year
+        return list(range(first_year, this_year + 1))
+
+    def draw_heatmap(self, fig, years: list) -> None:
+        import numpy as np
+        from matplotlib.colors import ListedColormap
+        grids = [self.heatmap_grid(year) for year in years]
+        top = max((np.nanmax(grid) for grid in grids), default=0) or 1
+        for row, (year, grid) in enumerate(zip(years, grids), start=1):
+            ax = fig.add_subplot(len(years), 1, row)
+            ax.imshow(np.ma.masked_invalid(grid * 0), cmap=ListedColormap(["#ebedf0"]), aspect="equal")  # Days without activity
+            image = ax.imshow(np.ma.masked_less_equal(np.nan_to_num(grid), 0), cmap="Greens", vmin=0, vmax=top, aspect="equal")
+            offset = datetime.date(year, 1, 1).weekday()
+            ax.set_xticks([(datetime.date(year, month, 1).toordinal() - datetime.date(year, 1, 1).toordinal() + offset) // 7 for month in range(1, 13)])
+            ax.set_xticklabels(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], fontsize=8)
+            ax.set_yticks([0, 2, 4, 6])
+            ax.set_yticklabels(["Mon", "Wed", "Fri", "Sun"], fontsize=8)
+            ax.set_ylabel(str(year), fontsize=11)
+            ax.tick_params(length=0)
+            for side in ax.spines.values():
+                side.set_visible(False)
+        fig.colorbar(image, ax=fig.axes, orientation="horizontal", fraction=0.04, label="Minutes per day")
+        fig.suptitle("Learning Activity", fontsize=15)
+
+    def display_heatmap(self, years: list = None):
+        import matplotlib.pyplot as plt
+        years = years or self.heatmap_years()
+        fig = plt.figure(figsize=(11, 1.8 * len(years) + 1.2))
+        self.draw_heatmap(fig, years)
+        plt.show(block=False)
+        plt.pause(0.001)
+
+    def export_heatmap(self, path_png: str, years: list = None):
+        """Write the heatmap to a PNG without a display (Agg canvas, pyplot is not touched)."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        years = years or self.heatmap_years()
+        fig = Figure(figsize=(11, 1.8 * len(years) + 1.2))
+        FigureCanvasAgg(fig)
+        self.draw_heatmap(fig, years)
+        try:
+            fig.savefig(path_png, dpi=120)
+            return True, f"Heatmap saved to {path_png}"
+        except OSError as e:
+            return False, str(e)
+
 
 class StatsManager:
     def __init__(self, data_manager: DataManager):
@@ -239,9 +374,50 @@ class StatsManager:
         self.updater = StatsUpdater(data_manager)
         self.aggregator = StatsAggregator(data_manager)
         self.cache_builder = CacheBuilder(data_manager)
-        self.weekly_stats = WeeklyStatsService(self)
+        self.windows = RollingWindowService(self)
         self.plotter = StatsPlotter(self)
+        self.day_rollup = DayRollup(data_manager)
+        self.streaks = StreakEngine(data_manager)
+        self.coverage = QuranCoverage(data_manager)
+        self.forecast = ReadingForecast(data_manager)
 
     def on_entry_added(self, entry):
         self.updater.add_stats(entry)
-        self.cache_builder.update_on_entry(entry.subject, entry.book)
\ No newline at end of file
+        self.cache_builder.update_on_entry(entry.subject, entry.book)
+
+    def change_subject(self, book: str, old_subject: str, new_subject: str) -> tuple:
+        result = self.updater.change_subject(book, old_subject, new_subject)
+        if result[0]:
+            self.cache_builder.move_book(book, old_subject, new_subject)
+            self.data.notify_change()
+        return result
+
+    def range_stats(self, start: str, end: str, subject: str = None, book: str = None) -> tuple:
+        """
+        (entries, minutes, pages) from `start` to `end` (both included), for everything,
+        one subject or one book. The first call builds the day rollup; after that any
+        range costs the same.
+        """
+        return self.day_rollup.totals(start, end, subject, book)
+
+    def get_weekly_summary(self) -> str:
+        return self.windows.get_weekly_summary()
+
+    def rebuild_from_days(self, days) -> tuple:
+        """
+        Build All Time Subjects and Statistics in a single pass over (date, day) pairs,
+        e.g. while a backup is being read. The live data is left alone.
+        """
+        all_time_subjects = {}
+        all_time_stats = {}
+        for date, progress_date in days:
+            StatsAggregator.add_day_to_stats(all_time_stats, date, progress_date)
+            CacheBuilder.extract_subjects(progress_date, all_time_subjects)
+        return CoreHelpers.dict_sort(all_time_subjects), StatsAggregator.finish_stats(all_time_stats)
+
+    def on_data_replaced(self):
+        """Work out today's stats, streaks, Qur'an coverage and reading pace again (after a restore); reports and range stats follow the new data by themselves."""
+        self.streaks.reset()
+        self.coverage.reset()
+        self.forecast.reset()
+        self.aggregator.calculate_stats_today()
\ No newline at end of file
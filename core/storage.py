@@ -0,0 +1,569 @@
+import os, re, json, sqlite3, threading
+from core.core_services import DateManager, CoreHelpers
+from core.entry_log import LazyEntryLog
+from core.file_manager import FileManager
+from core.lazy_json import JsonDaySource, JsonSnapshotWriter
+from core.binary_journal import BinaryJournal, BinaryDaySource
+from core.operation_log import OperationLog
+from core.fingerprint import EntryLogFingerprint, FingerprintStamp
+
+
+class StorageBackend:
+    """
+    Where DataManager keeps the journal on disk.
+
+    Changes are collected as operation records (see OperationLog). A save hands
+    the backend a SaveSnapshot: the records taken so far, together with the
+    Entry Log and the other sections as they were at that moment.
+    """
+    name = ""
+
+    def __init__(self) -> None:
+        self.pending = []
+
+    def record(self, op: str, date=None, subject: str = "", book: str = "", session: str = "", data=None) -> None:
+        self.pending.append(OperationLog.make_record(op, date, subject, book, session, data))
+
+    def take_pending(self) -> list:
+        records, self.pending = self.pending, []
+        return records
+
+    def load(self) -> dict:
+        """Return the stored sections; "Entry Log" may be a lazily loaded mapping."""
+        raise NotImplementedError
+
+    def save(self, snapshot) -> bool:
+        """Persist the snapshot's records."""
+        raise NotImplementedError
+
+    def save_all(self, snapshot) -> bool:
+        """Rewrite everything, e.g. after a restore replaced the whole log."""
+        raise NotImplementedError
+
+    def load_subjects_cache(self):
+        """All Time Subjects from an index, or None when the backend has to scan the log for it."""
+        return None
+
+    def load_stats(self):
+        """Statistics from an index, or None when the backend has to scan the log for it."""
+        return None
+
+    def load_fingerprint(self):
+        """
+        The EntryLogFingerprint of what load() returned, or None when the backend
+        does not keep one. Call it after load().
+        """
+        return None
+
+
+class JsonStorage(StorageBackend):
+    """
+    learning_data.json plus an append-only operation log that is folded into it now and then.
+
+    Days are parsed from the file only when they are first asked for.
+    """
+    name = "json"
+
+    def __init__(self, path_json: str) -> None:
+        super().__init__()
+        self.path_json = path_json
+        self.op_log = OperationLog(os.path.splitext(path_json)[0] + ".oplog")
+        self.stamp = FingerprintStamp(path_json)
+        self.fingerprint = None
+        self.source = None
+        self._compaction = None
+
+    def open_source(self):
+        return JsonDaySource(self.path_json)
+
+    def dump_snapshot(self, sections: dict, raw_day) -> tuple:
+        """Return the new file's bytes and its day index."""
+        return JsonSnapshotWriter.dumps(sections, raw_day)
+
+    def load(self) -> dict:
+        self.source = self.open_source()
+        entry_log = LazyEntryLog(self.source)
+        data = {"Entry Log": entry_log}
+        for key in self.source.sections:
+            if key != "Entry Log":
+                data[key] = self.source.load_section(key)
+        self.fingerprint = self.stamp.read()
+        if self.fingerprint is None:  # First run, or the file was written by something else
+            self.fingerprint = EntryLogFingerprint.of_entry_log(entry_log)
+            self.stamp.write(self.fingerprint)
+        for record in self.op_log.read():
+            self.fingerprint.apply_record(entry_log, record)
+            OperationLog.apply(entry_log, record)
+        return data
+
+    def load_fingerprint(self):
+        return self.fingerprint
+
+    def raw_day(self, entry_log, date: str):
+        """The day's bytes as they are on disk, if it was never loaded (and so never changed)."""
+        if getattr(entry_log, "source", None) is not self.source or entry_log.is_loaded(date):
+            return None
+        return self.source.raw_day(date)
+
+    def save(self, snapshot) -> bool:
+        """Costs the same however long the journal already is."""
+        if not self.op_log.append(snapshot.records)[0]:
+            return False
+        if self.op_log.size() >= OperationLog.COMPACT_THRESHOLD:
+            self.compact(snapshot, background=True)
+        return True
+
+    def save_all(self, snapshot) -> bool:
+        return self.compact(snapshot)
+
+    def compact(self, snapshot, background: bool = False) -> bool:
+        """
+        Fold the operation log into the main JSON file.
+
+        The snapshot is taken here, together with the log size it covers; only that
+        prefix of the log is dropped afterwards, so records appended meanwhile survive.
+        """
+        if self._compaction is not None and self._compaction.is_alive():
+            if background:
+                return True
+            self._compaction.join()
+        entry_log = snapshot.entry_log
+        data, index = self.dump_snapshot(snapshot.file_dict, lambda date: self.raw_day(entry_log, date))
+        offset = self.op_log.size()
+        if not background:
+            return self.write_snapshot(data, index, offset, snapshot.fingerprint)
+        self._compaction = threading.Thread(target=self.write_snapshot, args=(data, index, offset, snapshot.fingerprint),
+                                            daemon=True)
+        self._compaction.start()
+        return True
+
+    def write_snapshot(self, data: bytes, index: dict, log_offset: int, fingerprint=None) -> bool:
+        if not self.source.replace_file(data, index)[0]:
+            return False
+        if fingerprint is not None:
+            self.stamp.write(fingerprint)
+        self.op_log.discard_prefix(log_offset)
+        return True
+
+
+class BinaryStorage(JsonStorage):
+    """
+    The same as JsonStorage, but over the compact binary file (see BinaryJournal).
+
+    The string table only ever grows between compactions, so records of days that
+    were never loaded stay valid and are copied into the new file as they are.
+    """
+    name = "binary"
+
+    def __init__(self, path_bin: str) -> None:
+        super().__init__(path_bin)
+        self.op_log = OperationLog(f"{path_bin}.oplog")  # Kept apart from the JSON file's log
+
+    def open_source(self):
+        return BinaryDaySource(self.path_json)
+
+    def dump_snapshot(self, sections: dict, raw_day) -> tuple:
+        return BinaryJournal.dumps(sections, raw_day, self.source.table.copy()), None
+
+
+class SqliteStorage(StorageBackend):
+    """SQLite database with indexed tables for subjects, books and entries."""
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS subjects (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY,
+            subject_id INTEGER NOT NULL REFERENCES subjects(id),
+            name TEXT NOT NULL,
+            UNIQUE (subject_id, name)
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            book_id INTEGER NOT NULL REFERENCES books(id),
+            session TEXT NOT NULL,
+            minutes INTEGER NOT NULL,
+            pages NUMERIC NOT NULL,
+            data TEXT NOT NULL,
+            UNIQUE (day, book_id, session)
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_book ON entries (book_id, day);
+    """
+    QURAN_SUBJECTS = ("Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)")
+
+    def __init__(self, path_db: str) -> None:
+        super().__init__()
+        self.path_db = path_db
+        self.connection = sqlite3.connect(path_db, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def load(self) -> dict:
+        return {"Entry Log": LazyEntryLog(self)}
+
+    def load_dates(self) -> list:
+        with self.lock:
+            rows = self.connection.execute("SELECT date FROM entries GROUP BY day ORDER BY day").fetchall()
+        return [date for date, in rows]
+
+    def load_day(self, date: str) -> dict:
+        with self.lock:
+            rows = self.connection.execute(
+                """SELECT subjects.name, books.name, entries.session, entries.data
+                   FROM entries
+                   JOIN books ON books.id = entries.book_id
+                   JOIN subjects ON subjects.id = books.subject_id
+                   WHERE entries.day = ?
+                   ORDER BY entries.id""",
+                (DateManager.date_to_ordinal(date),)).fetchall()
+        day = {}
+        for subject, book, session, data in rows:
+            day.setdefault(subject, {}).setdefault(book, {})[session] = json.loads(data)
+        return day
+
+    def load_subjects_cache(self) -> dict:
+        with self.lock:
+            rows = self.connection.execute(
+                """SELECT subjects.name, books.name
+                   FROM books JOIN subjects ON subjects.id = books.subject_id
+                   WHERE EXISTS (SELECT 1 FROM entries WHERE entries.book_id = books.id)""").fetchall()
+        all_time_subjects = {}
+        for subject, book in rows:
+            if subject not in self.QURAN_SUBJECTS:
+                all_time_subjects.setdefault(subject, []).append(book)
+        for books in all_time_subjects.values():
+            books.sort()
+        return CoreHelpers.dict_sort(all_time_subjects)
+
+    def load_stats(self) -> dict:
+        with self.lock:
+            totals = self.connection.execute(
+                """SELECT books.id, subjects.name, books.name, COUNT(*), SUM(entries.minutes), SUM(entries.pages)
+                   FROM entries
+                   JOIN books ON books.id = entries.book_id
+                   JOIN subjects ON subjects.id = books.subject_id
+                   GROUP BY entries.book_id""").fetchall()
+            dates = self.connection.execute(
+                "SELECT book_id, date FROM entries GROUP BY book_id, day ORDER BY book_id, day").fetchall()
+        entry_dates = {}
+        for book_id, date in dates:
+            entry_dates.setdefault(book_id, []).append(date)
+        stats = {}
+        for book_id, subject, book, total_entries, minutes, pages in totals:
+            CoreHelpers.set_defaults_for_stats(stats, subject, book)
+            stats[subject][book]["Pages"] = int(pages) if pages == int(pages) else pages
+            stats[subject][book]["Time Spent"] = CoreHelpers.format_time(minutes)
+            stats[subject][book]["Total Entries"] = total_entries
+            stats[subject][book]["Entry Dates"] = entry_dates.get(book_id, [])
+        stats = CoreHelpers.dict_sort(stats)
+        for subject in stats:
+            stats[subject] = CoreHelpers.dict_sort(stats[subject])
+        return stats
+
+    def get_book_id(self, subject: str, book: str) -> int:
+        self.connection.execute("INSERT OR IGNORE INTO subjects (name) VALUES (?)", (subject,))
+        subject_id, = self.connection.execute("SELECT id FROM subjects WHERE name = ?", (subject,)).fetchone()
+        self.connection.execute("INSERT OR IGNORE INTO books (subject_id, name) VALUES (?, ?)", (subject_id, book))
+        book_id, = self.connection.execute(
+            "SELECT id FROM books WHERE subject_id = ? AND name = ?", (subject_id, book)).fetchone()
+        return book_id
+
+    def write_session(self, date: str, subject: str, book: str, session: str, details: dict) -> None:
+        self.connection.execute(
+            """INSERT INTO entries (date, day, book_id, session, minutes, pages, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (day, book_id, session) DO UPDATE SET
+                   minutes = excluded.minutes, pages = excluded.pages, data = excluded.data""",
+            (date, DateManager.date_to_ordinal(date), self.get_book_id(subject, book), session,
+             CoreHelpers.convert_time_to_mins(details.get("Time Spent", "")),
+             details.get("Total Pages", 0),
+             json.dumps(details, ensure_ascii=False)))
+
+    def apply_record(self, record: dict) -> None:
+        date = record["date"]
+        if record["op"] in ("add", "edit"):
+            self.write_session(date, record["subject"], record["book"], record["session"], record["data"])
+        elif date is None:
+            self.connection.execute("DELETE FROM entries")
+        elif not record["session"]:
+            self.connection.execute("DELETE FROM entries WHERE day = ?", (DateManager.date_to_ordinal(date),))
+        else:
+            self.connection.execute(
+                """DELETE FROM entries WHERE day = ? AND session = ? AND book_id = (
+                       SELECT books.id FROM books JOIN subjects ON subjects.id = books.subject_id
+                       WHERE subjects.name = ? AND books.name = ?)""",
+                (DateManager.date_to_ordinal(date), record["session"], record["subject"], record["book"]))
+
+    def save(self, snapshot) -> bool:
+        try:
+            with self.lock, self.connection:
+                for record in snapshot.records:
+                    self.apply_record(record)
+        except sqlite3.Error:
+            return False
+        return True
+
+    def write_log(self, entry_log) -> bool:
+        """Replace every stored entry with the given Entry Log, in a single transaction."""
+        try:
+            # Days not loaded yet come from this database, so read them before it is emptied
+            days = [(date, entry_log[date]) for date in entry_log]
+            with self.lock, self.connection:
+                self.connection.execute("DELETE FROM entries")
+                for date, progress_date in days:
+                    for subject, books in progress_date.items():
+                        for book, sessions in books.items():
+                            for session, details in sessions.items():
+                                self.write_session(date, subject, book, session, details)
+        except (sqlite3.Error, ValueError):
+            return False
+        return True
+
+    def save_all(self, snapshot) -> bool:
+        return self.write_log(snapshot.entry_log)
+
+
+class ShardedStorage(StorageBackend):
+    """
+    One JSON file per month in data/log/ ("2026-10.json" maps each date of that month
+    to its entries) plus manifest.json, which keeps the other sections and a rollup of
+    every month: its dates, total entries, minutes, pages and EntryLogFingerprint.
+
+    Only the current month is read at startup; an older month is read the first time
+    one of its days is asked for. Saving rewrites just the months that changed.
+    """
+    name = "sharded"
+    MANIFEST = "manifest.json"
+    SHARD_NAME = re.compile(r"^(\d{4}-\d{2})\.json$")
+
+    def __init__(self, dir_log: str) -> None:
+        super().__init__()
+        self.dir_log = dir_log
+        self.path_manifest = os.path.join(dir_log, self.MANIFEST)
+        self.lock = threading.Lock()
+        self.manifest = {"Months": {}, "Sections": {}}
+        self.shards = {}
+
+    def shard_path(self, month: str) -> str:
+        return os.path.join(self.dir_log, f"{month}.json")
+
+    @staticmethod
+    def file_signature(path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def rollup(shard: dict) -> dict:
+        total_entries = minutes = pages = 0
+        fingerprint = EntryLogFingerprint()
+        for date, progress_date in shard.items():
+            fingerprint.add_day(date, progress_date)
+            for books in progress_date.values():
+                for sessions in books.values():
+                    for details in sessions.values():
+                        total_entries += 1
+                        minutes += CoreHelpers.convert_time_to_mins(details.get("Time Spent", ""))
+                        pages += details.get("Total Pages", 0)
+        return {"Dates": list(shard), "Total Entries": total_entries, "Minutes": minutes, "Pages": pages,
+                "Fingerprint": fingerprint.to_list()}
+
+    def read_shard(self, month: str) -> dict:
+        return FileManager.load_file(self.shard_path(month))
+
+    def load(self) -> dict:
+        manifest = FileManager.load_file(self.path_manifest)
+        self.manifest = {"Months": manifest.get("Months", {}), "Sections": manifest.get("Sections", {})}
+        self.check_shards()
+        self.load_shard(DateManager.date_to_month(DateManager.get_date_today()))
+        data = {"Entry Log": LazyEntryLog(self)}
+        data.update(self.manifest["Sections"])
+        return data
+
+    def check_shards(self) -> None:
+        """Bring the manifest up to date with month files that were added, edited or removed outside the app."""
+        months = self.manifest["Months"]
+        on_disk = set()
+        if os.path.isdir(self.dir_log):
+            for file_name in os.listdir(self.dir_log):
+                match = self.SHARD_NAME.match(file_name)
+                if match:
+                    on_disk.add(match.group(1))
+        changed = False
+        for month in set(months) - on_disk:
+            del months[month]
+            changed = True
+        for month in on_disk:
+            signature = self.file_signature(self.shard_path(month))
+            rollup = months.get(month, {})
+            if rollup.get("Signature") != signature or "Fingerprint" not in rollup:
+                self.shards[month] = self.read_shard(month)
+                months[month] = dict(self.rollup(self.shards[month]), Signature=signature)
+                changed = True
+        if changed:
+            self.manifest["Months"] = dict(sorted(months.items()))
+            self.write_manifest()
+
+    def load_shard(self, month: str) -> dict:
+        with self.lock:
+            if month not in self.shards:
+                self.shards[month] = self.read_shard(month) if month in self.manifest["Months"] else {}
+            return self.shards[month]
+
+    def load_dates(self) -> list:
+        return [date for rollup in self.manifest["Months"].values() for date in rollup["Dates"]]
+
+    def load_fingerprint(self):
+        fingerprint = EntryLogFingerprint()
+        for rollup in self.manifest["Months"].values():
+            fingerprint.update(EntryLogFingerprint.from_list(rollup["Fingerprint"]))
+        return fingerprint
+
+    def load_day(self, date: str) -> dict:
+        return self.load_shard(DateManager.date_to_month(date))[date]
+
+    def write_manifest(self) -> bool:
+        os.makedirs(self.dir_log, exist_ok=True)
+        return FileManager.write_atomic(self.path_manifest, json.dumps(self.manifest, indent=4, ensure_ascii=False))[0]
+
+    def write_months(self, entry_log, dates_by_month: dict) -> bool:
+        """Rewrite the given months from the Entry Log; a month left without days loses its file."""
+        os.makedirs(self.dir_log, exist_ok=True)
+        months = self.manifest["Months"]
+        for month, dates in dates_by_month.items():
+            dates = sorted((date for date in dates if date in entry_log), key=DateManager.date_to_ordinal)
+            shard = {date: entry_log[date] for date in dates}
+            path = self.shard_path(month)
+            if not shard:
+                if os.path.exists(path):
+                    os.remove(path)
+                months.pop(month, None)
+            elif FileManager.write_atomic(path, json.dumps(shard, indent=4, ensure_ascii=False))[0]:
+                months[month] = dict(self.rollup(shard), Signature=self.file_signature(path))
+            else:
+                return False
+            with self.lock:
+                self.shards[month] = shard
+        self.manifest["Months"] = dict(sorted(months.items()))
+        return True
+
+    def write_sections(self, snapshot) -> bool:
+        self.manifest["Sections"] = {
+            "All Time Subjects": snapshot.all_time_subjects,
+            "Statistics": snapshot.stats
+        }
+        return self.write_manifest()
+
+    def save(self, snapshot) -> bool:
+        if not snapshot.records:
+            return True
+        dates_by_month = {}
+        for record in snapshot.records:
+            if record["date"] is None:
+                for month, rollup in self.manifest["Months"].items():
+                    dates_by_month.setdefault(month, set()).update(rollup["Dates"])
+            else:
+                dates_by_month.setdefault(DateManager.date_to_month(record["date"]), set()).add(record["date"])
+        for month in dates_by_month:
+            dates_by_month[month].update(self.manifest["Months"].get(month, {}).get("Dates", []))
+        return self.write_months(snapshot.entry_log, dates_by_month) and self.write_sections(snapshot)
+
+    def save_all(self, snapshot) -> bool:
+        dates_by_month = {month: set() for month in self.manifest["Months"]}
+        for date in snapshot.entry_log:
+            dates_by_month.setdefault(DateManager.date_to_month(date), set()).add(date)
+        return self.write_months(snapshot.entry_log, dates_by_month) and self.write_sections(snapshot)
+
+
+class StorageFactory:
+    @staticmethod
+    def open_storage(path_json: str, path_db: str, dir_log: str, path_bin: str) -> StorageBackend:
+        """Use whichever layout the journal has been migrated to, otherwise the JSON file."""
+        if os.path.exists(path_db):
+            return SqliteStorage(path_db)
+        if os.path.exists(os.path.join(dir_log, ShardedStorage.MANIFEST)):
+            return ShardedStorage(dir_log)
+        if os.path.exists(path_bin):
+            return BinaryStorage(path_bin)
+        return JsonStorage(path_json)
+
+    @staticmethod
+    def migrate_json_to_sqlite(path_json: str, path_db: str):
+        if os.path.exists(path_db):
+            return False, f"{path_db} already exists."
+        if not os.path.exists(path_json):
+            return False, f"{path_json} not found."
+        entry_log = JsonStorage(path_json).load()["Entry Log"]
+        target = SqliteStorage(path_db)
+        migrated = target.write_log(entry_log)
+        target.close()
+        if not migrated:
+            os.remove(path_db)
+            return False, "Migration failed. The JSON file has been left untouched."
+        return True, f"Migrated {len(entry_log)} day(s) to {path_db}. {path_json} has been kept as a backup."
+
+    @staticmethod
+    def migrate_json_to_sharded(path_json: str, dir_log: str):
+        target = ShardedStorage(dir_log)
+        if os.path.exists(target.path_manifest):
+            return False, f"{target.path_manifest} already exists."
+        if not os.path.exists(path_json):
+            return False, f"{path_json} not found."
+        data = JsonStorage(path_json).load()
+        entry_log = data["Entry Log"]
+        dates_by_month = {}
+        for date in entry_log:
+            dates_by_month.setdefault(DateManager.date_to_month(date), set()).add(date)
+        target.manifest["Sections"] = {key: value for key, value in data.items() if key != "Entry Log"}
+        # The manifest goes last: until it exists the JSON file is still the one in use
+        if not (target.write_months(entry_log, dates_by_month) and target.write_manifest()):
+            return False, "Migration failed. The JSON file has been left untouched."
+        return True, f"Migrated {len(entry_log)} day(s) into {len(dates_by_month)} monthly file(s) in {dir_log}. {path_json} has been kept as a backup."
+
+    @staticmethod
+    def migrate_json_to_binary(path_json: str, path_bin: str):
+        if os.path.exists(path_bin):
+            return False, f"{path_bin} already exists."
+        if not os.path.exists(path_json):
+            return False, f"{path_json} not found."
+        data = JsonStorage(path_json).load()
+        saved, msg = FileManager.save_to_binary(data, path_bin)
+        if not saved:
+            return False, f"Migration failed: {msg}. The JSON file has been left untouched."
+        return True, f"Migrated {len(data['Entry Log'])} day(s) to {path_bin}. {path_json} has been kept as a backup."
+
+    @staticmethod
+    def export_binary_to_json(path_bin: str, path_json: str):
+        """
+        Write the compact file's contents (including unsaved operation-log records) back out
+        as JSON, then move the compact file and its operation log aside (to "*.bak") so that
+        open_storage uses the JSON file from now on.
+        """
+        if not os.path.exists(path_bin):
+            return False, f"{path_bin} not found."
+        storage = BinaryStorage(path_bin)
+        data = storage.load()
+        saved, msg = FileManager.save_to_json({key: dict(value) if key == "Entry Log" else value
+                                               for key, value in data.items()}, path_json)
+        if not saved:
+            return False, f"Export failed: {msg}"
+        stale_log = JsonStorage(path_json).op_log.path_log  # Older than the exported data; replaying it would undo changes
+        if os.path.exists(stale_log):
+            os.remove(stale_log)
+        try:
+            os.replace(path_bin, f"{path_bin}.bak")  # The compact file first: without it, its log is never read
+            if os.path.exists(storage.op_log.path_log):
+                os.replace(storage.op_log.path_log, f"{storage.op_log.path_log}.bak")
+        except OSError as e:
+            return False, f"Exported to {path_json}, but {path_bin} could not be moved aside ({e}); move it away to use the JSON file."
+        return True, f"Exported {len(data['Entry Log'])} day(s) to {path_json}. {path_bin} has been kept as {path_bin}.bak."
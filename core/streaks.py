@@ -0,0 +1,160 @@
+from collections import Counter
+from core.core_services import DateManager
+
+
+class DayRuns:
+    """
+    A set of day ordinals kept as runs of consecutive days, held by both ends:
+    `end_of[start]` and `start_of[end]`. Adding a day only looks at the runs ending the
+    day before and starting the day after, so it takes the same time however many runs
+    there are; removing one walks to the end of its run to split it. The length of
+    every run is counted, for the longest one.
+    """
+
+    def __init__(self) -> None:
+        self.days = set()
+        self.end_of = {}
+        self.start_of = {}
+        self.lengths = Counter()
+
+    def __contains__(self, day: int) -> bool:
+        return day in self.days
+
+    def run_end(self, day: int) -> int:
+        """Last day of the run holding `day`."""
+        while day not in self.start_of:
+            day += 1
+        return day
+
+    def count_run(self, start: int, end: int, sign: int) -> None:
+        length = end - start + 1
+        self.lengths[length] += sign
+        if not self.lengths[length]:
+            del self.lengths[length]
+
+    def add_run(self, start: int, end: int) -> None:
+        self.end_of[start] = end
+        self.start_of[end] = start
+        self.count_run(start, end, 1)
+
+    def drop_run(self, start: int, end: int) -> None:
+        del self.end_of[start], self.start_of[end]
+        self.count_run(start, end, -1)
+
+    def add(self, day: int) -> None:
+        if day in self.days:
+            return
+        self.days.add(day)
+        start = end = day
+        if day - 1 in self.start_of:
+            start = self.start_of[day - 1]
+            self.drop_run(start, day - 1)
+        if day + 1 in self.end_of:
+            end = self.end_of[day + 1]
+            self.drop_run(day + 1, end)
+        self.add_run(start, end)
+
+    def remove(self, day: int) -> None:
+        if day not in self.days:
+            return
+        end = self.run_end(day)
+        start = self.start_of[end]
+        self.days.remove(day)
+        self.drop_run(start, end)
+        if start < day:
+            self.add_run(start, day - 1)
+        if day < end:
+            self.add_run(day + 1, end)
+
+    def current(self, today: int) -> int:
+        """Days in a row up to today; a streak that reached yesterday is still alive."""
+        day = today if today in self.days else today - 1
+        if day not in self.days:
+            return 0
+        return day - self.start_of[self.run_end(day)] + 1
+
+    def longest(self) -> int:
+        return max(self.lengths, default=0)
+
+
+class StreakEngine:
+    """
+    Current and longest streaks of days with at least one entry: overall, per subject,
+    and for the Qur'an (Tafseer or Tilawat).
+
+    Built from the Entry Dates already kept in Statistics, so no day has to be read,
+    and kept current afterwards as a DataManager listener: a changed day only moves
+    that day in or out of the runs of the scopes it gained or lost.
+    """
+    ALL = None
+    QURAN = "Al-Qur'an"
+    QURAN_SUBJECTS = ("Al-Qur'an (Tafseer)", "Al-Qur'an (Tilawat)")
+
+    def __init__(self, data_manager) -> None:
+        self.data = data_manager
+        self.runs = {}
+        self.day_scopes = {}  # ordinal -> scopes with an entry that day
+        self.built = False
+
+    @classmethod
+    def scopes_of(cls, subjects) -> set:
+        scopes = set()
+        for subject in subjects:
+            scopes.add(subject)
+            if subject in cls.QURAN_SUBJECTS:
+                scopes.add(cls.QURAN)
+        if scopes:
+            scopes.add(cls.ALL)
+        return scopes
+
+    def build(self) -> None:
+        self.runs = {}
+        self.day_scopes = {}
+        for subject, books in self.data.stats.items():
+            for record in books.values():
+                for date in record.entry_dates:
+                    self.day_scopes.setdefault(DateManager.date_to_ordinal(date), set()).update(self.scopes_of([subject]))
+        for day, scopes in self.day_scopes.items():
+            for scope in scopes:
+                self.runs.setdefault(scope, DayRuns()).add(day)
+        if self not in self.data.listeners:
+            self.data.listeners.append(self)
+        self.built = True
+
+    def on_day_changed(self, date: str) -> None:
+        if not self.built:
+            return
+        day = DateManager.date_to_ordinal(date)
+        old_scopes = self.day_scopes.get(day, set())
+        new_scopes = self.scopes_of(self.data.entry_log.get(date, {}))
+        for scope in old_scopes - new_scopes:
+            self.runs[scope].remove(day)
+        for scope in new_scopes - old_scopes:
+            self.runs.setdefault(scope, DayRuns()).add(day)
+        if new_scopes:
+            self.day_scopes[day] = new_scopes
+        else:
+            self.day_scopes.pop(day, None)
+
+    def on_clear(self) -> None:
+        self.runs = {}
+        self.day_scopes = {}
+
+    def reset(self) -> None:
+        """Build again on next use, e.g. after a restore replaced the data."""
+        self.built = False
+
+    def streaks(self, scope=ALL) -> tuple:
+        """(current, longest) streak in days for everything, a subject or StreakEngine.QURAN."""
+        if not self.built:
+            self.build()
+        runs = self.runs.get(scope)
+        if runs is None:
+            return 0, 0
+        return runs.current(DateManager.date_to_ordinal(DateManager.get_date_today())), runs.longest()
+
+    def get_summary(self) -> str:
+        current, longest = self.streaks()
+        current_quran, longest_quran = self.streaks(self.QURAN)
+        return (f"Streak: {current} day(s), longest {longest}\n"
+                f"Qur'an streak: {current_quran} day(s), longest {longest_quran}")
@@ -1,6 +1,9 @@
 import pathlib
-from PyQt5.QtWidgets import QFileDialog
-from gui.dialogs import MsgDialogs, PasswordDialog
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QDialog, QFileDialog, QInputDialog, QProgressDialog
+from core.backup_repository import BackupRepository
+from core.core_services import DateManager, CoreHelpers
+from gui.dialogs import MsgDialogs, PasswordDialog, DateDialog
 
 class DataController:
     @staticmethod
@@ -34,13 +37,124 @@ class DataController:
         zip_file, _ = QFileDialog.getOpenFileName(main_window, "Restore Data", "", "Zip files (*.zip)", options=options)
         if not zip_file:
             return
-        MsgDialogs.show_operation_result(main_window, main_window.context.data_manager.restore_data(zip_file))
+        DataController.restore_with_progress(main_window, zip_file)
+
+    @staticmethod
+    def on_incremental_backup_triggered(main_window):
+        options = QFileDialog.Options()
+        repo_dir = QFileDialog.getExistingDirectory(main_window, "Backup Repository", "", options)
+        if not repo_dir:
+            return
+        MsgDialogs.show_operation_result(main_window, main_window.context.data_manager.backup_incremental(repo_dir))
+
+    @staticmethod
+    def on_restore_snapshot_triggered(main_window):
+        options = QFileDialog.Options()
+        repo_dir = QFileDialog.getExistingDirectory(main_window, "Backup Repository", "", options)
+        if not repo_dir:
+            return
+        snapshots = BackupRepository(repo_dir).list_snapshots()
+        if not snapshots:
+            MsgDialogs.show_warning_msg(main_window, "No backups found in this folder.")
+            return
+        items = [f"{snapshot['Name']}  ({snapshot['Days']} day(s))" for snapshot in snapshots]
+        item, ok = QInputDialog.getItem(main_window, "Restore Data", "Choose a backup to restore:", items, 0, False)
+        if not ok:
+            return
+        if not MsgDialogs.get_answer(main_window, "This action will permanently replace your\ncurrent data with the selected backup.\nContinue?"):
+            return
+        snapshot = snapshots[items.index(item)]["Name"]
+        DataController.restore_with_progress(main_window, repo_dir, snapshot)
+
+    @staticmethod
+    def restore_with_progress(main_window, path: str, snapshot: str = None):
+        dialog = QProgressDialog("Restoring data...", "Cancel", 0, 100, main_window)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(500)
+
+        def progress(done: int, total: int) -> bool:
+            dialog.setValue(done * 100 // total if total else 0)
+            QApplication.processEvents()
+            return not dialog.wasCanceled()
+
+        result = main_window.context.restore_data(path, snapshot, progress)
+        dialog.close()
+        if MsgDialogs.show_operation_result(main_window, result):
+            main_window.main_menu.display_stats_today()
 
     
     @staticmethod
     def show_weekly_report(main_window):
         MsgDialogs.show_information_msg(main_window, main_window.context.stats_manager.get_weekly_summary(), "Weekly Report")
 
+    @staticmethod
+    def show_range_stats(main_window):
+        dates = []
+        for label_text in ("First date of the range:", "Last date of the range:"):
+            date_dialog = DateDialog(label_text, main_window)
+            if date_dialog.exec_() != QDialog.Accepted:
+                return
+            dates.append(date_dialog.calendar_widget.selectedDate().toString("dd-MMM-yyyy"))
+        start, end = sorted(dates, key=DateManager.date_to_ordinal)
+        stats = main_window.context.data_manager.stats
+        all_subjects, whole_subject = "All subjects", "All books"
+        subject, ok = QInputDialog.getItem(main_window, "Stats for a Date Range", "Subject:",
+                                           [all_subjects] + list(stats), 0, False)
+        if not ok:
+            return
+        subject = None if subject == all_subjects else subject
+        book = None
+        if subject is not None:
+            book, ok = QInputDialog.getItem(main_window, "Stats for a Date Range", "Book:",
+                                            [whole_subject] + list(stats[subject]), 0, False)
+            if not ok:
+                return
+            book = None if book == whole_subject else book
+        entries, minutes, pages = main_window.context.stats_manager.range_stats(start, end, subject, book)
+        msg = (f"{book or subject or all_subjects}\n{start} to {end}\n\n"
+               f"{entries} entr{'y' if entries == 1 else 'ies'}\n"
+               f"{pages} page(s)\n"
+               f"{CoreHelpers.format_time(minutes)}")
+        MsgDialogs.show_information_msg(main_window, msg, "Stats for a Date Range")
+
+    @staticmethod
+    def show_quran_coverage(main_window):
+        coverage = main_window.context.stats_manager.coverage
+        MsgDialogs.show_information_msg(main_window, f"{coverage.get_summary()}\n\n{coverage.get_gaps_summary()}", "Qur'an Coverage")
+
+    @staticmethod
+    def show_reading_forecast(main_window):
+        context = main_window.context
+        forecast = context.stats_manager.forecast
+        books = {subject: books for subject, books in context.data_manager.stats.items()
+                 if subject not in forecast.QURAN_SUBJECTS}
+        if not books:
+            MsgDialogs.show_information_msg(main_window, "No books logged yet.", "Reading Pace and Forecast")
+            return
+        subject, ok = QInputDialog.getItem(main_window, "Reading Pace and Forecast", "Subject:", sorted(books), 0, False)
+        if not ok:
+            return
+        book, ok = QInputDialog.getItem(main_window, "Reading Pace and Forecast", "Book:", sorted(books[subject]), 0, False)
+        if not ok:
+            return
+        old_count = context.data_manager.book_sizes.get(subject, book)
+        page_count, ok = QInputDialog.getInt(main_window, "Reading Pace and Forecast",
+                                             "Pages in the book (0 if not known):", old_count, 0, 100000)
+        if not ok:
+            return
+        if page_count != old_count:
+            ok, msg = context.data_manager.book_sizes.set(subject, book, page_count)
+            if not ok:
+                MsgDialogs.show_critical_msg(main_window, msg)
+        MsgDialogs.show_information_msg(main_window, f"{book}\n\n{forecast.get_summary(subject, book)}", "Reading Pace and Forecast")
+
+    @staticmethod
+    def show_heatmap(main_window):
+        try:
+            main_window.context.stats_manager.plotter.display_heatmap()
+        except ImportError as e:
+            MsgDialogs.show_critical_msg(main_window, f"The heatmap needs matplotlib and NumPy.\n\n{e}")
+
     @staticmethod
     def reset_password(main_window):
         PasswordDialog(main_window.context.password_manager, "Set a new password").exec_()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from io import StringIO
+from html import escape
 
 
 class EntryFormatter:
@@ -21,6 +22,26 @@ class EntryFormatter:
                     cls.format_entry_html(buffer, session, session_details)
         return buffer.getvalue()
 
+    @classmethod
+    def format_search_results_html(cls, query: str, results: list, entry_log):
+        buffer = StringIO()
+        buffer.write(f"<h2>{len(results)} result(s) for \"{escape(query)}\"</h2><br>")
+        for _, date, subject, book, session in results:
+            cls.format_entry_html(buffer, escape(f"{date} | {subject} | {book} | {session}"), entry_log[date][subject][book][session])
+        return buffer.getvalue()
+
+    @classmethod
+    def format_book_history_html(cls, book: str, history: list, record):
+        buffer = StringIO()
+        buffer.write(f"<h2>{escape(book)}</h2>")
+        if record is not None:
+            buffer.write(f"<h3>{record.total_entries} entries on {len(record.entry_dates)} day(s), "
+                         f"{record.time_spent}, {record.pages} page(s)</h3>")
+        buffer.write("<br>")
+        for date, session, details in reversed(history):  # Latest first
+            cls.format_entry_html(buffer, escape(f"{date} | {session}"), details)
+        return buffer.getvalue()
+
     @classmethod
     def format_dict_entries_html(cls, title: str, entries_dict: dict):
         buffer = StringIO()
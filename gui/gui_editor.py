@@ -1,3 +1,4 @@
+from copy import deepcopy
 from PyQt5.QtWidgets import QInputDialog
 from core.core_services import DeleteController
 from core.entries import TafseerEntry, TilawatEntry, OtherEntry
@@ -28,7 +29,7 @@ class EntryEditService:
         if date_dialog.exec_() != QDialog.Accepted:
             return
         date = date_dialog.calendar_widget.selectedDate().toString("dd-MMM-yyyy")
-        entries_date = main_window.context.data_manager.get_entries_from_date(date)
+        entries_date = deepcopy(main_window.context.data_manager.get_entries_from_date(date))
         if not entries_date:
             MsgDialogs.show_warning_msg(main_window, f"No entries recorded for {date}")
             return
@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (QWidget, QGridLayout, QCheckBox, QVBoxLayout,
 from gui.dialogs import MsgDialogs
 from gui.styles import StyleSheets
 from gui.gui_workflow import GuiWorkflow
+from gui.widgets import NameCompleter
 
 
 class EntryFormWidget(QScrollArea):
@@ -203,9 +204,11 @@ class QuranKareemForm(EntryFormWidget):
            
 
 class OtherSubjectsForm(EntryFormWidget):
+    NAMES_LISTED = 20  # Subjects in the drop-down list; typing finds any of the others
+
     def __init__(self, main_window, parent=None):
         super().__init__(main_window, parent)
-        self.data_manager = main_window.context.data_manager
+        self.autocomplete = main_window.context.autocomplete
 
         self.form_widget = QWidget()
         self.form_layout = QGridLayout(self.form_widget)
@@ -225,7 +228,7 @@ class OtherSubjectsForm(EntryFormWidget):
         self.ql_page.setMinimumWidth(155)
         self.ql_subject.setMinimumWidth(155)
 
-        self.qcb_subject.currentTextChanged.connect(self.populate_books)
+        self.qcb_subject.currentTextChanged.connect(self.qcb_book.clearEditText) # Books come from the completer
 
         self.form_layout.addWidget(self.ql_subject, 0, 0, 1, 1)
         self.form_layout.addWidget(self.qcb_subject, 0, 1, 1, 2)
@@ -236,17 +239,14 @@ class OtherSubjectsForm(EntryFormWidget):
         self.form_layout.addWidget(self.qle_unit2, 2, 2, 1, 1)
         self.form_layout.addWidget(self.ql_chapter, 3, 0, 1, 1)
         self.form_layout.addWidget(self.qle_chapter, 3, 1, 1, 2)
+        NameCompleter(self.qcb_subject, self.autocomplete.subjects)
+        NameCompleter(self.qcb_book, lambda text: self.autocomplete.books(self.qcb_subject.currentText().strip(), text))
         self.populate_combo_boxes()
 
     def populate_combo_boxes(self):
-        self.qcb_subject.addItems(self.data_manager.get_all_subjects())
-        self.populate_books()
-    
-    def populate_books(self):
-        subject = self.qcb_subject.currentText().strip()
-        books_list = self.data_manager.get_books_list(subject)
-        self.qcb_book.clear()
-        self.qcb_book.addItems(books_list)
+        """List the most used subjects once; the completers find the rest, and the books of the chosen subject."""
+        self.qcb_subject.addItems(self.autocomplete.subjects(limit=self.NAMES_LISTED))
+        self.qcb_book.clearEditText()
 
     def get_label_and_comboBox(self, label_text: str):
         label = QLabel(label_text)
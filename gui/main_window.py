@@ -2,12 +2,12 @@ import sys
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QDialog,
-                             QPushButton, QStackedLayout, QStatusBar)
+                             QPushButton, QStackedLayout, QStatusBar, QLabel)
 from core.app_context import AppContext
-from core.core_services import CoreHelpers
+from core.core_services import CoreHelpers, DateManager
 from core.exceptions import DataCorruptionError
 from gui.screens import (MainMenuScreen, QuranKareemScreen, OtherSubjectsScreen, 
-                         EditorScreen, SaveScreen, ViewScreen)
+                         EditorScreen, SaveScreen, ViewScreen, SearchScreen, BookHistoryScreen)
 from gui.gui_editor import EntryEditService
 from gui.data_controller import DataController
 from gui.widgets import ClickableLabel
@@ -19,6 +19,7 @@ from gui.styles import StyleSheets
 
 class MainWindow(QMainWindow):
     signal_save = pyqtSignal()
+    signal_autosaved = pyqtSignal(int, float)
     
     # def paintEvent(self, event):
     #     painter = QPainter(self)
@@ -28,10 +29,15 @@ class MainWindow(QMainWindow):
     #     painter.fillRect(self.rect(), gradient)
 
     def closeEvent(self, a0) -> None:
-        if self.confirm_exit():
-            a0.accept()            
-        else:
+        if not self.confirm_exit():
+            a0.ignore()
+            return
+        if self.context.save_progress_to_files() != 0 and not MsgDialogs.get_answer(
+                self, "Your progress could not be saved.\nExit anyway?", title="Save Failed"):
             a0.ignore()
+            return
+        self.context.close()
+        a0.accept()
 
     def __init__(self, app_context: AppContext):
         super().__init__()
@@ -49,6 +55,10 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         self.stacked_layout = QStackedLayout(central_widget)
         self.setStatusBar(QStatusBar(self))
+        self.autosave_label = QLabel("Autosave on")
+        self.statusBar().addPermanentWidget(self.autosave_label)
+        self.signal_autosaved.connect(self.show_autosave_status) # type: ignore
+        self.context.autosave.status_listener = self.signal_autosaved.emit
 
         # All Screens
         self.main_menu = MainMenuScreen(self)
@@ -57,6 +67,8 @@ class MainWindow(QMainWindow):
         self.save_screen = SaveScreen(self)
         self.view_screen = ViewScreen(self)
         self.edit_screen = EditorScreen(self)
+        self.search_screen = SearchScreen(self)
+        self.book_history_screen = BookHistoryScreen(self)
 
         self.stacked_layout.addWidget(self.main_menu)
         self.stacked_layout.addWidget(self.Quran_Kareem)
@@ -64,6 +76,8 @@ class MainWindow(QMainWindow):
         self.stacked_layout.addWidget(self.save_screen)
         self.stacked_layout.addWidget(self.view_screen)
         self.stacked_layout.addWidget(self.edit_screen)
+        self.stacked_layout.addWidget(self.search_screen)
+        self.stacked_layout.addWidget(self.book_history_screen)
 
         self.menu_bar = MainMenuBar(self)
         self.setMenuBar(self.menu_bar)
@@ -79,15 +93,33 @@ class MainWindow(QMainWindow):
         self.menu_bar.action_delete_entries.triggered.connect(lambda: EntryEditService.delete_entries(self))
         self.menu_bar.action_delete_all.triggered.connect(lambda: EntryEditService.delete_all(self))
 
+        self.menu_bar.action_search.triggered.connect(lambda: self.switch_screen(self.search_screen))
+        self.menu_bar.action_book_history.triggered.connect(lambda: self.switch_screen(self.book_history_screen))
         self.menu_bar.action_show_report.triggered.connect(lambda: DataController.show_weekly_report(self))
+        self.menu_bar.action_range_stats.triggered.connect(lambda: DataController.show_range_stats(self))
+        self.menu_bar.action_quran_coverage.triggered.connect(lambda: DataController.show_quran_coverage(self))
+        self.menu_bar.action_reading_forecast.triggered.connect(lambda: DataController.show_reading_forecast(self))
+        self.menu_bar.action_heatmap.triggered.connect(lambda: DataController.show_heatmap(self))
         self.menu_bar.action_backup.triggered.connect(lambda: DataController.on_backup_triggered(self))
         self.menu_bar.action_restore.triggered.connect(lambda: DataController.on_restore_triggered(self))
+        self.menu_bar.action_backup_incremental.triggered.connect(lambda: DataController.on_incremental_backup_triggered(self))
+        self.menu_bar.action_restore_snapshot.triggered.connect(lambda: DataController.on_restore_snapshot_triggered(self))
         self.menu_bar.action_reset_password.triggered.connect(lambda: DataController.reset_password(self))
         self.menu_bar.action_about.triggered.connect(self.show_about)
 
     def show_about(self):
         MsgDialogs.show_information_msg(self, f"{self.context.about()}\n\nDeveloped with PyQt5.")
 
+    def show_autosave_status(self, return_code: int, latency: float):
+        """Runs on the GUI thread; the autosave worker only emits signal_autosaved."""
+        if return_code == 0:
+            self.autosave_label.setText(f"Saved at {DateManager.get_current_time()} ({latency * 1000:.0f} ms)")
+            if not self.context.autosave.has_pending():
+                self.context.clear_unsaved_entries()
+        else:
+            failed_file = "JSON" if return_code == 1 else "Markdown"
+            self.autosave_label.setText(f"Autosave failed: could not save {failed_file} file. Retrying...")
+
     def switch_screen(self, screen):
         self.stacked_layout.setCurrentWidget(screen)
 
@@ -102,7 +134,7 @@ class MainWindow(QMainWindow):
         return go_back_label
 
     def confirm_exit(self) -> bool:
-            msg = "Any unsaved changes will be lost.\nAre you sure you want to exit?"
+            msg = "Are you sure you want to exit?"
             if not "Al-Qur'an (Tafseer)" in self.context.data_manager.progress_today:
                 msg = f"{CoreHelpers.get_motivational_quote()}\n\n\n{msg}"       
             return MsgDialogs.get_answer(self, msg, title="Exit Confirmation")
@@ -54,19 +54,38 @@ class MainMenuBar(QMenuBar):
         self.menu_view = QMenu("View", self)
         self.action_show_stats = QAction("Show Stats", self)
         self.action_show_report = QAction("Weekly Report", self)
+        self.action_search = QAction("Search Entries", self)
+        self.action_search.setShortcut("Ctrl+F")
+        self.action_book_history = QAction("Book History", self)
+        self.action_range_stats = QAction("Stats for a Date Range", self)
+        self.action_quran_coverage = QAction("Qur'an Coverage", self)
+        self.action_reading_forecast = QAction("Reading Pace and Forecast", self)
+        self.action_heatmap = QAction("Activity Heatmap", self)
 
         self.menu_view.addAction(self.action_show_stats)
         self.menu_view.addAction(self.action_show_report)
+        self.menu_view.addAction(self.action_search)
+        self.menu_view.addAction(self.action_book_history)
+        self.menu_view.addAction(self.action_range_stats)
+        self.menu_view.addAction(self.action_quran_coverage)
+        self.menu_view.addAction(self.action_reading_forecast)
+        self.menu_view.addAction(self.action_heatmap)
         self.addMenu(self.menu_view)
 
         # Tools
         self.menu_tools = QMenu("Tools", self)
         self.action_backup = QAction("Backup Data", self)
         self.action_restore = QAction("Restore Data", self)
+        self.action_backup_incremental = QAction("Incremental Backup", self)
+        self.action_restore_snapshot = QAction("Restore from Backup Repository", self)
         self.action_reset_password = QAction("Reset Password", self)
 
         self.menu_tools.addAction(self.action_backup)
         self.menu_tools.addAction(self.action_restore)
+        self.menu_tools.addSeparator()
+        self.menu_tools.addAction(self.action_backup_incremental)
+        self.menu_tools.addAction(self.action_restore_snapshot)
+        self.menu_tools.addSeparator()
         self.menu_tools.addAction(self.action_reset_password)
         self.addMenu(self.menu_tools)
 
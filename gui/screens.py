@@ -1,6 +1,6 @@
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QWidget, QPushButton, QLabel, QGridLayout, QVBoxLayout, QTextBrowser, QTabWidget
+from PyQt5.QtWidgets import QWidget, QPushButton, QLabel, QGridLayout, QVBoxLayout, QHBoxLayout, QTextBrowser, QTabWidget, QLineEdit, QComboBox
 from core.core_services import CoreHelpers
 from gui.styles import StyleSheets
 from gui.widgets import ClickableLabel, DateSelector
@@ -82,7 +82,8 @@ class MainMenuScreen(QWidget):
         stats = (
                 f"Today\n\n{entry_count} {'entries' if entry_count > 1 else 'entry'}\n"
                 f"{stats_manager.aggregator.stats_today[2]} page(s)\n"
-                f"{CoreHelpers.format_time(stats_manager.aggregator.stats_today[1])}"
+                f"{CoreHelpers.format_time(stats_manager.aggregator.stats_today[1])}\n\n"
+                f"{stats_manager.streaks.get_summary()}"
             )
         self.stats_label.setText(stats)
 
@@ -260,18 +261,125 @@ class ViewScreen(BaseScreen):
         self.date_selector = DateSelector("View Entries from", self)
         self.display = QTextBrowser()
         self.display.setStyleSheet("background: rgb(220, 220, 220);")
+        self.previous_btn = QPushButton("< Previous day with entries")
+        self.next_btn = QPushButton("Next day with entries >")
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.previous_btn)
+        buttons.addWidget(self.next_btn)
         layout.addWidget(self.date_selector)
+        layout.addLayout(buttons)
         layout.addWidget(self.display)
         self.date_selector.signal_date_selection.connect(self.get_date) # type: ignore
+        self.previous_btn.clicked.connect(lambda: self.step(self.context.data_manager.day_index.previous))
+        self.next_btn.clicked.connect(lambda: self.step(self.context.data_manager.day_index.next))
 
     def get_date(self, date: QDate):
         formatted = date.toString("dd-MMM-yyyy")
         self.show_progress(formatted)
 
+    def step(self, find_date):
+        """Show the day with entries that `find_date` (DayIndex.previous or .next) finds from the selected date."""
+        date = find_date(self.date_selector.get_date_selected().toString("dd-MMM-yyyy"))
+        if date is None:
+            MsgDialogs.show_information_msg(self, "No more days with entries in that direction.")
+            return
+        self.date_selector.date_edit.setDate(QDate.fromString(date, "dd-MMM-yyyy"))
+        self.show_progress(date)
+
     def show_progress(self, date: str):
         entries = self.context.data_manager.get_entries_from_date(date)
         if entries:
             formatted = EntryFormatter.format_day_entries_html(date, entries)
             self.display.setHtml(f"<div align='center' style='white-space: pre-wrap;'>{formatted}</div>")
         else:
-            self.display.setHtml(f"<div align='center' style='white-space: pre-wrap;'><h2>No entries found for {date}.<br>Please try another date.</h2></div>")
\ No newline at end of file
+            self.display.setHtml(f"<div align='center' style='white-space: pre-wrap;'><h2>No entries found for {date}.<br>Please try another date.</h2></div>")
+
+
+class SearchScreen(BaseScreen):
+
+    def __init__(self, main_window):
+        self.content_widget = QWidget()
+        self.context = main_window.context
+        super().__init__("Search Entries", self.content_widget, main_window.get_back_label())
+
+        layout = QVBoxLayout(self.content_widget)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Words from notes, chapters, revisions, books or subjects")
+        self.display = QTextBrowser()
+        self.display.setStyleSheet("background: rgb(220, 220, 220);")
+        layout.addWidget(self.search_box)
+        layout.addWidget(self.display)
+        self.search_box.textChanged.connect(self.show_results) # type: ignore
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.search_box.setFocus()
+        self.show_results(self.search_box.text())
+
+    def show_results(self, query: str):
+        if not query.strip():
+            self.display.setHtml("")
+            return
+        results = self.context.search_index.search(query)
+        if results:
+            formatted = EntryFormatter.format_search_results_html(query, results, self.context.data_manager.entry_log)
+            self.display.setHtml(f"<div align='center' style='white-space: pre-wrap;'>{formatted}</div>")
+        else:
+            self.display.setHtml("<div align='center' style='white-space: pre-wrap;'><h2>No entries found.<br>Please try other words.</h2></div>")
+
+
+class BookHistoryScreen(BaseScreen):
+
+    def __init__(self, main_window):
+        self.content_widget = QWidget()
+        self.context = main_window.context
+        super().__init__("Book History", self.content_widget, main_window.get_back_label())
+
+        layout = QGridLayout(self.content_widget)
+        self.qcb_subject = QComboBox()
+        self.qcb_book = QComboBox()
+        self.display = QTextBrowser()
+        self.display.setStyleSheet("background: rgb(220, 220, 220);")
+        layout.addWidget(QLabel("Subject:"), 0, 0)
+        layout.addWidget(self.qcb_subject, 0, 1)
+        layout.addWidget(QLabel("Book:"), 1, 0)
+        layout.addWidget(self.qcb_book, 1, 1)
+        layout.addWidget(self.display, 2, 0, 1, 2)
+        self.qcb_subject.currentTextChanged.connect(self.populate_books) # type: ignore
+        self.qcb_book.currentTextChanged.connect(self.show_history) # type: ignore
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.populate_subjects()
+
+    def populate_subjects(self):
+        """Fill the subjects again (keeping the selection), as entries may have changed since."""
+        subject, book = self.qcb_subject.currentText(), self.qcb_book.currentText()
+        subjects = sorted(self.context.data_manager.stats)
+        self.qcb_subject.blockSignals(True)
+        self.qcb_subject.clear()
+        self.qcb_subject.addItems(subjects)
+        if subject in subjects:
+            self.qcb_subject.setCurrentText(subject)
+        self.qcb_subject.blockSignals(False)
+        self.populate_books(self.qcb_subject.currentText(), book)
+
+    def populate_books(self, subject: str, book: str = ""):
+        books = sorted(self.context.data_manager.stats.get(subject, {}))
+        self.qcb_book.blockSignals(True)
+        self.qcb_book.clear()
+        self.qcb_book.addItems(books)
+        if book in books:
+            self.qcb_book.setCurrentText(book)
+        self.qcb_book.blockSignals(False)
+        self.show_history(self.qcb_book.currentText())
+
+    def show_history(self, book: str):
+        subject = self.qcb_subject.currentText()
+        data_manager = self.context.data_manager
+        history = data_manager.book_index.history(subject, book) if book else []
+        if history:
+            formatted = EntryFormatter.format_book_history_html(book, history, data_manager.stats[subject].get(book))
+            self.display.setHtml(f"<div align='center' style='white-space: pre-wrap;'>{formatted}</div>")
+        else:
+            self.display.setHtml("<div align='center' style='white-space: pre-wrap;'><h2>No entries found.</h2></div>")
@@ -1,5 +1,5 @@
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QDateEdit, QLabel, QHBoxLayout
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QDate
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QDateEdit, QLabel, QHBoxLayout, QCompleter
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QDate, QStringListModel
 from gui.styles import StyleSheets
 
 class ClickableLabel(QLabel):
@@ -46,4 +46,28 @@ class DateSelector(QWidget):
 
     def showEvent(self, event):
         super().showEvent(event)
-        self.date_edit.setDate(QDate.currentDate())
\ No newline at end of file
+        self.date_edit.setDate(QDate.currentDate())
+
+
+class NameCompleter(QCompleter):
+    """
+    Type-ahead for an editable combo box. The suggestions for what has been typed
+    come from `suggest(text)` (e.g. NameAutocomplete.books), so the model only ever
+    holds the few names on show, not the full list. Clearing the text shows the
+    suggestions for nothing typed, i.e. the most used names.
+    """
+    def __init__(self, combo_box, suggest) -> None:
+        super().__init__(combo_box)
+        self.suggest = suggest
+        self.names_model = QStringListModel(self)
+        self.setModel(self.names_model)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)  # The suggestions are already matched
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        combo_box.setCompleter(self)
+        combo_box.lineEdit().textEdited.connect(self.update_suggestions) # type: ignore
+
+    def update_suggestions(self, text: str) -> None:
+        names = self.suggest(text.strip())
+        self.names_model.setStringList(names)
+        if names:
+            self.complete()
@@ -0,0 +1,29 @@
+"""Command-line tool to move an existing journal to another storage backend."""
+
+import sys, argparse
+from core.storage import StorageFactory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the Learning Journal data to another storage backend.")
+    parser.add_argument("--to", choices=["sqlite", "sharded", "binary", "json"], default="sqlite", help="storage backend to migrate to (\"json\" converts the binary file back)")
+    parser.add_argument("--json", default="./data/learning_data.json", help="existing JSON data file")
+    parser.add_argument("--db", default="./data/learning_data.db", help="SQLite database to create")
+    parser.add_argument("--bin", default="./data/learning_data.mljb", help="compact binary data file")
+    parser.add_argument("--log-dir", default="./data/log", help="directory for the monthly files")
+    args = parser.parse_args()
+
+    if args.to == "binary":
+        migrated, msg = StorageFactory.migrate_json_to_binary(args.json, args.bin)
+    elif args.to == "json":
+        migrated, msg = StorageFactory.export_binary_to_json(args.bin, args.json)
+    elif args.to == "sharded":
+        migrated, msg = StorageFactory.migrate_json_to_sharded(args.json, args.log_dir)
+    else:
+        migrated, msg = StorageFactory.migrate_json_to_sqlite(args.json, args.db)
+    print(msg)
+    sys.exit(0 if migrated else 1)
+
+
+if __name__ == "__main__":
+    main()
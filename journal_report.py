@@ -0,0 +1,61 @@
+"""Command-line tool that writes day, month and book summaries of a journal as CSV or JSON lines."""
+
+import os, sys, argparse
+from core.core_services import DateManager
+from core.bulk_report import JournalDays, BulkReport, ReportWriter
+
+
+def parse_date(text: str) -> str:
+    try:
+        DateManager.date_to_ordinal(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"\"{text}\" is not a date like 18-Oct-2026")
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the Learning Journal per day, month and book, reading it one day at a time.")
+    parser.add_argument("--json", default="./data/learning_data.json", help="JSON data file, or a backup zip")
+    parser.add_argument("--by", nargs="+", choices=BulkReport.LEVELS, default=list(BulkReport.LEVELS), help="summaries to write")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="output format")
+    parser.add_argument("--out-dir", help="write <level>_summary.<format> files here instead of to standard output")
+    parser.add_argument("--from", dest="start", type=parse_date, help="first date to include (e.g. 01-Jan-2025)")
+    parser.add_argument("--to", dest="end", type=parse_date, help="last date to include")
+    args = parser.parse_args()
+    levels = [level for level in BulkReport.LEVELS if level in args.by]
+    if args.out_dir is None and args.format == "csv" and len(levels) > 1:
+        parser.error("CSV on standard output takes a single --by level; use --out-dir or --format jsonl")
+
+    files = []
+    try:
+        if args.out_dir is None:
+            writers = {level: ReportWriter(sys.stdout, args.format, level, tag_level=len(levels) > 1) for level in levels}
+        else:
+            os.makedirs(args.out_dir, exist_ok=True)
+            writers = {}
+            for level in levels:
+                files.append(open(os.path.join(args.out_dir, f"{level}_summary.{args.format}"), "w", encoding="utf-8", newline=""))
+                writers[level] = ReportWriter(files[-1], args.format, level)
+        report = BulkReport(args.start, args.end)
+        for date, day in JournalDays(args.json):
+            row = report.add_day(date, day)
+            if row is not None and "day" in writers:
+                writers["day"].write(row)
+        for level, rows in (("month", report.month_rows()), ("book", report.book_rows())):
+            if level in writers:
+                for row in rows:
+                    writers[level].write(row)
+    except BrokenPipeError:
+        # The reader stopped early (e.g. "| head"); point stdout at devnull so the flush at exit stays quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        for file in files:
+            file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Sample journals for the tests: random but repeatable Entry Logs, and a DataManager over one."""
+
+import os, json, random
+from datetime import date, datetime, timedelta
+from core.data_manager import DataManager
+from core.stats_manager import StatsManager
+
+SUBJECTS = {
+    "Fiqh": ["Qudoori", "Bidayat al-Mujtahid", "Umdat al-Fiqh"],
+    "Hadith": ["Riyad us-Saliheen", "Sahih al-Bukhari", "Bulugh al-Maram"],
+    "Arabic": ["Ajurrumiyyah", "Nahw Meer", "Madinah Book 2", "Madinah Book 10"],
+    "Tarikh ت": ["Al-Bidayah wan-Nihayah"],
+}
+WORDS = "salah zakat sawm hajj wudu nahw sarf adab seerah tawheed ṣabr".split()
+
+
+def session(book: str, minutes: int, pages, notes: str = "N/A", chapter: str = "N/A") -> dict:
+    return {
+        "Book": book,
+        "Unit": "1",
+        "Chapter": chapter,
+        "Page": "1",
+        "Total Pages": pages,
+        "Time Spent": f"{minutes} min(s)",
+        "Reading Mode": "N/A",
+        "Revision": "No",
+        "Notes": notes
+    }
+
+
+def random_log(seed: int, sessions: int = 600, first: date = date(2025, 11, 1), days: int = 150) -> dict:
+    """An Entry Log of `sessions` sessions spread over `days` days (several months), keyed and ordered like the real one."""
+    rng = random.Random(seed)
+    entry_log = {}
+    for number in range(sessions):
+        day = (first + timedelta(days=rng.randrange(days))).strftime("%d-%b-%Y")
+        subject = rng.choice(sorted(SUBJECTS))
+        book = rng.choice(SUBJECTS[subject])
+        details = session(book, rng.randint(1, 120), rng.choice([1, 2, 3.5, 10, 0.25]),
+                          " ".join(rng.sample(WORDS, 2)), rng.choice(["N/A", "Kitab at-Taharah", "Bab al-Adab"]))
+        entry_log.setdefault(day, {}).setdefault(subject, {}).setdefault(book, {})[f"Entry {number:06d}"] = details
+    return dict(sorted(entry_log.items(), key=lambda item: datetime.strptime(item[0], "%d-%b-%Y")))
+
+
+def write_journal(directory: str, entry_log: dict) -> str:
+    path_json = os.path.join(directory, "learning_data.json")
+    with open(path_json, "w", encoding="utf-8") as file:
+        json.dump({"Entry Log": entry_log, "All Time Subjects": {}, "Statistics": {}}, file, indent=4, ensure_ascii=False)
+    return path_json
+
+
+def open_journal(directory: str, entry_log: dict) -> tuple:
+    """(DataManager, StatsManager) over a new learning_data.json holding `entry_log`, with its stats worked out."""
+    path_json = write_journal(directory, entry_log)
+    data_manager = DataManager(path_json, os.path.join(directory, "Journal.md"))
+    stats_manager = StatsManager(data_manager)
+    stats_manager.aggregator.calculate_all_time_stats()
+    stats_manager.cache_builder.build_subjects_cache()
+    return data_manager, stats_manager
+
+
+def plain(entry_log) -> dict:
+    """A (possibly lazily loaded) Entry Log as a plain dict of days."""
+    return {day: entry_log[day] for day in entry_log}
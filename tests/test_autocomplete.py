@@ -0,0 +1,94 @@
+import io, tempfile, unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest import mock
+from core.autocomplete import PrefixTrie, NameAutocomplete
+from core.core_services import DateManager
+from core.entries import OtherEntry
+from cli.cli_workflow import CliWorkflow
+from journal_samples import open_journal, session
+
+
+def days_ago(days: int) -> str:
+    return date.fromordinal(DateManager.date_to_ordinal(DateManager.get_date_today()) - days).strftime("%d-%b-%Y")
+
+
+class PrefixTrieTest(unittest.TestCase):
+    def test_finds_names_by_the_start_of_any_word(self):
+        trie = PrefixTrie()
+        for name in ("Riyad us-Saliheen", "Bulugh al-Maram", "Sahih al-Bukhari", "Salah Guide", "Madinah Book 10"):
+            trie.add(name)
+        self.assertEqual(trie.find("sal"), {"Riyad us-Saliheen", "Salah Guide"})
+        self.assertEqual(trie.find("AL"), {"Bulugh al-Maram", "Sahih al-Bukhari"})
+        self.assertEqual(trie.find("book 1"), {"Madinah Book 10"})
+        self.assertEqual(trie.find("10"), {"Madinah Book 10"})
+        self.assertEqual(trie.find("aram"), set())  # Not the start of a word
+        self.assertEqual(trie.find(""), trie.names)
+
+
+class NameAutocompleteTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        entry_log = {}
+
+        def add(days: int, subject: str, book: str, number: int) -> None:
+            entry_log.setdefault(days_ago(days), {}).setdefault(subject, {}).setdefault(book, {})[f"Entry {number}"] = session(book, 10, 1)
+
+        for number in range(40):  # Read a lot, but long ago
+            add(200 + number, "Hadith", "Sahih al-Bukhari", number)
+        for number in range(5):  # Read a little, lately
+            add(1 + number, "Hadith", "Riyad us-Saliheen", 100 + number)
+        for number in range(3):
+            add(2 + number, "Fiqh", "Qudoori", 200 + number)
+        add(1, "Al-Qur'an (Tilawat)", "Para no. 1", 300)
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, entry_log)
+        self.autocomplete = NameAutocomplete(self.data_manager)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_ranks_by_entries_and_how_lately_they_were_read(self):
+        self.assertEqual(self.autocomplete.subjects(), ["Hadith", "Fiqh"])  # The Qur'an subjects are left out
+        self.assertEqual(self.autocomplete.books("Hadith"), ["Riyad us-Saliheen", "Sahih al-Bukhari"])
+        self.assertEqual(self.autocomplete.books("Hadith", "bu"), ["Sahih al-Bukhari"])
+        self.assertEqual(self.autocomplete.books("Hadith", limit=1), ["Riyad us-Saliheen"])
+        self.assertEqual(self.autocomplete.books("Nothing"), [])
+
+    def test_existing_ignores_case(self):
+        self.assertEqual(self.autocomplete.existing("hadith"), "Hadith")
+        self.assertEqual(self.autocomplete.existing(" QUDOORI ", "Fiqh"), "Qudoori")
+        self.assertIsNone(self.autocomplete.existing("Qudoori", "Hadith"))
+        self.assertIsNone(self.autocomplete.existing("Tarikh"))
+
+    def test_follows_new_entries_moves_and_delete_all(self):
+        self.autocomplete.subjects()
+        entry = OtherEntry("Tarikh", "Al-Bidayah", "1", 2, "5 min(s)", "x", "N/A", "No", "1", "N/A")
+        self.stats_manager.on_entry_added(entry)
+        self.data_manager.add_entry(entry)
+        self.assertIn("Tarikh", self.autocomplete.subjects())
+        self.assertEqual(self.autocomplete.books("Tarikh", "bid"), ["Al-Bidayah"])
+
+        moved, msg = self.stats_manager.change_subject("Qudoori", "Fiqh", "Hanafi Fiqh")
+        self.assertTrue(moved, msg)
+        self.assertEqual(self.autocomplete.books("Fiqh"), [])
+        self.assertEqual(self.autocomplete.books("Hanafi Fiqh", "q"), ["Qudoori"])
+        self.assertEqual(self.autocomplete.subjects("f"), ["Hanafi Fiqh"])  # "Fiqh" lost its only book
+
+        self.data_manager.delete_data(delete_all_progress=True)  # All Time Subjects is kept, without any entries to rank by
+        self.assertEqual(self.autocomplete.subjects(), sorted(self.data_manager.all_time_subjects))
+
+    def test_cli_type_ahead(self):
+        def choose(answers: list, choice):
+            with mock.patch("builtins.input", side_effect=answers), redirect_stdout(io.StringIO()):
+                return choice()
+
+        self.assertEqual(choose(["hadith"], lambda: CliWorkflow.choose_subject(self.autocomplete)), "Hadith")
+        self.assertEqual(choose(["Tarikh"], lambda: CliWorkflow.choose_subject(self.autocomplete)), "Tarikh")
+        self.assertEqual(choose(["", "1"], lambda: CliWorkflow.choose_subject(self.autocomplete)), "Hadith")
+        self.assertEqual(choose(["", "3", "Fiqh"], lambda: CliWorkflow.choose_subject(self.autocomplete)), "Fiqh")
+        self.assertEqual(choose(["sa", "2"], lambda: CliWorkflow.choose_book("Hadith", self.autocomplete)), "Sahih al-Bukhari")
+        self.assertEqual(choose(["sa", "3"], lambda: CliWorkflow.choose_book("Hadith", self.autocomplete)), "sa")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os, time, tempfile, threading, unittest
+from unittest import mock
+from core.autosave import AutosaveWorker
+from core.data_manager import DataManager
+from journal_samples import random_log, open_journal, plain, session
+
+
+class AutosaveWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=6, sessions=60))
+        self.data_manager.save_data_to_files()
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.stop()
+        self.temp_dir.cleanup()
+
+    def start(self, delay: float) -> AutosaveWorker:
+        worker = AutosaveWorker(self.data_manager, delay)
+        self.workers.append(worker)
+        worker.start()
+        return worker
+
+    def change(self, date: str, minutes: int = 10) -> None:
+        self.data_manager.update_entry_log(date, {"Fiqh": {"Qudoori": {"Entry 1": session("Qudoori", minutes, 1)}}})
+
+    def wait_until_saved(self, worker: AutosaveWorker) -> None:
+        give_up = time.monotonic() + 10
+        while worker.has_pending():
+            self.assertLess(time.monotonic(), give_up, "The worker never wrote the changes")
+            time.sleep(0.01)
+
+    def reopened(self) -> dict:
+        return plain(DataManager(os.path.join(self.temp_dir.name, "learning_data.json"), self.data_manager.path_md).entry_log)
+
+    def test_changes_in_a_burst_are_written_once(self):
+        worker = self.start(delay=0.2)
+        with mock.patch.object(self.data_manager, "take_snapshot", wraps=self.data_manager.take_snapshot) as take_snapshot, \
+                mock.patch.object(self.data_manager, "write_snapshot", wraps=self.data_manager.write_snapshot) as write_snapshot:
+            for day in range(1, 6):
+                self.change(f"0{day}-Jan-2027", day)
+            self.assertEqual(take_snapshot.call_count, 0)  # Nothing is copied on the thread making the changes
+            self.wait_until_saved(worker)
+        self.assertEqual(take_snapshot.call_count, 1)
+        self.assertEqual(write_snapshot.call_count, 1)
+        saved = self.reopened()
+        for day in range(1, 6):
+            self.assertEqual(saved[f"0{day}-Jan-2027"]["Fiqh"]["Qudoori"]["Entry 1"]["Time Spent"], f"{day} min(s)")
+
+    def test_failed_write_is_retried_with_newer_changes(self):
+        worker = self.start(delay=0.05)
+        worker.RETRY_DELAY = 0.2
+        written = []
+        failed = threading.Event()
+        write_snapshot = self.data_manager.write_snapshot
+
+        def fail_once(snapshot):
+            if not failed.is_set():
+                failed.set()
+                return 1
+            written.append(set(snapshot.md_dirty_dates))
+            return write_snapshot(snapshot)
+
+        with mock.patch.object(self.data_manager, "write_snapshot", side_effect=fail_once):
+            self.change("01-Jan-2027")
+            self.assertTrue(failed.wait(10))
+            while worker.queued is None:
+                time.sleep(0.01)
+            self.change("02-Jan-2027")
+            self.wait_until_saved(worker)
+        self.assertEqual(written, [{"01-Jan-2027", "02-Jan-2027"}])
+        saved = self.reopened()
+        self.assertIn("01-Jan-2027", saved)
+        self.assertIn("02-Jan-2027", saved)
+
+    def test_stop_writes_what_is_left(self):
+        worker = self.start(delay=60)
+        self.change("01-Jan-2027")
+        self.assertTrue(worker.has_pending())
+        self.assertEqual(worker.stop(), 0)
+        self.assertIsNone(self.data_manager.on_change)
+        self.assertFalse(worker.has_pending())
+        self.assertIn("01-Jan-2027", self.reopened())
@@ -0,0 +1,99 @@
+import os, tempfile, unittest
+from copy import deepcopy
+from unittest import mock
+from core.backup_repository import BackupRepository
+from core.core_services import DateManager
+from core.restore import RestoreService
+from journal_samples import random_log, open_journal, plain, session
+
+
+class BackupRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = BackupRepository(os.path.join(self.temp_dir.name, "backups"))
+        self.file_dict = {"Entry Log": random_log(seed=8), "All Time Subjects": {"Fiqh": ["Qudoori"]}, "Statistics": {}}
+        self.months = {DateManager.date_to_month(date) for date in self.file_dict["Entry Log"]}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def chunk_files(self) -> set:
+        return {name for _, _, names in os.walk(self.repo.dir_chunks) for name in names}
+
+    def backup(self, timestamp: str) -> str:
+        with mock.patch.object(DateManager, "get_timestamp", return_value=timestamp):
+            backed_up, msg = self.repo.backup(self.file_dict)
+        self.assertTrue(backed_up, msg)
+        return msg
+
+    def test_unchanged_months_are_stored_once(self):
+        self.assertIn(f"{len(self.months) + 1} of {len(self.months) + 1} chunk(s)", self.backup("01-01-2026_10-00-00"))
+        first_chunks = self.chunk_files()
+        self.assertIn("0 of", self.backup("01-01-2026_11-00-00"))
+        self.assertEqual(self.chunk_files(), first_chunks)
+
+        date = next(date for date in self.file_dict["Entry Log"] if date.endswith("Dec-2025"))
+        old_day = self.file_dict["Entry Log"][date]
+        self.file_dict["Entry Log"][date] = dict(old_day, Seerah={"Zad al-Maad": {"Entry 900001": session("Zad al-Maad", 10, 1)}})
+        self.assertIn("1 of", self.backup("01-01-2026_12-00-00"))
+        self.assertEqual(len(self.chunk_files() - first_chunks), 1)
+        self.assertEqual([snapshot["Name"] for snapshot in self.repo.list_snapshots()], [
+            "learning_backup_01-01-2026_12-00-00", "learning_backup_01-01-2026_11-00-00", "learning_backup_01-01-2026_10-00-00"])
+        self.assertEqual(self.repo.load_snapshot(), self.file_dict)
+        self.assertEqual(self.repo.load_snapshot("learning_backup_01-01-2026_11-00-00")["Entry Log"][date], old_day)
+
+    def test_second_backup_in_the_same_second_gets_a_suffix(self):
+        self.backup("01-01-2026_10-00-00")
+        self.file_dict["Statistics"] = {"changed": True}
+        self.backup("01-01-2026_10-00-00")
+        names = [snapshot["Name"] for snapshot in self.repo.list_snapshots()]
+        self.assertEqual(names, ["learning_backup_01-01-2026_10-00-00_2", "learning_backup_01-01-2026_10-00-00"])
+        self.assertEqual(self.repo.load_snapshot(names[0])["Statistics"], {"changed": True})
+        self.assertEqual(self.repo.load_snapshot(names[1])["Statistics"], {})
+
+    def test_damaged_chunks_are_refused(self):
+        self.backup("01-01-2026_10-00-00")
+        digest, _ = self.repo.put_chunk({"Fiqh": ["Qudoori"]})
+        path = self.repo.chunk_path(digest)
+        with open(path, "rb") as file:
+            data = file.read()
+        for damaged in (data[:-3], data[:-1] + bytes([data[-1] ^ 1]), b"not zlib"):
+            with self.subTest(damaged=damaged[-4:]):
+                with open(path, "wb") as file:
+                    file.write(damaged)
+                with self.assertRaises(ValueError):
+                    self.repo.get_chunk(digest)
+
+    def test_list_skips_damaged_snapshot_files(self):
+        self.backup("01-01-2026_10-00-00")
+        for name, content in (("torn.json", '{"Version": 1, "Created": "01-01-20'), ("other.json", '{"Version": 1}'),
+                              ("bad_date.json", '{"Created": "yesterday"}'), ("notes.txt", "not a snapshot")):
+            with open(os.path.join(self.repo.dir_snapshots, name), "w", encoding="utf-8") as file:
+                file.write(content)
+        self.assertEqual([snapshot["Name"] for snapshot in self.repo.list_snapshots()], ["learning_backup_01-01-2026_10-00-00"])
+        self.assertEqual(BackupRepository(os.path.join(self.temp_dir.name, "nothing")).list_snapshots(), [])
+
+
+class RestoreSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=9, sessions=200))
+        self.repo_dir = os.path.join(self.temp_dir.name, "backups")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_restores_the_chosen_snapshot(self):
+        backed_up = deepcopy(plain(self.data_manager.entry_log))
+        with mock.patch.object(DateManager, "get_timestamp", return_value="01-01-2026_10-00-00"):
+            self.assertTrue(self.data_manager.backup_incremental(self.repo_dir)[0])
+        self.data_manager.delete_data(delete_all_progress=True)
+        service = RestoreService(self.data_manager, self.stats_manager)
+        restored, msg = service.restore(self.repo_dir)
+        self.assertTrue(restored, msg)
+        self.assertEqual(plain(self.data_manager.entry_log), backed_up)
+        self.assertFalse(service.restore(self.repo_dir, "learning_backup_missing")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
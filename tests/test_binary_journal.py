@@ -0,0 +1,86 @@
+import os, json, tempfile, unittest
+from core.binary_journal import StringTable, DayCodec, BinaryJournal, BinaryDaySource
+from core.exceptions import DataCorruptionError
+from journal_samples import random_log, session
+
+
+class DayCodecTest(unittest.TestCase):
+    @staticmethod
+    def encoded(day: dict) -> tuple:
+        """The day's record, and a codec over a fresh copy of the string table it filled."""
+        table = StringTable()
+        return DayCodec(table).encode(day), DayCodec(StringTable(list(table.strings)))
+
+    def test_odd_values_come_back_unchanged(self):
+        details = dict(session("Qudoori", 75, 2.5, "مراجعة ṣabr"), **{
+            "Time Spent": "1 hr(s) 15 min(s)", "Total Ruku": 0, "Revision": None,
+            "Page": -3, "Extra": {"nested": [1, "two", False]}, "Flag": True})
+        day = {
+            "Fiqh": {"Qudoori": {"Entry 09:15:02 PM": details, "Entry 12:00:00 AM": session("Qudoori", 0, 1)}},
+            "Hadith": {"Riyad": {
+                "Entry 13:00:00 PM": session("Riyad", 60, 0),  # Not a real time: kept as a string
+                "Entry 1": dict(session("Riyad", 5, 1), **{"Time Spent": "5 mins"}),
+                "Entry 2": dict(session("Riyad", 5, 1), **{"Time Spent": "60 min(s)"}),  # Not how format_time() writes it
+            }},
+        }
+        data, codec = self.encoded(day)
+        decoded = codec.decode(data)
+        self.assertEqual(decoded, day)
+        self.assertEqual(json.dumps(decoded), json.dumps(day))  # Same key order and value types
+
+    def test_session_names_and_minutes(self):
+        for name in ("Entry 12:00:00 AM", "Entry 12:59:59 PM", "Entry 01:00:00 PM", "Entry 11:30:05 AM"):
+            self.assertEqual(DayCodec.session_name(DayCodec.session_seconds(name)), name)
+        self.assertIsNone(DayCodec.session_seconds("Entry 00:10:00 AM"))
+        self.assertEqual(DayCodec.time_minutes("2 hr(s) 5 min(s)"), 125)
+        self.assertIsNone(DayCodec.time_minutes("125 min(s)"))
+        self.assertIsNone(DayCodec.time_minutes(125))
+
+
+class BinaryJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sections = {"Entry Log": random_log(seed=8, sessions=400), "All Time Subjects": {"Fiqh": ["Qudoori"]},
+                         "Statistics": {"Fiqh": {"Qudoori": {"Pages": 3.5}}}}
+        self.sections["Entry Log"]["not a date"] = {"Fiqh": {"Qudoori": {"Entry 1": session("Qudoori", 1, 1)}}}
+        self.path_bin = os.path.join(self.temp_dir.name, "learning_data.mljb")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, data: bytes) -> None:
+        with open(self.path_bin, "wb") as file:
+            file.write(data)
+
+    def test_loads_gives_back_what_json_would(self):
+        data = BinaryJournal.dumps(self.sections)
+        self.assertEqual(BinaryJournal.loads(data), self.sections)
+        self.assertLess(len(data), len(json.dumps(self.sections, ensure_ascii=False).encode("utf-8")) / 3)
+
+    def test_day_source_reads_single_days(self):
+        self.write(BinaryJournal.dumps(self.sections))
+        source = BinaryDaySource(self.path_bin)
+        entry_log = self.sections["Entry Log"]
+        self.assertEqual(source.load_dates(), list(entry_log))
+        self.assertEqual(source.load_section("Statistics"), self.sections["Statistics"])
+        for date in list(entry_log)[::17] + ["not a date"]:
+            self.assertEqual(source.load_day(date), entry_log[date])
+
+    def test_raw_days_are_reused_with_their_table(self):
+        self.write(BinaryJournal.dumps(self.sections))
+        source = BinaryDaySource(self.path_bin)
+        data = BinaryJournal.dumps(self.sections, source.raw_day, source.table.copy())
+        self.assertEqual(BinaryJournal.loads(data), self.sections)
+
+    def test_broken_or_newer_files_are_rejected(self):
+        data = BinaryJournal.dumps(self.sections)
+        newer = data[:4] + (BinaryJournal.VERSION + 1).to_bytes(2, "little") + data[6:]
+        for content in (b"JSON", b"XXXX" + data[4:], newer, data[:40]):
+            with self.subTest(content=content[:8]):
+                self.write(content)
+                with self.assertRaises(DataCorruptionError):
+                    BinaryDaySource(self.path_bin)
+
+
+if __name__ == "__main__":
+    unittest.main()
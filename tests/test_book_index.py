@@ -0,0 +1,104 @@
+import random, tempfile, unittest
+from copy import deepcopy
+from unittest import mock
+from core.book_index import BookIndex
+from core.core_services import DateManager
+from journal_samples import SUBJECTS, random_log, open_journal, plain, session
+
+
+class BookIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=22, sessions=400))
+        self.index = self.data_manager.book_index
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def walked_history(self, subject: str, book: str) -> list:
+        dates = sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal)
+        return [(date, name, details) for date in dates
+                for name, details in self.data_manager.entry_log[date].get(subject, {}).get(book, {}).items()]
+
+    def walked_days(self, subject: str, book: str) -> list:
+        return [(date, day[subject][book]) for date, day in self.data_manager.entry_log.items() if book in day.get(subject, {})]
+
+    def check_every_book(self) -> None:
+        for subject, books in SUBJECTS.items():
+            for book in books + ["Zad al-Maad"]:
+                with self.subTest(subject=subject, book=book):
+                    history = self.walked_history(subject, book)
+                    self.assertEqual(self.index.history(subject, book), history)
+                    self.assertEqual(self.index.dates_of(subject, book), list(dict.fromkeys(date for date, _, _ in history)))
+
+    def test_history_follows_changes(self):
+        self.check_every_book()
+        rng = random.Random(22)
+        dates = sorted(self.data_manager.entry_log)
+        for date in rng.sample(dates, 10):
+            self.data_manager.delete_data(date)
+        for date in rng.sample(sorted(self.data_manager.entry_log), 10):
+            day = {subject: dict(books) for subject, books in self.data_manager.entry_log[date].items()}
+            day.setdefault("Fiqh", {})["Zad al-Maad"] = {"Entry 900001": session("Zad al-Maad", 5, 1)}
+            day.pop(next(iter(day)))
+            self.data_manager.update_entry_log(date, day)
+        self.check_every_book()
+        fresh = BookIndex(self.data_manager.entry_log)
+        fresh.build()
+        self.assertEqual(fresh.books, self.index.books)
+
+    def test_delete_all_and_restore(self):
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.assertEqual(self.index.history("Fiqh", "Qudoori"), [])
+        self.data_manager.replace_data({"Entry Log": {"05-May-2026": {"Fiqh": {"Qudoori": {"Entry 1": session("Qudoori", 10, 1)}}}}})
+        self.assertEqual(self.data_manager.book_index.dates_of("Fiqh", "Qudoori"), ["05-May-2026"])
+
+    def test_change_subject_moves_days_and_stats(self):
+        moved = self.walked_history("Arabic", "Nahw Meer")
+        self.assertTrue(self.stats_manager.updater.change_subject("Nahw Meer", "Arabic", "Nahw")[0])
+        self.assertEqual(self.walked_history("Arabic", "Nahw Meer"), [])
+        self.assertEqual(self.index.history("Nahw", "Nahw Meer"), moved)
+        self.assertNotIn("Nahw Meer", self.data_manager.stats["Arabic"])
+        _, walked = self.stats_manager.rebuild_from_days(self.data_manager.entry_log.items())
+        self.assertEqual(self.data_manager.stats, walked)
+        self.assertFalse(self.stats_manager.updater.change_subject("Nahw Meer", "Arabic", "Nahw")[0])
+        self.assertIn("already under", self.stats_manager.updater.change_subject("Nahw Meer", "Nahw", "Nahw")[1])
+
+    def add_to_hadith(self, date: str, name: str) -> None:
+        day = deepcopy(self.data_manager.entry_log[date])
+        day.setdefault("Hadith", {}).setdefault("Qudoori", {})[name] = session("Qudoori", 7, 1)
+        self.data_manager.update_entry_log(date, day)
+
+    def test_change_subject_into_a_subject_that_has_the_book(self):
+        qudoori_dates = self.index.dates_of("Fiqh", "Qudoori")
+        others = [date for date in self.data_manager.entry_log if date not in qudoori_dates]
+        for date in qudoori_dates[:3] + others[:3]:
+            self.add_to_hadith(date, "Entry 900001")
+        self.stats_manager.aggregator.calculate_all_time_stats()
+        self.stats_manager.cache_builder.build_subjects_cache()
+        self.data_manager.on_change = mock.Mock()
+        self.assertTrue(self.stats_manager.change_subject("Qudoori", "Fiqh", "Hadith")[0])
+        self.data_manager.on_change.assert_called_once_with()  # Once, after the stats and the cache have moved
+        subjects, walked = self.stats_manager.rebuild_from_days(self.data_manager.entry_log.items())
+        self.assertEqual(self.data_manager.stats, walked)
+        self.assertEqual(self.data_manager.all_time_subjects, subjects)
+        record = self.data_manager.stats["Hadith"]["Qudoori"]
+        self.assertEqual(record.total_entries, sum(len(sessions) for _, sessions in self.walked_days("Hadith", "Qudoori")))
+
+    def test_change_subject_refuses_sessions_that_would_collide(self):
+        date = self.index.dates_of("Fiqh", "Qudoori")[2]
+        self.add_to_hadith(date, next(iter(self.data_manager.entry_log[date]["Fiqh"]["Qudoori"])))
+        entry_log, stats = deepcopy(plain(self.data_manager.entry_log)), deepcopy(self.data_manager.stats)
+        pending = len(self.data_manager.storage.pending)
+        self.data_manager.on_change = mock.Mock()
+        moved, msg = self.stats_manager.change_subject("Qudoori", "Fiqh", "Hadith")
+        self.assertFalse(moved)
+        self.assertIn(date, msg)
+        self.assertEqual(plain(self.data_manager.entry_log), entry_log)
+        self.assertEqual(self.data_manager.stats, stats)
+        self.assertEqual(len(self.data_manager.storage.pending), pending)
+        self.data_manager.on_change.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
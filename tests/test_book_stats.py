@@ -0,0 +1,61 @@
+import tempfile, unittest
+from core.book_stats import BookStats, EntryDates
+from core.entries import OtherEntry
+from journal_samples import random_log, open_journal, session
+
+
+class BookStatsTest(unittest.TestCase):
+    STORED = {
+        "Fiqh": {"Qudoori": {"Pages": 12.5, "Time Spent": "2 hr(s) 5 min(s)", "Total Entries": 3,
+                             "Entry Dates": ["01-Jan-2026", "03-Jan-2026"]}},
+        "Hadith": {"Riyad us-Saliheen": {"Pages": 0, "Time Spent": "0 min(s)", "Total Entries": 0, "Entry Dates": []}},
+    }
+
+    def test_stored_section_comes_back_the_same(self):
+        stats = BookStats.parse_stats(self.STORED)
+        self.assertEqual(stats["Fiqh"]["Qudoori"], BookStats(12.5, 125, 3, EntryDates.from_list(["01-Jan-2026", "03-Jan-2026"])))
+        self.assertEqual(BookStats.format_stats(stats), self.STORED)
+        self.assertIs(BookStats.parse_stats(stats)["Fiqh"]["Qudoori"], stats["Fiqh"]["Qudoori"])
+        self.assertEqual(BookStats.from_dict({}), BookStats())
+
+    def test_records_keep_whole_minutes_through_changes(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        data_manager, stats_manager = open_journal(temp_dir.name, random_log(seed=12, sessions=50))
+        for time_spent in ("45 min(s)", "1 hr(s) 20 min(s)", "15 min(s)"):
+            entry = OtherEntry("Seerah", "Zad al-Maad", "1", 2.5, time_spent, "N/A", "N/A", "No", "1", "N/A")
+            stats_manager.on_entry_added(entry)
+            data_manager.add_entry(entry)
+        record = data_manager.stats["Seerah"]["Zad al-Maad"]
+        self.assertEqual((record.minutes, record.pages, record.total_entries), (140, 7.5, 3))
+        self.assertEqual(record.entry_dates.to_list(), [data_manager.date_today])
+        self.assertEqual(record.entry_dates.count(data_manager.date_today), 3)
+        self.assertEqual(list(data_manager.stats), sorted(data_manager.stats))  # The new subject is in sorted place
+
+        stats_manager.updater.update_stats(("Seerah", "Zad al-Maad"), ("15 min(s)", "2 hr(s) 0 min(s)"), "Time Spent")
+        self.assertEqual(record.minutes, 245)
+        self.assertEqual(data_manager.file_dict["Statistics"]["Seerah"]["Zad al-Maad"]["Time Spent"], "4 hr(s) 5 min(s)")
+        self.assertIsInstance(data_manager.take_snapshot().stats["Seerah"]["Zad al-Maad"], dict)  # Written out as text
+
+    def test_a_date_stays_until_its_last_session_goes(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        day = {"Fiqh": {"Qudoori": {"Entry 1": session("Qudoori", 10, 1), "Entry 2": session("Qudoori", 20, 2)}}}
+        data_manager, stats_manager = open_journal(temp_dir.name, {"05-Jan-2026": day, "06-Jan-2026": day})
+        updater = stats_manager.updater
+        for read_back in (False, True):
+            with self.subTest(read_back=read_back):
+                if read_back:  # Counts not known until a change touches the day
+                    data_manager.update_stats(BookStats.parse_stats(BookStats.format_stats(data_manager.stats)))
+                    self.assertIsNone(data_manager.stats["Fiqh"]["Qudoori"].entry_dates.count("06-Jan-2026"))
+                date = "06-Jan-2026" if read_back else "05-Jan-2026"
+                for name in ("Entry 1", "Entry 2"):
+                    updater.update_stats(("Fiqh", "Qudoori", name), (1, "10 min(s)"), date=date)  # Before the day changes, as the editors do
+                    sessions = {key: value for key, value in data_manager.entry_log[date]["Fiqh"]["Qudoori"].items() if key != name}
+                    data_manager.update_entry_log(date, {"Fiqh": {"Qudoori": sessions}} if sessions else {})
+                    self.assertEqual(date in data_manager.stats["Fiqh"]["Qudoori"].entry_dates, bool(sessions))
+        self.assertEqual(len(data_manager.stats["Fiqh"]["Qudoori"].entry_dates), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
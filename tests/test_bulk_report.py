@@ -0,0 +1,86 @@
+import io, os, csv, json, glob, tempfile, unittest
+from core.bulk_report import JournalDays, BulkReport, ReportWriter
+from journal_samples import random_log, open_journal, plain, session
+
+
+class JournalDaysTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, _ = open_journal(self.temp_dir.name, random_log(seed=20, sessions=150))
+        self.path_json = self.data_manager.storage.path_json
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pending_changes_are_laid_over_the_file(self):
+        dates = list(self.data_manager.entry_log)
+        self.data_manager.update_entry_log(dates[2], {"Fiqh": {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}})
+        self.data_manager.update_entry_log("01-Jan-2030", {"Seerah": {"Zad al-Maad": {"Entry 900002": session("Zad al-Maad", 5, 1)}}})
+        self.data_manager.delete_data(dates[3])
+        self.assertEqual(self.data_manager.save_data_to_files(), 0)
+        self.assertEqual(dict(JournalDays(self.path_json)), plain(self.data_manager.entry_log))
+
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.data_manager.update_entry_log(dates[5], {"Fiqh": {"Qudoori": {"Entry 900003": session("Qudoori", 10, 1)}}})
+        self.assertEqual(self.data_manager.save_data_to_files(), 0)
+        op_log = self.data_manager.storage.op_log
+        with open(op_log.path_log, "ab") as file:
+            file.write(b'{"op": "add", "da')  # Torn last line: skipped, and the file is left as it is
+        size = op_log.size()
+        self.assertEqual(list(JournalDays(self.path_json)), [(dates[5], self.data_manager.entry_log[dates[5]])])
+        self.assertEqual(op_log.size(), size)
+
+    def test_reads_backup_zips(self):
+        self.assertTrue(self.data_manager.backup_data(self.temp_dir.name)[0])
+        path_zip, = glob.glob(os.path.join(self.temp_dir.name, "learning_backup_*.zip"))
+        self.assertEqual(dict(JournalDays(path_zip)), plain(self.data_manager.entry_log))
+
+
+class BulkReportTest(unittest.TestCase):
+    DAYS = {
+        "30-Jan-2026": {"Fiqh": {"Qudoori": {"Entry 1": session("Qudoori", 30, 2.5)}}},
+        "02-Feb-2026": {"Fiqh": {"Qudoori": {"Entry 2": session("Qudoori", 15, 0.25), "Entry 3": session("Qudoori", 20, 0.05)}},
+                        "Hadith": {"Riyad us-Saliheen": {"Entry 4": session("Riyad us-Saliheen", 10, 1)}, "Empty": {}}},
+        "03-Mar-2026": {"Hadith": {"Riyad us-Saliheen": {"Entry 5": session("Riyad us-Saliheen", 5, 1)}}},
+    }
+
+    def report(self, start: str = None, end: str = None) -> tuple:
+        report = BulkReport(start, end)
+        days = [row for row in (report.add_day(date, day) for date, day in self.DAYS.items()) if row is not None]
+        return days, list(report.month_rows()), list(report.book_rows())
+
+    def test_rows_at_every_level(self):
+        days, months, books = self.report()
+        self.assertEqual(days[1], {"Date": "02-Feb-2026", "Entries": 3, "Minutes": 45, "Pages": 1.3, "Books": 2})
+        self.assertEqual([(row["Month"], row["Entries"], row["Active Days"]) for row in months],
+                         [("2026-01", 1, 1), ("2026-02", 3, 1), ("2026-03", 1, 1)])
+        self.assertEqual(books[0], {"Subject": "Fiqh", "Book": "Qudoori", "Entries": 3, "Minutes": 65, "Pages": 2.8,
+                                    "Active Days": 2, "First Date": "30-Jan-2026", "Last Date": "02-Feb-2026"})
+        self.assertEqual([row["Book"] for row in books], ["Qudoori", "Riyad us-Saliheen"])  # No row for a book without sessions
+
+    def test_date_range(self):
+        days, months, books = self.report("01-Feb-2026", "28-Feb-2026")
+        self.assertEqual([row["Date"] for row in days], ["02-Feb-2026"])
+        self.assertEqual([row["Month"] for row in months], ["2026-02"])
+        self.assertEqual(books[1]["First Date"], books[1]["Last Date"])
+
+    def test_books_in_natural_order(self):
+        report = BulkReport()
+        report.add_day("01-Jan-2026", {"Al-Qur'an (Tilawat)": {
+            name: {"Entry 1": session(name, 5, 1)} for name in ("Para no. 10", "Para no. 2", "Para no. 1")}})
+        self.assertEqual([row["Book"] for row in report.book_rows()], ["Para no. 1", "Para no. 2", "Para no. 10"])
+
+    def test_writers(self):
+        days, _, _ = self.report()
+        stream = io.StringIO()
+        writer = ReportWriter(stream, "csv", "day")
+        for row in days:
+            writer.write(row)
+        self.assertEqual(list(csv.DictReader(io.StringIO(stream.getvalue())))[0]["Minutes"], "30")
+        stream = io.StringIO()
+        ReportWriter(stream, "jsonl", "day", tag_level=True).write(days[0])
+        self.assertEqual(json.loads(stream.getvalue()), dict(Level="day", **days[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
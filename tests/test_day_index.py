@@ -0,0 +1,63 @@
+import random, tempfile, unittest
+from core.core_services import DateManager
+from core.day_index import DayIndex
+from journal_samples import random_log, open_journal, session
+
+
+class DayIndexTest(unittest.TestCase):
+    """Ranges, neighbours and order from the index are those of the sorted Entry Log keys."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, _ = open_journal(self.temp_dir.name, random_log(seed=23, sessions=400))
+        self.index = self.data_manager.day_index
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def sorted_dates(self) -> list:
+        return sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal)
+
+    def check(self, rng: random.Random) -> None:
+        dates = self.sorted_dates()
+        ordinals = [DateManager.date_to_ordinal(date) for date in dates]
+        self.assertEqual(self.index.chronological(), dates)
+        self.assertEqual(len(self.index), len(dates))
+        self.assertEqual((self.index.first(), self.index.last()), (dates[0], dates[-1]) if dates else (None, None))
+        low, high = (ordinals[0] - 5, ordinals[-1] + 5) if ordinals else (700000, 700100)
+        for _ in range(50):
+            first, last = sorted(rng.randint(low, high) for _ in range(2))
+            self.assertEqual(self.index.between(first, last), [date for date in dates if first <= DateManager.date_to_ordinal(date) <= last])
+            date = DateManager.ordinal_to_date(first)
+            self.assertEqual(self.index.previous(date), next((day for day in reversed(dates) if DateManager.date_to_ordinal(day) < first), None))
+            self.assertEqual(self.index.next(date), next((day for day in dates if DateManager.date_to_ordinal(day) > first), None))
+        self.assertEqual(self.index.ordinals_between(), ordinals)
+
+    def test_matches_the_sorted_log(self):
+        self.check(random.Random(1))
+
+    def test_follows_days_gaining_and_losing_entries(self):
+        self.check(random.Random(2))
+        rng = random.Random(3)
+        for date in rng.sample(sorted(self.data_manager.entry_log), 30):
+            self.data_manager.delete_data(date)
+        self.data_manager.update_entry_log(self.sorted_dates()[0], {})  # Edited down to nothing
+        for offset in range(0, 400, 37):
+            date = DateManager.ordinal_to_date(DateManager.date_to_ordinal("01-Oct-2025") + offset)
+            self.data_manager.update_entry_log(date, {"Fiqh": {"Qudoori": {"Entry 999999": session("Qudoori", 5, 1)}}})
+        self.check(rng)
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.check(rng)
+
+    def test_empty_and_unbuilt(self):
+        index = DayIndex({})
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.first())
+        self.assertIsNone(index.previous("01-Jan-2026"))
+        unbuilt = DayIndex({"02-Jan-2026": {}})
+        unbuilt.sync("03-Jan-2026")  # Ignored until it is built; the build reads the log itself
+        self.assertEqual(unbuilt.chronological(), ["02-Jan-2026"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import random, tempfile, unittest
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from core.core_services import DateManager, CoreHelpers
+from journal_samples import SUBJECTS, random_log, open_journal, session
+
+
+class DayRollupTest(unittest.TestCase):
+    """Range totals from the prefix sums equal the sums of the days themselves, and stay so through changes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=13, sessions=800))
+        self.rollup = self.stats_manager.day_rollup
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def brute_force(self, start: str, end: str, subject: str = None, book: str = None) -> tuple:
+        entries = minutes = pages = 0
+        first, last = DateManager.date_to_ordinal(start), DateManager.date_to_ordinal(end)
+        for date, progress_date in self.data_manager.entry_log.items():
+            if not first <= DateManager.date_to_ordinal(date) <= last:
+                continue
+            for day_subject, books in progress_date.items():
+                for day_book, sessions in books.items():
+                    if subject is not None and day_subject != subject or book is not None and day_book != book:
+                        continue
+                    for details in sessions.values():
+                        entries += 1
+                        minutes += CoreHelpers.convert_time_to_mins(details["Time Spent"])
+                        pages += details["Total Pages"]
+        pages = round(pages, 6)
+        return entries, minutes, int(pages) if pages == int(pages) else pages
+
+    def check_random_ranges(self, rng: random.Random, count: int = 60) -> None:
+        dates = sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal) or ["01-Jan-2026"]
+        first, last = DateManager.date_to_ordinal(dates[0]) - 10, DateManager.date_to_ordinal(dates[-1]) + 10
+        for _ in range(count):
+            start, end = sorted(rng.randint(first, last) for _ in range(2))
+            start, end = DateManager.ordinal_to_date(start), DateManager.ordinal_to_date(end)
+            subject = rng.choice([None, *sorted(SUBJECTS)])
+            book = rng.choice([None, *SUBJECTS[subject or "Arabic"]])
+            with self.subTest(start=start, end=end, subject=subject, book=book):
+                self.assertEqual(self.rollup.totals(start, end, subject, book), self.brute_force(start, end, subject, book))
+
+    def test_range_totals(self):
+        self.check_random_ranges(random.Random(1))
+
+    def test_totals_follow_edits_and_deletes(self):
+        rng = random.Random(2)
+        self.rollup.totals("01-Jan-2026", "31-Jan-2026")  # Build first, so the changes go through the listeners
+        dates = sorted(self.data_manager.entry_log)
+        for date in rng.sample(dates, 10):
+            self.data_manager.delete_data(date)
+        for date in rng.sample(sorted(self.data_manager.entry_log), 10):
+            day = dict(self.data_manager.entry_log[date])
+            day.pop(next(iter(day)))
+            day["Arabic"] = {"Madinah Book 2": {"Entry 999999": session("Madinah Book 2", 25, 3.5)}}
+            self.data_manager.update_entry_log(date, day)
+        self.data_manager.update_entry_log("15-Jun-2027", {"Fiqh": {"Qudoori": {"Entry 999998": session("Qudoori", 40, 6)}}})
+        self.check_random_ranges(rng)
+        self.assertEqual(self.rollup.totals("15-Jun-2027", "15-Jun-2027", "Fiqh"), (1, 40, 6))
+
+    def test_delete_all(self):
+        self.rollup.totals("01-Jan-2026", "31-Jan-2026")
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.assertEqual(self.rollup.totals("01-Jan-2000", "31-Dec-2030"), (0, 0, 0))
+        self.assertIsNone(self.rollup.first_day())
+
+    def test_daily_minutes_match_the_days(self):
+        dates = sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal)
+        first = DateManager.date_to_ordinal(dates[0])
+        self.assertEqual(self.rollup.first_day(), first)
+        minutes = self.rollup.daily_minutes(first - 5, first + 40)
+        self.assertEqual(len(minutes), 46)
+        for offset, day_minutes in enumerate(minutes):
+            date = DateManager.ordinal_to_date(first - 5 + offset)
+            self.assertEqual(day_minutes, self.brute_force(date, date)[1])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_heatmap_grid_places_every_day_once(self):
+        grid = self.stats_manager.plotter.heatmap_grid(2026)
+        self.assertEqual(grid.shape, (7, 54))
+        self.assertEqual(int(np.count_nonzero(~np.isnan(grid))), 365)
+        self.assertEqual(grid[3, 0], self.brute_force("01-Jan-2026", "01-Jan-2026")[1])  # A Thursday, in the first week
+        self.assertEqual(np.nansum(grid), self.brute_force("01-Jan-2026", "31-Dec-2026")[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
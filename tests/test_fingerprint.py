@@ -0,0 +1,129 @@
+import os, json, tempfile, unittest
+from copy import deepcopy
+from core.data_manager import DataManager
+from core.fingerprint import EntryLogFingerprint, FingerprintStamp, StatsSnapshot
+from core.operation_log import OperationLog
+from journal_samples import random_log, open_journal, session
+
+
+class EntryLogFingerprintTest(unittest.TestCase):
+    def test_records_move_it_like_a_recount(self):
+        entry_log = deepcopy(random_log(seed=10, sessions=80))
+        fingerprint = EntryLogFingerprint.of_entry_log(entry_log)
+        date = next(iter(entry_log))
+        subject = next(iter(entry_log[date]))
+        book = next(iter(entry_log[date][subject]))
+        name = next(iter(entry_log[date][subject][book]))
+        edited = dict(entry_log[date][subject][book][name], Notes="edited")
+        records = [
+            OperationLog.make_record("edit", date, subject, book, name, edited),
+            OperationLog.make_record("add", date, subject, book, "Entry 900001", session(book, 5, 1)),
+            OperationLog.make_record("add", "01-Jan-2030", "Seerah", "Zad al-Maad", "Entry 900002", session("Zad al-Maad", 9, 2)),
+            OperationLog.make_record("delete", date, subject, book, name),
+            OperationLog.make_record("delete", date, subject, book, "Entry 404"),  # Not there: no change
+            OperationLog.make_record("delete", list(entry_log)[5]),
+            OperationLog.make_record("delete", "01-Jan-1999"),
+            OperationLog.make_record("delete"),
+            OperationLog.make_record("add", "02-Jan-2030", "Fiqh", "Qudoori", "Entry 900003", session("Qudoori", 1, 1)),
+        ]
+        for record in records:
+            with self.subTest(op=record["op"], date=record["date"], session=record["session"]):
+                fingerprint.apply_record(entry_log, record)
+                OperationLog.apply(entry_log, record)
+                self.assertEqual(fingerprint, EntryLogFingerprint.of_entry_log(entry_log))
+        self.assertEqual(fingerprint.count, 1)
+
+    def test_order_of_days_and_months_does_not_matter(self):
+        entry_log = random_log(seed=11, sessions=60)
+        backwards = dict(reversed(list(entry_log.items())))
+        self.assertEqual(EntryLogFingerprint.of_entry_log(entry_log), EntryLogFingerprint.of_entry_log(backwards))
+        halves = EntryLogFingerprint.of_entry_log(dict(list(entry_log.items())[:10]))
+        halves.update(EntryLogFingerprint.of_entry_log(dict(list(entry_log.items())[10:])))
+        self.assertEqual(halves, EntryLogFingerprint.of_entry_log(entry_log))
+        self.assertIsNone(EntryLogFingerprint.from_list([1, True]))
+        self.assertEqual(EntryLogFingerprint.from_list(halves.to_list()), halves)
+
+
+class StampAndSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path_data = os.path.join(self.temp_dir.name, "learning_data.json")
+        with open(self.path_data, "w", encoding="utf-8") as file:
+            file.write("{}")
+        self.fingerprint = EntryLogFingerprint(3, 12345)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stamp_is_dropped_once_the_file_changes(self):
+        stamp = FingerprintStamp(self.path_data)
+        self.assertIsNone(stamp.read())
+        stamp.write(self.fingerprint)
+        self.assertEqual(stamp.read(), self.fingerprint)
+        with open(self.path_data, "w", encoding="utf-8") as file:
+            file.write('{"Entry Log": {}}')
+        self.assertIsNone(stamp.read())
+        stamp.write(self.fingerprint)
+        with open(stamp.path_stamp, "w", encoding="utf-8") as file:
+            file.write('{"Signature": ')
+        self.assertIsNone(stamp.read())
+
+    def test_snapshot_needs_the_same_fingerprint(self):
+        snapshot = StatsSnapshot(os.path.join(self.temp_dir.name, "learning_data.stats.json"))
+        self.assertIsNone(snapshot.load(self.fingerprint))
+        self.assertTrue(snapshot.save(self.fingerprint, {"Fiqh": ["Qudoori"]}, {"Fiqh": {}})[0])
+        self.assertEqual(snapshot.load(self.fingerprint.copy()), ({"Fiqh": ["Qudoori"]}, {"Fiqh": {}}))
+        self.assertIsNone(snapshot.load(EntryLogFingerprint(3, 12346)))
+        self.assertIsNone(snapshot.load(None))
+        self.assertFalse(snapshot.save(None, {}, {})[0])
+        snapshot.discard()
+        self.assertIsNone(snapshot.load(self.fingerprint))
+
+
+class StatsAtStartupTest(unittest.TestCase):
+    """The saved stats are used only for the Entry Log they were worked out from."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=12, sessions=200))
+        self.path_json = self.data_manager.storage.path_json
+        self.assertTrue(self.data_manager.save_stats_snapshot()[0])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def reopen(self) -> DataManager:
+        return DataManager(self.path_json, os.path.join(self.temp_dir.name, "Journal.md"))
+
+    def test_unchanged_journal_uses_the_saved_stats(self):
+        data_manager = self.reopen()
+        self.assertTrue(data_manager.load_stats_snapshot())
+        self.assertEqual(data_manager.stats, self.data_manager.stats)
+        self.assertEqual(data_manager.all_time_subjects, self.data_manager.all_time_subjects)
+
+    def test_hand_edited_file_is_worked_out_again(self):
+        with open(self.path_json, encoding="utf-8") as file:
+            data = json.load(file)
+        day = next(iter(data["Entry Log"].values()))
+        details = next(iter(next(iter(next(iter(day.values())).values())).values()))
+        details["Time Spent"] = "999 min(s)"
+        with open(self.path_json, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+        self.assertFalse(self.reopen().load_stats_snapshot())
+
+    def test_replayed_operation_log_is_part_of_the_fingerprint(self):
+        date = sorted(self.data_manager.entry_log)[0]
+        self.data_manager.update_entry_log(date, {"Fiqh": {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}})
+        self.assertEqual(self.data_manager.save_data_to_files(), 0)
+        self.assertGreater(self.data_manager.storage.op_log.size(), 0)  # Not folded into the data file yet
+        self.assertFalse(self.reopen().load_stats_snapshot())  # Stats saved before the change: stale
+
+        self.stats_manager.aggregator.calculate_all_time_stats()
+        self.assertTrue(self.data_manager.save_stats_snapshot()[0])
+        data_manager = self.reopen()
+        self.assertTrue(data_manager.load_stats_snapshot())
+        self.assertEqual(data_manager.stats, self.data_manager.stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import io, os, json, tempfile, unittest
+from unittest import mock
+from core.data_manager import DataManager
+from core.exceptions import DataCorruptionError
+from core.lazy_json import JsonStreamReader, JsonSnapshotWriter, JsonDaySource
+from journal_samples import random_log, write_journal, plain, session
+
+
+class TrickleStream(io.BytesIO):
+    """A stream that hands out at most `chunk_size` bytes per read, like a slow zip member."""
+
+    def __init__(self, data: bytes, chunk_size: int) -> None:
+        super().__init__(data)
+        self.chunk_size = chunk_size
+
+    def read(self, size: int = -1) -> bytes:
+        return super().read(self.chunk_size if size < 0 else min(size, self.chunk_size))
+
+
+class LazyJsonTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.entry_log = random_log(seed=4, sessions=300)
+        self.data = {"Entry Log": self.entry_log, "All Time Subjects": {"Fiqh": ["Qudoori"]}, "Statistics": {"n": 12.5}}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan_finds_the_byte_span_of_every_day(self):
+        for chunk_size in (1, 3, 64, JsonStreamReader.CHUNK_SIZE):
+            for indent, ensure_ascii in ((4, False), (None, True), (2, False)):
+                with self.subTest(chunk_size=chunk_size, indent=indent, ensure_ascii=ensure_ascii):
+                    raw = json.dumps(self.data, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8")
+                    sections, days = JsonStreamReader(TrickleStream(raw, chunk_size)).scan()
+                    self.assertEqual([date for date, _, _ in days], list(self.entry_log))
+                    for date, start, end in days:
+                        self.assertEqual(json.loads(raw[start:end]), self.entry_log[date])
+                    for key, (start, end) in sections.items():
+                        self.assertEqual(json.loads(raw[start:end]), self.data[key])
+
+    def test_stream_reader_walks_sections_and_days(self):
+        raw = json.dumps(self.data, ensure_ascii=False).encode("utf-8")
+        for chunk_size in (1, 7, JsonStreamReader.CHUNK_SIZE):
+            with self.subTest(chunk_size=chunk_size):
+                rebuilt = {}
+                for section, date, value in JsonStreamReader(TrickleStream(raw, chunk_size)).items():
+                    if date is None:
+                        rebuilt[section] = value
+                    else:
+                        rebuilt.setdefault(section, {})[date] = value
+                self.assertEqual(rebuilt, self.data)
+        for broken in (raw[:-1], raw + b"{}", b'{"Entry Log": [1, 2]}'):
+            with self.assertRaises(ValueError):
+                list(JsonStreamReader(io.BytesIO(broken)).items())
+
+    def test_snapshot_writer_matches_json_dumps(self):
+        data, index = JsonSnapshotWriter.dumps(self.data, lambda date: None)
+        self.assertEqual(data, json.dumps(self.data, indent=4, ensure_ascii=False).encode("utf-8"))
+        for date, start, end in index["days"]:
+            self.assertEqual(json.loads(data[start:end]), self.entry_log[date])
+
+    def test_day_source_reads_days_and_keeps_its_index(self):
+        path_json = write_journal(self.temp_dir.name, self.entry_log)
+        source = JsonDaySource(path_json)
+        self.assertEqual(source.load_dates(), list(self.entry_log))
+        date = source.load_dates()[7]
+        self.assertEqual(source.load_day(date), self.entry_log[date])
+        self.assertTrue(os.path.exists(source.path_index))
+        with mock.patch.object(JsonDaySource, "rebuild_index") as rebuild_index:
+            JsonDaySource(path_json)
+        rebuild_index.assert_not_called()
+
+    def test_day_source_scans_again_after_an_outside_edit(self):
+        path_json = write_journal(self.temp_dir.name, self.entry_log)
+        JsonDaySource(path_json)
+        edited = dict(list(self.entry_log.items())[:5])
+        write_journal(self.temp_dir.name, edited)
+        source = JsonDaySource(path_json)
+        self.assertEqual({date: source.load_day(date) for date in source.load_dates()}, edited)
+
+    def test_day_source_rejects_a_broken_file(self):
+        path_json = os.path.join(self.temp_dir.name, "learning_data.json")
+        for content in (b"", b'{"Entry Log": {"01-Jan-2026": {'):
+            with self.subTest(content=content):
+                with open(path_json, "wb") as file:
+                    file.write(content)
+                with self.assertRaises(DataCorruptionError):
+                    JsonDaySource(path_json)
+
+    def test_compaction_copies_the_days_it_never_parsed(self):
+        path_json = write_journal(self.temp_dir.name, self.entry_log)
+        DataManager(path_json, os.path.join(self.temp_dir.name, "Journal.md"))  # The first run reads every day once
+        data_manager = DataManager(path_json, os.path.join(self.temp_dir.name, "Journal.md"))
+        edited = list(self.entry_log)[3]
+        day = {"Seerah": {"Zad al-Maad": {"Entry 900001": session("Zad al-Maad", 20, 2)}}}
+        with mock.patch.object(JsonDaySource, "load_day", side_effect=JsonDaySource.load_day, autospec=True) as load_day:
+            data_manager.update_entry_log(edited, day)
+            self.assertTrue(data_manager.storage.compact(data_manager.take_snapshot()))
+        self.assertEqual([args[1] for args, _ in load_day.call_args_list], [edited])
+        expected = dict(self.entry_log, **{edited: day})
+        with open(path_json, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["Entry Log"], expected)
+        self.assertEqual(plain(DataManager(path_json, os.path.join(self.temp_dir.name, "Journal.md")).entry_log), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os, tempfile, unittest
+from copy import deepcopy
+from unittest import mock
+from core.core_services import DateManager
+from core.file_manager import FileManager, MarkdownJournal
+from journal_samples import random_log, session
+
+
+class MarkdownJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.entry_log = deepcopy(random_log(seed=3, sessions=200))
+        self.journal = MarkdownJournal(os.path.join(self.temp_dir.name, "Journal.md"))
+        self.assertTrue(self.journal.save(self.entry_log, dates=self.dates())[0])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def dates(self) -> list:
+        return sorted(self.entry_log, key=DateManager.date_to_ordinal)
+
+    def check_file(self) -> None:
+        """Journal.md and its index are what a full write of the current log gives."""
+        expected = MarkdownJournal(os.path.join(self.temp_dir.name, "Expected.md"))
+        expected.write_full(self.entry_log, self.dates())
+        with open(self.journal.path_md, "rb") as file, open(expected.path_md, "rb") as expected_file:
+            self.assertEqual(file.read(), expected_file.read())
+        self.assertEqual(self.journal.load_index(), expected.load_index())
+
+    def save(self, dirty_dates: set) -> dict:
+        """Save the changed dates and say which way the file was written."""
+        with mock.patch.object(FileManager, "splice_atomic", wraps=FileManager.splice_atomic) as splice, \
+                mock.patch.object(FileManager, "truncate_and_append", wraps=FileManager.truncate_and_append) as append, \
+                mock.patch.object(MarkdownJournal, "write_full", autospec=True, side_effect=MarkdownJournal.write_full) as full:
+            self.assertTrue(self.journal.save(self.entry_log, dirty_dates, self.dates())[0])
+        self.check_file()
+        return {"splice": splice.call_count, "append": append.call_count, "full": full.call_count}
+
+    def test_last_day_and_later_days_are_written_in_place(self):
+        last = self.dates()[-1]
+        self.entry_log[last]["Fiqh"] = {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}
+        self.entry_log["01-Jan-2030"] = {"Seerah": {"Zad al-Maad": {"Entry 900002": session("Zad al-Maad", 5, 1)}}}
+        self.entry_log["31-Dec-2029"] = {"Seerah": {"Zad al-Maad": {"Entry 900003": session("Zad al-Maad", 5, 1)}}}
+        self.assertEqual(self.save({last, "01-Jan-2030", "31-Dec-2029"}), {"splice": 0, "append": 1, "full": 0})
+        del self.entry_log["01-Jan-2030"]
+        self.assertEqual(self.save({"01-Jan-2030"}), {"splice": 0, "append": 1, "full": 0})
+
+    def test_changes_in_the_middle_are_spliced_in_date_order(self):
+        dates = self.dates()
+        missing = next(DateManager.ordinal_to_date(ordinal) for ordinal in range(DateManager.date_to_ordinal(dates[0]), 800000)
+                       if DateManager.ordinal_to_date(ordinal) not in self.entry_log)
+        self.entry_log[missing] = {"Seerah": {"Zad al-Maad": {"Entry 900001": session("Zad al-Maad", 5, 1)}}}
+        self.entry_log[dates[10]] = {"Fiqh": {"Qudoori": {"Entry 900002": session("Qudoori", 10, 1)}}}
+        del self.entry_log[dates[20]]
+        self.assertEqual(self.save({missing, dates[10], dates[20], "01-Jan-1999"}), {"splice": 1, "append": 0, "full": 0})
+        self.assertEqual(self.save(set(dates[30:33])), {"splice": 0, "append": 0, "full": 0})  # Nothing really changed
+
+    def test_missing_or_stale_index_means_a_full_write(self):
+        date = self.dates()[5]
+        self.entry_log[date] = {"Fiqh": {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}}
+        os.remove(self.journal.path_index)
+        self.assertEqual(self.save({date}), {"splice": 1, "append": 0, "full": 1})
+        with open(self.journal.path_md, "ab") as file:
+            file.write(b"Notes added by hand\n")
+        self.assertEqual(self.save({self.dates()[-1]}), {"splice": 1, "append": 0, "full": 1})
+
+    def test_outside_edit_of_a_kept_section_means_a_full_write(self):
+        sections = self.journal.load_index()
+        with open(self.journal.path_md, "r+b") as file:
+            file.seek(sections[-3][1] + 2)
+            file.write(b"X")  # Same size, so only the section's hash gives it away
+        self.entry_log[sections[-5][0]]["Fiqh"] = {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}
+        self.assertEqual(self.save({sections[-5][0]}), {"splice": 1, "append": 0, "full": 1})
+
+    def test_write_cut_short_is_followed_by_a_full_write(self):
+        last = self.dates()[-1]
+        self.entry_log[last]["Fiqh"] = {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            self.assertFalse(self.journal.save(self.entry_log, {last}, self.dates())[0])
+        self.assertIsNone(self.journal.load_index())
+        self.assertEqual(self.save({last}), {"splice": 1, "append": 0, "full": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os, json, tempfile, threading, unittest
+from unittest import mock
+from core.data_manager import DataManager
+from core.file_manager import FileManager
+from core.operation_log import OperationLog
+
+
+def session(minutes: int) -> dict:
+    return {"Book": "Qudoori", "Unit": "1", "Chapter": "N/A", "Page": "1", "Total Pages": 1,
+            "Time Spent": f"{minutes} min(s)", "Reading Mode": "N/A", "Revision": "No", "Notes": "N/A"}
+
+
+class OperationLogTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path_log = os.path.join(self.temp_dir.name, "learning_data.oplog")
+        self.log = OperationLog(self.path_log)
+        records = [OperationLog.make_record("add", "01-Jan-2026", "Fiqh", "Qudoori", f"Entry {number}", session(number))
+                   for number in range(3)]
+        self.assertTrue(self.log.append(records)[0])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def lines(self) -> list:
+        with open(self.path_log, "rb") as file:
+            return file.readlines()
+
+    def test_reads_back_what_was_flushed(self):
+        self.assertEqual([record["session"] for record in self.log.read()], ["Entry 0", "Entry 1", "Entry 2"])
+        self.assertEqual(self.log.append([]), (True, "Nothing to save"))
+
+    def test_torn_last_line_is_cut_off(self):
+        valid_size = sum(len(line) for line in self.lines()[:2])
+        with open(self.path_log, "r+b") as file:
+            file.truncate(valid_size + 20)  # A crash in the middle of the third record
+        self.assertEqual(len(list(self.log.read())), 2)
+        self.assertEqual(self.log.size(), valid_size)
+        self.log.append([OperationLog.make_record("delete", "01-Jan-2026")])  # Lands after the valid records, not behind the torn one
+        self.assertEqual([record["op"] for record in self.log.read()], ["add", "add", "delete"])
+
+    def test_tampered_line_ends_the_log(self):
+        lines = self.lines()
+        record = json.loads(lines[1])
+        record["data"]["Time Spent"] = "500 min(s)"
+        lines[1] = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.path_log, "wb") as file:
+            file.writelines(lines)
+        self.assertEqual([record["session"] for record in self.log.read()], ["Entry 0"])
+        self.assertEqual(self.log.size(), len(lines[0]))
+
+    def test_discard_prefix_keeps_the_rest(self):
+        self.log.discard_prefix(len(self.lines()[0]))
+        self.assertEqual([record["session"] for record in self.log.read()], ["Entry 1", "Entry 2"])
+        self.log.discard_prefix(self.log.size())
+        self.assertEqual(list(self.log.read()), [])
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path_json = os.path.join(self.temp_dir.name, "learning_data.json")
+        self.path_md = os.path.join(self.temp_dir.name, "Journal.md")
+        FileManager.save_to_json({"Entry Log": {"01-Jan-2026": {"Fiqh": {"Qudoori": {"Entry 1": session(10)}}}}}, self.path_json)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self) -> DataManager:
+        return DataManager(self.path_json, self.path_md)
+
+    def test_changes_survive_a_reopen_without_compaction(self):
+        data = self.open()
+        data.update_entry_log("01-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 1": session(15), "Entry 2": session(5)}}})
+        data.update_entry_log("02-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 3": session(20)}}})
+        data.delete_data("02-Jan-2026")
+        self.assertEqual(data.save_data_to_files(), 0)
+        with open(self.path_json, encoding="utf-8") as file:
+            self.assertEqual(list(json.load(file)["Entry Log"]), ["01-Jan-2026"])  # Only the log was written
+        self.assertEqual(self.open().entry_log, data.entry_log)
+
+    def test_records_already_in_the_snapshot_replay_harmlessly(self):
+        data = self.open()
+        data.update_entry_log("01-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 2": session(5)}}})
+        data.delete_data("01-Jan-2026")
+        data.update_entry_log("03-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 3": session(20)}}})
+        self.assertEqual(data.save_data_to_files(), 0)
+        expected = data.entry_log
+        with mock.patch.object(OperationLog, "discard_prefix"):  # A crash between the two steps of a compaction
+            self.assertTrue(data.storage.compact(data.take_snapshot()))
+        self.assertGreater(data.storage.op_log.size(), 0)
+        self.assertEqual(self.open().entry_log, expected)
+
+    def test_records_appended_during_a_background_compaction_are_kept(self):
+        data = self.open()
+        data.update_entry_log("02-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 2": session(5)}}})
+        writing, release = threading.Event(), threading.Event()
+        write_snapshot = data.storage.write_snapshot
+
+        def slow_write(*args):
+            writing.set()
+            release.wait(5)
+            return write_snapshot(*args)
+
+        with mock.patch.object(data.storage, "write_snapshot", side_effect=slow_write):
+            self.assertTrue(data.storage.compact(data.take_snapshot(), background=True))
+            self.assertTrue(writing.wait(5))
+            data.update_entry_log("03-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 3": session(20)}}})
+            self.assertEqual(data.save_data_to_files(), 0)
+            release.set()
+            data.storage._compaction.join(5)
+        self.assertEqual([record["date"] for record in data.storage.op_log.read()], ["03-Jan-2026"])
+        with open(self.path_json, encoding="utf-8") as file:
+            self.assertEqual(sorted(json.load(file)["Entry Log"]), ["01-Jan-2026", "02-Jan-2026"])
+        self.assertEqual(self.open().entry_log, data.entry_log)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import random, tempfile, unittest
+from core.core_services import DateManager, CoreHelpers
+from core.search_index import SearchIndex
+from core.query import JournalQuery
+from journal_samples import SUBJECTS, WORDS, random_log, open_journal, session
+
+
+class JournalQueryTest(unittest.TestCase):
+    """Whatever plan a query picks, it finds exactly what a plain walk over the Entry Log finds."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=24, sessions=1500))
+        self.search_index = SearchIndex(self.data_manager)
+        self.dates = sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def query(self) -> JournalQuery:
+        return JournalQuery(self.data_manager, self.search_index, self.stats_manager.day_rollup)
+
+    def brute_force(self, subject=None, book=None, start=None, end=None, text=None, limits=None, predicate=None) -> list:
+        """(date, subject, book, session, minutes, pages) of every matching session, walking every day."""
+        limits = limits or {}
+        text_keys = None if text is None else {key[1:] for key in self.search_index.matching_keys(text)}
+        rows = []
+        for date in self.dates:
+            ordinal = DateManager.date_to_ordinal(date)
+            if (start is not None and ordinal < DateManager.date_to_ordinal(start)
+                    or end is not None and ordinal > DateManager.date_to_ordinal(end)):
+                continue
+            for day_subject, books in self.data_manager.entry_log[date].items():
+                for day_book, sessions in books.items():
+                    for name, details in sessions.items():
+                        minutes = CoreHelpers.convert_time_to_mins(details["Time Spent"])
+                        pages = details["Total Pages"]
+                        if (subject is not None and day_subject != subject or book is not None and day_book != book
+                                or text_keys is not None and (date, day_subject, day_book, name) not in text_keys
+                                or not limits.get("min_minutes", minutes) <= minutes <= limits.get("max_minutes", minutes)
+                                or not limits.get("min_pages", pages) <= pages <= limits.get("max_pages", pages)
+                                or predicate is not None and not predicate(pages)):
+                            continue
+                        rows.append((date, day_subject, day_book, name, minutes, pages))
+        return rows
+
+    @staticmethod
+    def totals_of(rows: list) -> tuple:
+        pages = round(sum(row[5] for row in rows), 6)
+        return len(rows), sum(row[4] for row in rows), int(pages) if pages == int(pages) else pages
+
+    def random_conditions(self, rng: random.Random) -> dict:
+        conditions = {}
+        if rng.random() < 0.5:
+            conditions["subject"] = rng.choice(sorted(SUBJECTS))
+        if rng.random() < 0.4:
+            conditions["book"] = rng.choice(SUBJECTS[conditions.get("subject") or rng.choice(sorted(SUBJECTS))])
+        if rng.random() < 0.6:
+            first, last = sorted(rng.sample(range(len(self.dates)), 2))
+            conditions["start"] = self.dates[first] if rng.random() < 0.8 else None
+            conditions["end"] = self.dates[last] if rng.random() < 0.8 else None
+        if rng.random() < 0.3:
+            conditions["text"] = " ".join(word[:rng.randint(2, len(word))] for word in rng.sample(WORDS, rng.randint(1, 2)))
+        if rng.random() < 0.3:
+            conditions["limits"] = {"min_minutes": rng.randint(1, 60), "max_pages": rng.choice([2, 3.5, 10])}
+        if rng.random() < 0.2:
+            conditions["predicate"] = lambda pages: pages >= 2
+        return conditions
+
+    def build(self, conditions: dict) -> JournalQuery:
+        query = self.query()
+        if "subject" in conditions:
+            query = query.subject(conditions["subject"])
+        if "book" in conditions:
+            query = query.book(conditions["book"])
+        if "start" in conditions:
+            query = query.between(conditions["start"], conditions["end"])
+        if "text" in conditions:
+            query = query.text(conditions["text"])
+        if "limits" in conditions:
+            query = query.where(**conditions["limits"])
+        if "predicate" in conditions:
+            predicate = conditions["predicate"]
+            query = query.where(lambda entry: predicate(entry.total_pages))
+        return query
+
+    def test_random_queries_match_a_full_walk(self):
+        rng = random.Random(2024)
+        plans = set()
+        for _ in range(200):
+            conditions = self.random_conditions(rng)
+            with self.subTest(conditions={key: value for key, value in conditions.items() if key != "predicate"}):
+                query = self.build(conditions)
+                expected = self.brute_force(**conditions)
+                plans.add(query.plan()[0])
+                self.assertEqual(query.totals(), self.totals_of(expected))
+                found = [(date, entry.subject, entry.book, session) for date, session, entry in query]
+                ordinals = [DateManager.date_to_ordinal(row[0]) for row in found]
+                self.assertEqual(ordinals, sorted(ordinals))
+                self.assertEqual(sorted(found), sorted(row[:4] for row in expected))
+        self.assertEqual(plans, {"text", "book", "dates"})
+
+    def test_totals_follow_changes(self):
+        query = self.query().subject("Hadith").between(self.dates[0], self.dates[-1])
+        day = dict(self.data_manager.entry_log[self.dates[5]])
+        day["Hadith"] = {"Riyad us-Saliheen": {"Entry 999999": session("Riyad us-Saliheen", 50, 7)}}
+        self.data_manager.update_entry_log(self.dates[5], day)
+        self.data_manager.delete_data(self.dates[9])
+        self.dates.remove(self.dates[9])
+        self.assertEqual(query.totals(), self.totals_of(self.brute_force(subject="Hadith")))
+        self.assertEqual(query.count(), len(list(query)))
+
+    def test_steps_return_new_queries(self):
+        everything = self.query()
+        hadith = everything.subject("Hadith")
+        hadith.where(min_minutes=60)
+        self.assertIsNone(everything.subject_name)
+        self.assertEqual(hadith.limits, {})
+        self.assertEqual(everything.count(), len(self.brute_force()))
+
+    def test_book_without_subject_covers_every_subject(self):
+        self.data_manager.update_entry_log(self.dates[0], dict(self.data_manager.entry_log[self.dates[0]],
+                                           Seerah={"Qudoori": {"Entry 999998": session("Qudoori", 10, 1)}}))
+        self.assertEqual(self.query().book("Qudoori").count(), len(self.brute_force(book="Qudoori")))
+        self.assertEqual(self.query().book("Qudoori", "Seerah").count(), 1)
+
+    def test_sum_and_text_errors(self):
+        self.assertEqual(self.query().sum("minutes"), self.totals_of(self.brute_force())[1])
+        with self.assertRaises(ValueError):
+            self.query().sum("sessions")
+        with self.assertRaises(ValueError):
+            JournalQuery(self.data_manager).text("salah")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import random, tempfile, unittest
+from datetime import date, timedelta
+from core.quran_coverage import QuranStructure, QuranCoverage
+from journal_samples import open_journal
+
+TAFSEER, TILAWAT = QuranCoverage.SUBJECTS
+
+
+def quran_session(rng: random.Random, subject: str) -> tuple:
+    """(book, details) of a random Tafseer or Tilawat session, shaped like the ones the app saves."""
+    para = rng.randint(1, 30)
+    book = f"Para no. {para} - {para + 1}" if rng.random() < 0.1 and para < 30 else f"Para no. {para}"
+    first_ruku = rng.randint(1, 16)
+    last_ruku = first_ruku + rng.randint(0, 3)
+    details = {"Page": "1", "Total Pages": 1, "Time Spent": "10 min(s)", "Notes": "N/A", "Reading Mode": "N/A",
+               "Revision": "No", "Ruku (Para)": f"{first_ruku} - {last_ruku}" if last_ruku > first_ruku else str(first_ruku),
+               "Total Ruku": last_ruku - first_ruku + 1}
+    if subject == TAFSEER:
+        surah = rng.randint(1, 113)
+        first_ayah = rng.randint(1, QuranStructure.SURAH_AYAT[surah - 1])
+        if rng.random() < 0.2:
+            details["Surah"] = f"{surah} - {surah + 1}"
+            details["Ayah"] = f"{first_ayah} - {rng.randint(1, QuranStructure.SURAH_AYAT[surah])}"
+        else:
+            last_ayah = min(first_ayah + rng.randint(0, 40), QuranStructure.SURAH_AYAT[surah - 1])
+            details["Surah"] = str(surah)
+            details["Ayah"] = f"{first_ayah} - {last_ayah}" if last_ayah > first_ayah else str(first_ayah)
+    return book, details
+
+
+class QuranStructureTest(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual(QuranStructure.TOTAL_AYAT, 6236)
+        self.assertEqual(QuranStructure.SURAHS, 114)
+        self.assertEqual(QuranStructure.PARAS, 30)
+        spans = QuranStructure.para_spans()
+        self.assertEqual(sum(QuranStructure.count_bits(span) for span in spans), QuranStructure.TOTAL_AYAT)
+        union = 0
+        for span in spans:
+            self.assertEqual(union & span, 0)
+            union |= span
+        self.assertEqual(union, QuranCoverage.ALL_AYAT)
+
+    def test_locate_undoes_ayah_index(self):
+        for surah in range(1, QuranStructure.SURAHS + 1):
+            for ayah in (1, QuranStructure.SURAH_AYAT[surah - 1]):
+                self.assertEqual(QuranStructure.locate(QuranStructure.ayah_index(surah, ayah)), (surah, ayah))
+        self.assertEqual(QuranStructure.locate(0), (1, 1))
+        self.assertEqual(QuranStructure.locate(QuranStructure.TOTAL_AYAT - 1), (114, 6))
+
+    def test_bits_of_one_session(self):
+        ayat, rukus, paras = QuranCoverage.bits_of("Para no. 3", {"Surah": "2 - 3", "Ayah": "280 - 10", "Ruku (Para)": "2 - 4"})
+        self.assertEqual(QuranStructure.count_bits(ayat), 7 + 10)  # 2:280-286, then 3:1-10
+        self.assertEqual(rukus, 0b111 << 2 * QuranStructure.RUKU_SLOTS + 1)
+        self.assertEqual(paras, 1 << 2)
+        ayat, rukus, paras = QuranCoverage.bits_of("Para no. 1 - 2", {"Ruku (Para)": "5"})
+        self.assertEqual((ayat, rukus, paras), (0, 0, 0b11))  # The ruku cannot be placed in either para
+        self.assertEqual(QuranStructure.count_bits(QuranCoverage.ayat_of({"Surah": "114"})), 6)
+        self.assertEqual(QuranCoverage.ayat_of({"Surah": "N/A"}), 0)
+
+
+class QuranCoverageTest(unittest.TestCase):
+    """The bitmaps count the same ayat, rukus and paras as reading every session again."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = random.Random(16)
+        entry_log = {}
+        for number in range(300):
+            day = (date(2025, 1, 1) + timedelta(days=rng.randrange(500))).strftime("%d-%b-%Y")
+            subject = rng.choice(QuranCoverage.SUBJECTS)
+            book, details = quran_session(rng, subject)
+            entry_log.setdefault(day, {}).setdefault(subject, {}).setdefault(book, {})[f"Entry {number}"] = details
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, entry_log)
+        self.coverage = self.stats_manager.coverage
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def brute_force(self, subject: str) -> tuple:
+        ayat, rukus, paras = set(), set(), set()
+        for progress_date in self.data_manager.entry_log.values():
+            for book, sessions in progress_date.get(subject, {}).items():
+                para_range = [int(number) for number in book.split("Para no.")[1].split("-")]
+                paras.update(range(para_range[0], para_range[-1] + 1))
+                for details in sessions.values():
+                    ruku_range = [int(number) for number in details["Ruku (Para)"].split("-")]
+                    if para_range[0] == para_range[-1]:
+                        rukus.update((para_range[0], ruku) for ruku in range(ruku_range[0], ruku_range[-1] + 1))
+                    if "Surah" in details:
+                        surahs = [int(number) for number in details["Surah"].split("-")]
+                        ayah_range = [int(number) for number in details["Ayah"].split("-")]
+                        first = QuranStructure.ayah_index(surahs[0], ayah_range[0])
+                        last = QuranStructure.ayah_index(surahs[-1], min(ayah_range[-1], QuranStructure.SURAH_AYAT[surahs[-1] - 1]))
+                        ayat.update(range(first, last + 1))
+        return len(ayat), len(rukus), len(paras)
+
+    def check(self) -> None:
+        for subject in QuranCoverage.SUBJECTS:
+            report = self.coverage.coverage(subject)
+            self.assertEqual((report["Ayat"], report["Rukus"], report["Paras Read"]), self.brute_force(subject))
+
+    def test_coverage(self):
+        self.check()
+        gaps = self.coverage.ayah_gaps(TAFSEER)
+        missing = sum(QuranStructure.ayah_index(*last) - QuranStructure.ayah_index(*first) + 1 for first, last in gaps)
+        self.assertEqual(missing, QuranStructure.TOTAL_AYAT - self.coverage.coverage(TAFSEER)["Ayat"])
+
+    def test_coverage_follows_changes(self):
+        self.check()
+        rng = random.Random(17)
+        dates = sorted(self.data_manager.entry_log)
+        for date_ in rng.sample(dates, 20):
+            self.data_manager.delete_data(date_)
+        for date_ in rng.sample(sorted(self.data_manager.entry_log), 20):
+            subject = rng.choice(QuranCoverage.SUBJECTS)
+            book, details = quran_session(rng, subject)
+            self.data_manager.update_entry_log(date_, {subject: {book: {"Entry 999999": details}}})
+        self.check()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import tempfile, unittest
+from unittest import mock
+from core.core_services import DateManager
+from core.reading_forecast import BookSizes, ReadingForecast
+from journal_samples import open_journal, session
+
+
+def reading(minutes: int, pages, page: str) -> dict:
+    return dict(session("Qudoori", minutes, pages), Page=page)
+
+
+class ReadingForecastTest(unittest.TestCase):
+    TODAY = "30-Jan-2026"
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        entry_log = {
+            "01-Jan-2026": {"Fiqh": {"Qudoori": {"Entry 1": reading(30, 10, "1 - 10")}}},
+            "20-Jan-2026": {"Fiqh": {"Qudoori": {"Entry 2": reading(20, 5, "11 - 15"), "Entry 3": reading(10, 5, "16-20")}},
+                            "Al-Qur'an (Tilawat)": {"Al-Qur'an": {"Entry 4": session("Al-Qur'an", 30, 20)}}},
+        }
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, entry_log)
+        self.forecast = self.stats_manager.forecast
+        patcher = mock.patch.object(DateManager, "get_date_today", return_value=self.TODAY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pace_and_finish_date(self):
+        report = self.forecast.forecast("Fiqh", "Qudoori")
+        self.assertEqual((report["Pages"], report["Minutes"], report["Active Days"]), (20, 60, 2))
+        self.assertAlmostEqual(report["Pages per Day (Recent)"], 20 / 30)  # 01-Jan is the first of the last 30 days
+        self.assertIsNone(report["Finish Date"])  # No page count yet
+
+        self.data_manager.book_sizes.set("Fiqh", "Qudoori", 30)
+        report = self.forecast.forecast("Fiqh", "Qudoori")
+        self.assertEqual(report["Pages Left"], 10)
+        self.assertEqual(report["Finish Date"], DateManager.ordinal_to_date(DateManager.date_to_ordinal(self.TODAY) + 15))
+        self.assertEqual(BookSizes(self.data_manager.book_sizes.path_sizes).get("Fiqh", "Qudoori"), 30)  # Kept on disk
+        self.assertNotIn(("Al-Qur'an (Tilawat)", "Al-Qur'an"), self.forecast.paces)
+
+    def test_changed_days_move_the_sums(self):
+        self.forecast.forecast("Fiqh", "Qudoori")
+        self.data_manager.book_sizes.set("Fiqh", "Qudoori", 30)
+        self.data_manager.update_entry_log("29-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 5": reading(40, 10, "21 - 30")}}})
+        report = self.forecast.forecast("Fiqh", "Qudoori")
+        self.assertEqual((report["Pages"], report["Minutes"], report["Active Days"], report["Pages Left"]), (30, 100, 3, 0))
+        self.assertEqual(report["Finish Date"], self.TODAY)
+        self.assertIn("Finished!", self.forecast.get_summary("Fiqh", "Qudoori"))
+
+        self.data_manager.delete_data("01-Jan-2026")
+        pace = self.forecast.paces[("Fiqh", "Qudoori")]
+        self.stats_manager.aggregator.calculate_all_time_stats()  # The new day's dates, for a fresh build
+        fresh = ReadingForecast(self.data_manager)
+        fresh.build()
+        self.assertEqual(pace, fresh.paces[("Fiqh", "Qudoori")])
+        self.assertEqual((pace.pages, pace.furthest_page), (20, 30))
+
+    def test_last_page(self):
+        self.assertEqual(ReadingForecast.last_page("12 - 30"), 30)
+        self.assertEqual(ReadingForecast.last_page("7.5"), 7.5)
+        self.assertEqual(ReadingForecast.last_page("N/A"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
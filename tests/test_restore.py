@@ -0,0 +1,104 @@
+import os, json, zipfile, tempfile, unittest
+from copy import deepcopy
+from unittest import mock
+from core.core_services import DateManager
+from core.restore import RestoreService
+from journal_samples import random_log, open_journal, plain, session
+
+
+class ValidateDayTest(unittest.TestCase):
+    def check(self, **details) -> None:
+        RestoreService.validate_day("01-Jan-2026", {"Fiqh": {"Qudoori": {"Entry 1": dict(session("Qudoori", 5, 1), **details)}}})
+
+    def test_good_values(self):
+        for time_spent in ("0 min(s)", "45 min(s)", "2 hr(s)", "1 hr(s) 5 min(s)"):
+            self.check(**{"Time Spent": time_spent})
+        self.check(**{"Total Pages": 0})
+        self.check(**{"Total Pages": 2.5})
+
+    def test_bad_values(self):
+        for time_spent in ("", " ", "soon", "45", "45 mins", "-5 min(s)", "1 hr(s) 5 min(s) extra", None, 45):
+            with self.subTest(time_spent=time_spent):
+                with self.assertRaisesRegex(ValueError, "Time Spent"):
+                    self.check(**{"Time Spent": time_spent})
+        for pages in (-1, -0.5, "3", True, None):
+            with self.subTest(pages=pages):
+                with self.assertRaisesRegex(ValueError, "Total Pages"):
+                    self.check(**{"Total Pages": pages})
+
+
+class RestoreServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=9, sessions=200))
+        self.service = RestoreService(self.data_manager, self.stats_manager)
+        self.backup_log = deepcopy(random_log(seed=19, sessions=150))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_zip(self, entry_log: dict) -> str:
+        path_zip = os.path.join(self.temp_dir.name, "learning_backup.zip")
+        with zipfile.ZipFile(path_zip, "w", zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr("learning_data.json", json.dumps({"Entry Log": entry_log, "All Time Subjects": {}, "Statistics": {}}))
+        return path_zip
+
+    def live(self) -> tuple:
+        return deepcopy(plain(self.data_manager.entry_log)), deepcopy(self.data_manager.stats), deepcopy(self.data_manager.all_time_subjects)
+
+    def check_restored(self, entry_log: dict) -> None:
+        """The live log is `entry_log`, with the stats and subjects a full recount of it gives."""
+        self.assertEqual(plain(self.data_manager.entry_log), entry_log)
+        subjects, stats = self.stats_manager.rebuild_from_days(entry_log.items())
+        self.assertEqual(self.data_manager.stats, stats)
+        self.assertEqual(self.data_manager.all_time_subjects, subjects)
+
+    def test_restores_a_zip(self):
+        restored, msg = self.service.restore(self.write_zip(self.backup_log))
+        self.assertTrue(restored, msg)
+        self.check_restored(self.backup_log)
+
+    @staticmethod
+    def first_session(day: dict) -> dict:
+        sessions = next(iter(next(iter(day.values())).values()))
+        return sessions[next(iter(sessions))]
+
+    def test_bad_entry_leaves_the_live_data_alone(self):
+        date = list(self.backup_log)[-2]  # Most of the backup has been read by then
+        before = self.live()
+        for field, value in (("Time Spent", ""), ("Time Spent", "an hour"), ("Total Pages", -3)):
+            with self.subTest(field=field, value=value):
+                bad = deepcopy(self.backup_log)
+                self.first_session(bad[date])[field] = value
+                restored, msg = self.service.restore(self.write_zip(bad))
+                self.assertFalse(restored)
+                self.assertIn(field, msg)
+                self.assertEqual(self.live(), before)
+
+    def test_cancelled_restore_leaves_the_live_data_alone(self):
+        before = self.live()
+        calls = []
+
+        def progress(done, total):
+            calls.append(done)
+            return len(calls) < 50
+
+        restored, msg = self.service.restore(self.write_zip(self.backup_log), progress=progress)
+        self.assertFalse(restored)
+        self.assertIn("cancelled", msg)
+        self.assertEqual(len(calls), 50)
+        self.assertEqual(self.live(), before)
+
+    def test_restores_a_repository_snapshot(self):
+        repo_dir = os.path.join(self.temp_dir.name, "backups")
+        backed_up = deepcopy(plain(self.data_manager.entry_log))
+        with mock.patch.object(DateManager, "get_timestamp", return_value="01-01-2026_10-00-00"):
+            self.assertTrue(self.data_manager.backup_incremental(repo_dir)[0])
+        self.assertTrue(self.service.restore(self.write_zip(self.backup_log))[0])
+        restored, msg = self.service.restore(repo_dir, "learning_backup_01-01-2026_10-00-00")
+        self.assertTrue(restored, msg)
+        self.check_restored(backed_up)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import tempfile, unittest
+from unittest import mock
+from core.core_services import DateManager, CoreHelpers
+from journal_samples import random_log, open_journal, session
+
+
+class RollingWindowTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=14, sessions=300))
+        self.windows = self.stats_manager.windows
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def walked(self, first: int, last: int) -> tuple:
+        """(entries, minutes, pages) of the days from ordinal `first` to `last`, summed straight from the Entry Log."""
+        sessions = [details for ordinal in range(first, last + 1)
+                    for books in self.data_manager.entry_log.get(DateManager.ordinal_to_date(ordinal), {}).values()
+                    for sessions in books.values() for details in sessions.values()]
+        return (len(sessions), sum(CoreHelpers.convert_time_to_mins(details["Time Spent"]) for details in sessions),
+                sum(details["Total Pages"] for details in sessions))
+
+    def test_buckets_cover_the_window_up_to_the_anchor(self):
+        anchor = "15-Feb-2026"
+        last = DateManager.date_to_ordinal(anchor)
+        for name, (days, bucket_days) in self.windows.WINDOWS.items():
+            with self.subTest(window=name):
+                report = self.windows.window_report(name, anchor)
+                self.assertEqual(len(report), -(-days // bucket_days))
+                starts = [DateManager.date_to_ordinal(date) for date in report]
+                self.assertEqual(starts, list(range(last - days + 1, last + 1, bucket_days)))
+                for start, (entries, minutes, pages) in zip(starts, report.values()):
+                    expected = self.walked(start, min(start + bucket_days - 1, last))
+                    self.assertEqual((entries, minutes), expected[:2])
+                    self.assertAlmostEqual(pages, expected[2])
+
+    def test_reports_follow_changes_and_leave_out_today(self):
+        today = DateManager.date_to_ordinal("20-Jan-2026")
+        with mock.patch.object(DateManager, "get_date_today", return_value="20-Jan-2026"):
+            before = self.windows.window_report("Weekly")
+            self.assertEqual(list(before)[-1], "19-Jan-2026")
+            self.data_manager.update_entry_log("17-Jan-2026", {"Seerah": {"Zad al-Maad": {"Entry 900001": session("Zad al-Maad", 40, 3)}}})
+            self.data_manager.update_entry_log("20-Jan-2026", {"Seerah": {"Zad al-Maad": {"Entry 900002": session("Zad al-Maad", 99, 9)}}})
+            after = self.windows.window_report("Weekly")
+        self.assertNotEqual(before["17-Jan-2026"], (1, 40, 3))
+        self.assertEqual(after["17-Jan-2026"], (1, 40, 3))  # The day was replaced
+        self.assertNotIn("20-Jan-2026", after)
+        self.assertEqual(self.windows.total_minutes(after), self.walked(today - 7, today - 1)[1])
+
+    def test_empty_window(self):
+        report = self.windows.report(10, "01-Jan-2020", 5)
+        self.assertEqual(list(report.values()), [(0, 0, 0), (0, 0, 0)])
+        self.assertEqual(self.windows.total_minutes(report), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random, tempfile, unittest
+from core.search_index import SearchIndex
+from journal_samples import WORDS, random_log, open_journal, session
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, _ = open_journal(self.temp_dir.name, random_log(seed=21, sessions=700))
+        self.index = SearchIndex(self.data_manager)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def brute_force(self, query: str) -> list:
+        """(date, subject, book, session) of every session with a word starting with each word of `query`."""
+        query_words = SearchIndex.tokenize(query)
+        found = []
+        for date, progress_date in self.data_manager.entry_log.items():
+            for subject, books in progress_date.items():
+                for book, sessions in books.items():
+                    for name, details in sessions.items():
+                        words = set(SearchIndex.weigh_words(subject, book, details))
+                        if query_words and all(any(word.startswith(query_word) for word in words) for query_word in query_words):
+                            found.append((date, subject, book, name))
+        return sorted(found)
+
+    def matches(self, query: str) -> list:
+        return sorted(key[1:] for key in self.index.matching_keys(query))
+
+    def random_queries(self, rng: random.Random, count: int = 40) -> list:
+        names = ["qudoori", "riyad", "madinah", "kitab", "bab", "fiqh", "tarikh", "ت", "10"]
+        return [" ".join(rng.choice(WORDS + names)[:rng.randint(1, 6)] for _ in range(rng.randint(1, 2)))
+                for _ in range(count)]
+
+    def test_matches_every_session_with_the_words(self):
+        for query in self.random_queries(random.Random(1)) + ["", "  ", "zzz", "N/A"]:
+            with self.subTest(query=query):
+                self.assertEqual(self.matches(query), self.brute_force(query))
+
+    def test_matches_follow_changes(self):
+        self.index.search("salah")
+        rng = random.Random(2)
+        for date in rng.sample(sorted(self.data_manager.entry_log), 15):
+            self.data_manager.delete_data(date)
+        for date in rng.sample(sorted(self.data_manager.entry_log), 15):
+            self.data_manager.update_entry_log(date, {"Seerah": {"Zad al-Maad": {
+                "Entry 999999": session("Zad al-Maad", 20, 2, "hijrah and salah")}}})
+        for query in self.random_queries(rng) + ["hijrah", "zad maad"]:
+            with self.subTest(query=query):
+                self.assertEqual(self.matches(query), self.brute_force(query))
+
+    def test_ranking(self):
+        self.data_manager.replace_data({"Entry Log": {
+            "01-Jan-2026": {"Tafseer": {"Ibn Kathir": {"Entry 1": session("Ibn Kathir", 10, 1, "tafseerul juz")}}},
+            "02-Jan-2026": {"Tafseer": {"Ibn Kathir": {"Entry 2": session("Ibn Kathir", 10, 1, "tafseer")}}},
+            "03-Jan-2026": {"Hadith": {"Riyad": {"Entry 3": session("Riyad", 10, 1, "juz")}}},
+            "04-Jan-2026": {"Hadith": {"Riyad": {"Entry 4": session("Riyad", 10, 1, "juz")}}},
+        }})
+        self.assertEqual([result[-1] for result in self.index.search("tafseer")], ["Entry 2", "Entry 1"])  # Whole word first
+        self.assertEqual([result[-1] for result in self.index.search("juz")], ["Entry 4", "Entry 3", "Entry 1"])  # Then the latest
+        self.assertEqual(self.index.search("riyad juz", limit=1)[0][-1], "Entry 4")
+
+    def test_rebuilt_after_a_restore_or_delete_all(self):
+        self.index.search("salah")
+        self.data_manager.replace_data({"Entry Log": {"05-May-2026": {"Fiqh": {"Qudoori": {
+            "Entry 1": session("Qudoori", 10, 1, "wudu")}}}}})
+        self.assertEqual(self.matches("wudu"), [("05-May-2026", "Fiqh", "Qudoori", "Entry 1")])
+        self.assertEqual(self.matches("salah"), [])
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.assertEqual(self.matches("wudu"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile, unittest
+from unittest import mock
+from core import session_table
+from core.core_services import DateManager, CoreHelpers
+from core.session_table import SessionTable
+from journal_samples import random_log, open_journal, session
+
+
+class SessionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, random_log(seed=11, sessions=300))
+        self.table = self.data_manager.sessions
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_rows(self, table: SessionTable) -> None:
+        """Every row holds its own session's values, and the lookups point at the right rows."""
+        self.assertEqual(len(table.rows), len(table))
+        for key, row in table.rows.items():
+            date, subject, book, name = key
+            details = self.data_manager.entry_log[date][subject][book][name]
+            self.assertEqual(table.keys[row], key)
+            self.assertEqual(table.day[row], DateManager.date_to_ordinal(date))
+            self.assertEqual(table.book_keys[table.book[row]], (subject, book))
+            self.assertEqual(table.minutes[row], CoreHelpers.convert_time_to_mins(details["Time Spent"]))
+            self.assertEqual(table.pages[row], details["Total Pages"])
+            self.assertIn(row, table.day_rows[table.day[row]])
+        self.assertEqual(sum(map(len, table.day_rows.values())), len(table))
+
+    def rebuilt_totals(self) -> dict:
+        fresh = SessionTable(self.data_manager.entry_log, self.data_manager.day_index)
+        fresh.cover_all()
+        return fresh.book_totals()
+
+    def test_removing_rows_keeps_the_columns_packed(self):
+        self.table.cover_all()
+        dates = sorted(self.data_manager.entry_log)
+        self.data_manager.delete_data(dates[0])
+        self.data_manager.delete_data(dates[len(dates) // 2])
+        day = self.data_manager.entry_log[dates[-1]]
+        subject = next(iter(day))
+        self.data_manager.update_entry_log(dates[-1], {key: value for key, value in day.items() if key != subject})
+        self.check_rows(self.table)
+        self.assertEqual(self.table.book_totals(), self.rebuilt_totals())
+
+    def test_days_are_read_only_when_asked_for(self):
+        table = SessionTable(self.data_manager.entry_log, self.data_manager.day_index)
+        dates = sorted(self.data_manager.entry_log, key=DateManager.date_to_ordinal)
+        first, last = DateManager.date_to_ordinal(dates[10]), DateManager.date_to_ordinal(dates[12])
+        totals = table.day_totals(first, last)
+        self.assertEqual({table.keys[row][0] for row in range(len(table))}, set(dates[10:13]))
+        for offset, (entries, minutes, pages) in enumerate(totals):
+            sessions = [details for books in self.data_manager.entry_log.get(DateManager.ordinal_to_date(first + offset), {}).values()
+                        for sessions in books.values() for details in sessions.values()]
+            self.assertEqual(entries, len(sessions))
+            self.assertEqual(minutes, sum(CoreHelpers.convert_time_to_mins(details["Time Spent"]) for details in sessions))
+            self.assertAlmostEqual(pages, sum(details["Total Pages"] for details in sessions))
+        table.add(dates[20], "Fiqh", "Qudoori", "Entry 900001", session("Qudoori", 5, 1))
+        self.assertNotIn((dates[20], "Fiqh", "Qudoori", "Entry 900001"), table.rows)  # Read with the rest of its day later
+
+    def test_totals_follow_changes(self):
+        self.table.cover_all()
+        dates = sorted(self.data_manager.entry_log)
+        self.data_manager.update_entry_log(dates[3], {"Fiqh": {"Qudoori": {"Entry 900001": session("Qudoori", 25, 3.5)}}})
+        self.data_manager.update_entry_log("01-Jan-2030", {"Seerah": {"Zad al-Maad": {"Entry 900002": session("Zad al-Maad", 7, 1)}}})
+        self.data_manager.delete_data(dates[4])
+        self.assertEqual(self.table.book_totals(), self.rebuilt_totals())
+        self.data_manager.delete_data(delete_all_progress=True)
+        self.assertEqual(self.table.book_totals(), {})
+        self.assertEqual(self.table.day_totals(700000, 700002), [[0, 0, 0]] * 3)
+
+    def test_same_totals_with_and_without_numpy(self):
+        self.table.cover_all()
+        totals = self.table.book_totals()
+        first = DateManager.date_to_ordinal(min(self.data_manager.entry_log, key=DateManager.date_to_ordinal))
+        days = self.table.day_totals(first, first + 60)
+        with mock.patch.object(session_table, "np", None):
+            self.assertEqual(self.table.book_totals(), totals)
+            self.assertEqual(self.table.day_totals(first, first + 60), days)
+
+    def test_stats_match_a_walk_over_the_log(self):
+        _, walked = self.stats_manager.rebuild_from_days(self.data_manager.entry_log.items())
+        self.assertEqual(self.data_manager.stats, walked)
+
+
+if __name__ == "__main__":
+    unittest.main()
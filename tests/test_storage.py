@@ -0,0 +1,264 @@
+import os, json, tempfile, unittest
+from copy import deepcopy
+from unittest import mock
+from core.core_services import DateManager, CoreHelpers
+from core.data_manager import DataManager
+from core.file_manager import FileManager
+from core.stats_manager import StatsManager
+from core.storage import StorageFactory, JsonStorage, BinaryStorage, SqliteStorage, ShardedStorage
+from journal_samples import random_log, write_journal, open_journal, plain, session
+
+
+class StorageRoundTripTest(unittest.TestCase):
+    """Every backend gives back exactly what was saved, through its operation records and through a full rewrite."""
+    BACKENDS = ("json", "binary", "sqlite", "sharded")
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        self.entry_log = random_log(seed=7)
+        self.path_json = write_journal(self.directory, self.entry_log)
+        self.path_bin = os.path.join(self.directory, "learning_data.mljb")
+        self.path_db = os.path.join(self.directory, "learning_data.db")
+        self.dir_log = os.path.join(self.directory, "log")
+        self.opened = []
+
+    def tearDown(self):
+        for storage in self.opened:
+            if isinstance(storage, SqliteStorage):
+                storage.close()
+        self.temp_dir.cleanup()
+
+    def migrate(self, backend: str) -> None:
+        migrations = {
+            "binary": lambda: StorageFactory.migrate_json_to_binary(self.path_json, self.path_bin),
+            "sqlite": lambda: StorageFactory.migrate_json_to_sqlite(self.path_json, self.path_db),
+            "sharded": lambda: StorageFactory.migrate_json_to_sharded(self.path_json, self.dir_log),
+        }
+        if backend in migrations:
+            migrated, msg = migrations[backend]()
+            self.assertTrue(migrated, msg)
+
+    def open_storage(self, backend: str):
+        storage = {
+            "json": lambda: JsonStorage(self.path_json),
+            "binary": lambda: BinaryStorage(self.path_bin),
+            "sqlite": lambda: SqliteStorage(self.path_db),
+            "sharded": lambda: ShardedStorage(self.dir_log),
+        }[backend]()
+        self.opened.append(storage)
+        return storage
+
+    def open_data_manager(self, backend: str) -> DataManager:
+        return DataManager(self.path_json, os.path.join(self.directory, "Journal.md"), self.open_storage(backend))
+
+    @staticmethod
+    def make_changes(data_manager: DataManager, expected: dict) -> None:
+        """Edit, shrink, delete and add days through DataManager, doing the same to `expected`."""
+        dates = sorted(expected)
+        edited, shrunk, deleted = dates[3], dates[10], dates[20]
+
+        day = deepcopy(expected[edited])
+        subject = next(iter(day))
+        book = next(iter(day[subject]))
+        session_name = next(iter(day[subject][book]))
+        day[subject][book][session_name]["Notes"] = "Edited — مراجعة"
+        day[subject][book][session_name]["Total Pages"] = 12.5
+        day.setdefault("Seerah", {})["Ar-Raheeq al-Makhtum"] = {"Entry 900001": session("Ar-Raheeq al-Makhtum", 45, 8)}
+        data_manager.update_entry_log(edited, day)
+        expected[edited] = day
+
+        day = deepcopy(expected[shrunk])
+        subject = next(iter(day))
+        del day[subject]
+        data_manager.update_entry_log(shrunk, day)
+        if day:
+            expected[shrunk] = day
+        else:
+            del expected[shrunk]
+
+        data_manager.delete_data(deleted)
+        del expected[deleted]
+
+        new_day = {"Hadith": {"Sahih al-Bukhari": {"Entry 900002": session("Sahih al-Bukhari", 30, 4, "Kitab al-Ilm")}}}
+        data_manager.update_entry_log("03-Jan-2027", new_day)
+        expected["03-Jan-2027"] = new_day
+
+    def check_saved_changes(self, backend: str, full_save: bool) -> None:
+        self.tearDown()
+        self.setUp()
+        self.migrate(backend)
+        data_manager = self.open_data_manager(backend)
+        expected = deepcopy(self.entry_log)
+        self.make_changes(data_manager, expected)
+        data_manager.full_save_needed = full_save
+        self.assertEqual(data_manager.save_data_to_files(), 0)
+        self.assertEqual(plain(data_manager.entry_log), expected)
+        self.assertEqual(plain(self.open_data_manager(backend).entry_log), expected)
+
+    def test_migration_keeps_every_day(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self.migrate(backend)
+                self.assertEqual(plain(self.open_data_manager(backend).entry_log), self.entry_log)
+
+    def test_saved_changes_come_back(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self.check_saved_changes(backend, full_save=False)
+
+    def test_full_rewrite_comes_back(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self.check_saved_changes(backend, full_save=True)
+
+    def test_delete_all_comes_back_empty(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self.migrate(backend)
+                data_manager = self.open_data_manager(backend)
+                data_manager.delete_data(delete_all_progress=True)
+                self.assertEqual(data_manager.save_data_to_files(), 0)
+                self.assertEqual(plain(self.open_data_manager(backend).entry_log), {})
+
+    def test_binary_exports_back_to_the_same_json(self):
+        self.migrate("binary")
+        path_export = os.path.join(self.directory, "exported.json")
+        exported, msg = StorageFactory.export_binary_to_json(self.path_bin, path_export)
+        self.assertTrue(exported, msg)
+        with open(path_export, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["Entry Log"], self.entry_log)
+
+    def test_export_to_json_switches_the_journal_back(self):
+        self.migrate("binary")
+        data_manager = self.open_data_manager("binary")
+        expected = deepcopy(self.entry_log)
+        self.make_changes(data_manager, expected)
+        self.assertEqual(data_manager.save_data_to_files(), 0)
+        path_log = data_manager.storage.op_log.path_log
+        self.assertGreater(data_manager.storage.op_log.size(), 0)  # Some changes only in the binary file's log
+        exported, msg = StorageFactory.export_binary_to_json(self.path_bin, self.path_json)
+        self.assertTrue(exported, msg)
+        self.assertFalse(os.path.exists(self.path_bin) or os.path.exists(path_log))
+        self.assertTrue(os.path.exists(f"{self.path_bin}.bak") and os.path.exists(f"{path_log}.bak"))
+
+        storage = StorageFactory.open_storage(self.path_json, self.path_db, self.dir_log, self.path_bin)
+        self.opened.append(storage)
+        self.assertEqual(storage.name, "json")
+        data_manager = DataManager(self.path_json, os.path.join(self.directory, "Journal.md"), storage)
+        self.assertEqual(plain(data_manager.entry_log), expected)
+        self.assertFalse(StorageFactory.export_binary_to_json(self.path_bin, self.path_json)[0])
+
+    def test_open_storage_uses_the_migrated_layout(self):
+        def opened():
+            storage = StorageFactory.open_storage(self.path_json, self.path_db, self.dir_log, self.path_bin)
+            self.opened.append(storage)
+            return storage.name
+        self.assertEqual(opened(), "json")
+        self.migrate("binary")
+        self.assertEqual(opened(), "binary")
+        self.migrate("sharded")
+        self.assertEqual(opened(), "sharded")
+        self.migrate("sqlite")
+        self.assertEqual(opened(), "sqlite")
+        self.assertFalse(StorageFactory.migrate_json_to_sqlite(self.path_json, self.path_db)[0])
+
+
+class SqliteIndexTest(unittest.TestCase):
+    """Statistics and All Time Subjects from the GROUP BY queries equal the ones worked out from the log."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.json_data, _ = open_journal(self.temp_dir.name, random_log(seed=2))
+        self.path_db = os.path.join(self.temp_dir.name, "learning_data.db")
+        migrated, msg = StorageFactory.migrate_json_to_sqlite(self.json_data.storage.path_json, self.path_db)
+        self.assertTrue(migrated, msg)
+        self.storage = SqliteStorage(self.path_db)
+        self.data = DataManager(self.json_data.storage.path_json, os.path.join(self.temp_dir.name, "Journal.md"), self.storage)
+
+    def tearDown(self):
+        self.storage.close()
+        self.temp_dir.cleanup()
+
+    def test_stats_and_subjects_come_from_the_index(self):
+        stats_manager = StatsManager(self.data)
+        stats_manager.aggregator.calculate_all_time_stats()
+        stats_manager.cache_builder.build_subjects_cache()
+        self.assertEqual(self.data.stats, self.json_data.stats)
+        self.assertEqual(self.data.all_time_subjects, self.json_data.all_time_subjects)
+        self.assertFalse(any(map(self.data.entry_log.is_loaded, self.data.entry_log)))  # Without reading a single day
+
+    def test_pending_changes_are_not_in_the_index(self):
+        self.data.delete_data(sorted(self.data.entry_log)[0])
+        self.assertIsNone(self.data.get_stored_stats())
+        self.assertIsNone(self.data.get_subjects_cache())
+        self.assertEqual(self.data.save_data_to_files(), 0)
+        self.assertIsNotNone(self.data.get_stored_stats())
+
+
+class ShardedStorageTest(unittest.TestCase):
+    """Month files are read when one of their days is asked for, and written only when one of them changed."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.entry_log = random_log(seed=5)
+        path_json = write_journal(self.temp_dir.name, self.entry_log)
+        self.dir_log = os.path.join(self.temp_dir.name, "log")
+        migrated, msg = StorageFactory.migrate_json_to_sharded(path_json, self.dir_log)
+        self.assertTrue(migrated, msg)
+        self.path_json = path_json
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self) -> tuple:
+        storage = ShardedStorage(self.dir_log)
+        return storage, DataManager(self.path_json, os.path.join(self.temp_dir.name, "Journal.md"), storage)
+
+    def test_months_are_read_on_demand(self):
+        storage, data_manager = self.open()
+        today = DateManager.date_to_month(DateManager.get_date_today())
+        self.assertLessEqual(set(storage.shards), {today})
+        self.assertEqual(list(data_manager.entry_log), list(self.entry_log))
+        date = next(date for date in self.entry_log if date.endswith("Dec-2025"))
+        self.assertEqual(data_manager.entry_log[date], self.entry_log[date])
+        self.assertLessEqual(set(storage.shards), {today, "2025-12"})
+
+    def test_manifest_keeps_a_rollup_of_every_month(self):
+        storage, _ = self.open()
+        for month, rollup in storage.manifest["Months"].items():
+            days = [day for date, day in self.entry_log.items() if DateManager.date_to_month(date) == month]
+            sessions = [details for day in days for books in day.values() for sessions in books.values()
+                        for details in sessions.values()]
+            self.assertEqual(rollup["Total Entries"], len(sessions))
+            self.assertEqual(rollup["Minutes"], sum(CoreHelpers.convert_time_to_mins(details["Time Spent"]) for details in sessions))
+            self.assertEqual(rollup["Pages"], sum(details["Total Pages"] for details in sessions))
+
+    def test_save_rewrites_only_the_changed_month(self):
+        storage, data_manager = self.open()
+        date = next(date for date in self.entry_log if date.endswith("Jan-2026"))
+        data_manager.update_entry_log(date, {"Fiqh": {"Qudoori": {"Entry 900001": session("Qudoori", 10, 1)}}})
+        with mock.patch.object(FileManager, "write_atomic", side_effect=FileManager.write_atomic) as write_atomic:
+            self.assertTrue(storage.save(data_manager.take_snapshot()))
+        written = [os.path.basename(args[0]) for args, _ in write_atomic.call_args_list]
+        self.assertEqual(written, ["2026-01.json", ShardedStorage.MANIFEST])
+
+    def test_month_files_edited_outside_the_app_are_noticed(self):
+        path_shard = os.path.join(self.dir_log, "2025-12.json")
+        with open(path_shard, encoding="utf-8") as file:
+            shard = json.load(file)
+        dropped = sorted(shard)[0]
+        del shard[dropped]
+        with open(path_shard, "w", encoding="utf-8") as file:
+            json.dump(shard, file)
+        os.remove(os.path.join(self.dir_log, "2026-02.json"))
+        storage, data_manager = self.open()
+        expected = {date: day for date, day in self.entry_log.items()
+                    if date != dropped and not date.endswith("Feb-2026")}
+        self.assertEqual(plain(data_manager.entry_log), expected)
+        self.assertEqual(storage.manifest["Months"]["2025-12"]["Dates"], list(shard))
+        self.assertNotIn("2026-02", FileManager.load_file(storage.path_manifest)["Months"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import random, tempfile, unittest
+from datetime import date, timedelta
+from core.core_services import DateManager
+from core.streaks import StreakEngine
+from journal_samples import open_journal, session
+
+TAFSEER, TILAWAT = StreakEngine.QURAN_SUBJECTS
+
+
+def day(offset: int) -> str:
+    """The date `offset` days from today (negative for the past)."""
+    return (date.today() + timedelta(days=offset)).strftime("%d-%b-%Y")
+
+
+def journal_of(days: dict) -> dict:
+    """An Entry Log from {offset: [subjects]}, one session per subject."""
+    return {day(offset): {subject: {"Book": {"Entry 1": session("Book", 10, 1)}} for subject in subjects}
+            for offset, subjects in sorted(days.items())}
+
+
+class StreakEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def engine(self, days: dict) -> StreakEngine:
+        self.data_manager, self.stats_manager = open_journal(self.temp_dir.name, journal_of(days))
+        return self.stats_manager.streaks
+
+    def walked(self, scope) -> tuple:
+        """(current, longest) worked out by walking every day of the Entry Log."""
+        days = sorted(DateManager.date_to_ordinal(entry_date) for entry_date, record in self.data_manager.entry_log.items()
+                      if scope in StreakEngine.scopes_of(record))
+        today = date.today().toordinal()
+        current = longest = run = 0
+        for i, ordinal in enumerate(days):
+            run = run + 1 if i and days[i - 1] == ordinal - 1 else 1
+            longest = max(longest, run)
+            if ordinal in (today - 1, today):
+                current = run
+        return current, longest
+
+    def test_gap_ends_a_streak(self):
+        streaks = self.engine({-10: ["Fiqh"], -9: ["Fiqh"], -8: ["Fiqh"], -5: ["Fiqh"], -4: ["Fiqh"], -3: ["Fiqh"], -2: ["Fiqh"]})
+        self.assertEqual(streaks.streaks(), (0, 4))
+
+    def test_streak_ending_today(self):
+        streaks = self.engine({-5: ["Fiqh"], -2: ["Fiqh"], -1: ["Fiqh"], 0: ["Fiqh"]})
+        self.assertEqual(streaks.streaks(), (3, 3))
+
+    def test_streak_ending_yesterday_is_still_alive(self):
+        streaks = self.engine({-4: ["Fiqh"], -3: ["Fiqh"], -2: ["Fiqh"], -1: ["Fiqh"]})
+        self.assertEqual(streaks.streaks(), (4, 4))
+
+    def test_streaks_per_subject(self):
+        streaks = self.engine({-3: ["Fiqh"], -2: ["Fiqh", "Hadith"], -1: ["Hadith"], 0: ["Fiqh", "Hadith"]})
+        self.assertEqual(streaks.streaks(), (4, 4))
+        self.assertEqual(streaks.streaks("Fiqh"), (1, 2))
+        self.assertEqual(streaks.streaks("Hadith"), (3, 3))
+        self.assertEqual(streaks.streaks("Arabic"), (0, 0))
+
+    def test_quran_streak_joins_tafseer_and_tilawat(self):
+        streaks = self.engine({-3: [TAFSEER], -2: [TILAWAT], -1: [TAFSEER, "Fiqh"], 0: ["Fiqh"]})
+        self.assertEqual(streaks.streaks(StreakEngine.QURAN), (3, 3))
+        self.assertEqual(streaks.streaks(TAFSEER), (1, 1))
+        self.assertEqual(streaks.streaks(TILAWAT), (0, 1))
+        self.assertEqual(streaks.streaks(), (4, 4))
+
+    def test_streaks_follow_changes(self):
+        rng = random.Random(15)
+        subjects = ["Fiqh", "Hadith", TAFSEER, TILAWAT]
+        streaks = self.engine({offset: rng.sample(subjects, rng.randint(1, 2)) for offset in range(-60, 1) if rng.random() < 0.8})
+        streaks.streaks()
+        for _ in range(40):
+            changed = day(rng.randrange(-60, 1))
+            if rng.random() < 0.3:
+                self.data_manager.delete_data(changed)
+            else:
+                self.data_manager.update_entry_log(changed, journal_of({0: rng.sample(subjects, rng.randint(1, 3))})[day(0)])
+        for scope in [StreakEngine.ALL, StreakEngine.QURAN] + subjects:
+            with self.subTest(scope=scope):
+                self.assertEqual(streaks.streaks(scope), self.walked(scope))